@@ -0,0 +1,67 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from datos.ann import POSITION_BITS, AnnIndex, attribute_mask, build_ann_index, recall_at_k
+from datos.similarity import SimilarityIndex
+
+# Recall@k y consultas por segundo del índice aproximado (datos/ann.py) contra la búsqueda
+# exacta (datos/similarity.py), sin filtros y con filtros (posición, temporadas, minutos).
+# Por defecto usa embeddings sintéticos agrupados del tamaño de varias ligas y décadas.
+#   python -m benchmarks.bench_ann --rows 200000
+
+
+# Embeddings sintéticos: grupos alrededor de centros al azar, después de una ReLU
+def synthetic(rows, dim, clusters, rng):
+    centers = rng.normal(size=(clusters, dim)) * 2
+    labels = rng.integers(clusters, size=rows)
+    embeddings = np.maximum(centers[labels] + rng.normal(size=(rows, dim)), 0).astype(np.float32)
+    attributes = {
+        'positions': rng.choice(list(POSITION_BITS.values()), size=rows).astype(np.uint8),
+        'seasons': rng.integers(1990, 2025, size=rows).astype(np.int16),
+        'minutes': rng.integers(0, 3420, size=rows).astype(np.int32),
+    }
+    return embeddings, attributes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del índice aproximado de jugadores similares.')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--dim', type=int, default=16)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    embeddings, attributes = synthetic(args.rows, args.dim, 256, rng)
+    query_rows = rng.choice(args.rows, args.queries, replace=False)
+    exact = SimilarityIndex(embeddings, np.arange(args.rows))
+    filters = {
+        'sin filtros': {},
+        'FW, 2010-2011 a 2019-2020, >= 900 min': {'positions': ['FW'], 'seasons': ('2010-2011', '2019-2020'),
+                                                  'min_minutes': 900},
+    }
+
+    with tempfile.TemporaryDirectory() as out:
+        start = time.perf_counter()
+        build_ann_index(embeddings, out, **attributes)
+        print(f'{args.rows} jugadores: índice construido en {time.perf_counter() - start:.1f} s')
+        index = AnnIndex.load(out)
+        print(f'{len(index.centroids)} listas, arreglos mapeados en memoria: {type(index.vectors).__name__}')
+
+        for name, query_filters in filters.items():
+            mask = attribute_mask(attributes['positions'], attributes['seasons'], attributes['minutes'], **query_filters)
+            start = time.perf_counter()
+            expected, _ = exact.search(exact.vectors[query_rows], args.k, exclude=query_rows, mask=mask,
+                                       normalized=True)
+            exact_qps = args.queries / (time.perf_counter() - start)
+            print(f'{name}: exacta {exact_qps:8.0f} consultas/s (en lote)')
+            for n_probe in args.probes:
+                start = time.perf_counter()
+                found = [index.search(embeddings[row], args.k, n_probe=n_probe, exclude=row, **query_filters)[0]
+                         for row in query_rows]
+                qps = args.queries / (time.perf_counter() - start)
+                print(f'  n_probe={n_probe:<3} recall@{args.k} {recall_at_k(found, expected):.3f}   {qps:8.0f} consultas/s')
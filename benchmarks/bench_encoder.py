@@ -0,0 +1,134 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from datos.encoder import NumpyEncoder, export_encoder
+
+# Arranque y latencia del encoder en NumPy (datos/encoder.py) contra embedding_model.predict
+# de Keras. El arranque se mide en un proceso nuevo: importar, abrir el modelo y embeber una
+# fila (tiempo total y memoria máxima). Con TensorFlow instalado se construye el encoder de
+# modelo.py (64 -> 32 -> 16, ReLU), se exporta y se comprueba que las salidas coinciden.
+#   python -m benchmarks.bench_encoder --features datos/features
+# Sin --features se usan filas aleatorias.
+
+NUMPY_STARTUP = '''
+from datos.encoder import NumpyEncoder
+import numpy as np
+NumpyEncoder.load({weights!r}).predict(np.zeros((1, {dim}), np.float32))
+'''
+
+KERAS_STARTUP = '''
+from tensorflow import keras
+import numpy as np
+model = keras.models.load_model({model!r})
+model.predict(np.zeros((1, {dim}), np.float32), verbose=0)
+'''
+
+REPORT = '''
+import resource, sys
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(rss * (1 if sys.platform == 'darwin' else 1024))
+'''
+
+
+# Función para medir un fragmento de código en un proceso nuevo: (segundos, memoria máxima en bytes)
+def startup(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code + REPORT], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        return None, None
+    return elapsed, int(result.stdout.split()[-1])
+
+
+def timed(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Encoder de modelo.py con pesos al azar (sin entrenar)
+def keras_encoder(input_dim):
+    from tensorflow import keras
+
+    inputs = keras.Input(shape=(input_dim,))
+    x = keras.layers.Dense(64, activation='relu')(inputs)
+    x = keras.layers.Dense(32, activation='relu')(x)
+    embedding = keras.layers.Dense(16, activation='relu', name='embedding_layer')(x)
+    return keras.Model(inputs=inputs, outputs=embedding)
+
+
+# Pesos al azar con la forma del encoder, para medir sin TensorFlow
+def random_encoder(input_dim, rng):
+    sizes = [input_dim, 64, 32, 16]
+    layers = [(rng.normal(scale=np.sqrt(2 / m), size=(m, n)).astype(np.float32),
+               rng.normal(scale=0.01, size=n).astype(np.float32), 'relu') for m, n in zip(sizes, sizes[1:])]
+    return NumpyEncoder(layers)
+
+
+def report(name, seconds, rss):
+    if seconds is None:
+        print(f'  {name:<6} falló')
+    else:
+        print(f'  {name:<6} {seconds:6.2f} s   {rss / 2**20:6.0f} MiB')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del encoder en NumPy contra Keras.')
+    parser.add_argument('--features', help='Almacén de características (datos/features.py)')
+    parser.add_argument('--rows', type=int, default=4801, help='Filas aleatorias si no hay --features')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.features:
+        from datos.features import load_feature_store
+
+        X = np.asarray(load_feature_store(args.features).features)
+    else:
+        X = rng.random((args.rows, 15), dtype=np.float32)
+    dim = X.shape[1]
+
+    try:
+        import tensorflow  # noqa: F401
+    except ImportError:
+        print('TensorFlow no está instalado: solo se mide el encoder en NumPy')
+        keras_model = None
+    else:
+        keras_model = keras_encoder(dim)
+
+    with tempfile.TemporaryDirectory() as out:
+        weights = os.path.join(out, 'encoder.npz')
+        model_path = os.path.join(out, 'encoder.keras')
+        if keras_model is None:
+            encoder = random_encoder(dim, rng)
+            encoder.save(weights)
+        else:
+            keras_model.save(model_path)
+            encoder = export_encoder(keras_model, weights)
+            expected = keras_model.predict(X, batch_size=len(X), verbose=0)
+            difference = np.abs(encoder.predict(X) - expected).max()
+            print(f'Diferencia máxima con Keras: {difference:.2e} ' + ('(ok)' if difference <= 1e-5 else '(> 1e-5)'))
+
+        print('Arranque (proceso nuevo: importar, abrir el modelo y embeber una fila)')
+        report('numpy', *startup(NUMPY_STARTUP.format(weights=weights, dim=dim)))
+        if keras_model is not None:
+            report('keras', *startup(KERAS_STARTUP.format(model=model_path, dim=dim)))
+
+        print(f'Latencia (mejor de {args.repeat})')
+        one = X[:1]
+        numpy_one = timed(lambda: encoder.predict(one), args.repeat)
+        numpy_all = timed(lambda: encoder.predict(X), args.repeat)
+        print(f'  numpy  1 fila {numpy_one * 1000:8.3f} ms   {len(X)} filas {numpy_all * 1000:8.2f} ms')
+        if keras_model is not None:
+            keras_one = timed(lambda: keras_model.predict(one, verbose=0), args.repeat)
+            keras_all = timed(lambda: keras_model.predict(X, batch_size=len(X), verbose=0), args.repeat)
+            print(f'  keras  1 fila {keras_one * 1000:8.3f} ms   {len(X)} filas {keras_all * 1000:8.2f} ms')
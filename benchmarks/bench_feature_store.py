@@ -0,0 +1,57 @@
+import argparse
+import subprocess
+import sys
+import tempfile
+
+# Compara la memoria máxima (RSS) de preparar la matriz de características del modelo:
+# "antes" repite las celdas de modelo.py (concat de los parquet, dropna, MinMaxScaler,
+# .values y astype); "construir" y "cargar" usan el almacén de datos/features.py.
+# Cada escenario corre en un proceso nuevo.
+#   python -m benchmarks.bench_feature_store --source datos
+
+BEFORE = '''
+import numpy as np, pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+from datos.features import FEATURE_COLUMNS, NUMERICAL_COLUMNS, processed_files
+df = pd.concat([pd.read_parquet(p) for p in processed_files({source!r}).values()], ignore_index=True)
+df = df.dropna(subset=NUMERICAL_COLUMNS).copy()
+df[NUMERICAL_COLUMNS] = MinMaxScaler().fit_transform(df[NUMERICAL_COLUMNS])
+X = df[FEATURE_COLUMNS].values.astype(np.float32)
+'''
+
+BUILD = '''
+from datos.features import build_feature_store
+build_feature_store({source!r}, {out!r})
+'''
+
+LOAD = '''
+from datos.features import load_feature_store
+X = load_feature_store({out!r}).features
+X.sum(axis=0)
+'''
+
+REPORT = '''
+import resource, sys
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(rss * (1 if sys.platform == 'darwin' else 1024))
+'''
+
+
+# Función para medir la memoria máxima de un fragmento de código en un proceso nuevo (bytes)
+def peak_rss(code):
+    result = subprocess.run([sys.executable, '-c', code + REPORT], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return int(result.stdout.split()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de memoria del almacén de características.')
+    parser.add_argument('--source', default='datos', help='Carpeta con los archivos processed_{temporada}.parquet')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out:
+        for name, code in (('antes', BEFORE), ('construir', BUILD), ('cargar', LOAD)):
+            rss = peak_rss(code.format(source=args.source, out=out))
+            # El camino de antes puede agotar la memoria del equipo
+            print(f'{name:<10} ' + (f'{rss / 2**20:8.0f} MiB' if rss else '   falló (¿sin memoria?)'))
@@ -0,0 +1,52 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Compara el costo de importación al arrancar la página de análisis de jugadores con
+# python -X importtime. "antes" son los módulos que app.py importaba al inicio; "después"
+# es la página compartida, que deja pandas y matplotlib para cuando se usan.
+#   python -m benchmarks.bench_import_time
+
+SCENARIOS = {
+    'antes': 'import streamlit, pandas, numpy, matplotlib.pyplot',
+    'después': 'import streamlit, datos.player_page',
+}
+
+HEAVY_MODULES = ('streamlit', 'pandas', 'numpy', 'matplotlib', 'matplotlib.pyplot')
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+# Función para medir una importación en un proceso nuevo: (total en µs, {módulo: µs acumulados})
+def import_time(statement):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    total, modules = 0, {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, name = int(match.group(2)), match.group(4)
+        modules[name] = cumulative
+        # Solo los módulos de primer nivel suman al total (los demás ya están incluidos)
+        if len(match.group(3)) == 1:
+            total += cumulative
+    return total, modules
+
+
+def run(name, statement, repeat):
+    runs = [import_time(statement) for _ in range(repeat)]
+    total, modules = min(runs, key=lambda r: r[0])
+    heavy = ', '.join(f'{m} {modules[m] / 1000:.0f} ms' for m in HEAVY_MODULES if m in modules)
+    print(f'{name:<8} mejor {total / 1000:8.1f} ms   {heavy}')
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del tiempo de importación de la página.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    totals = {name: run(name, statement, args.repeat) for name, statement in SCENARIOS.items()}
+    print(f'Arranque {totals["antes"] / totals["después"]:.1f}x más rápido')
@@ -0,0 +1,69 @@
+import argparse
+import io
+import sqlite3
+
+import pandas as pd
+
+from datos.features import NUMERICAL_COLUMNS, POSITION_COLUMNS
+from datos.player_season import PLAYER_SEASON
+from datos.schema import compact_frame
+from datos.season_reader import read_seasons
+
+# Reporte de memoria de los tipos compactos (datos/schema.py) con df.info(memory_usage='deep').
+# "antes" reproduce los tipos que se usaban: float64 para las métricas, texto (object) para
+# los nombres "temporada, jugador" y las columnas de identificación; "después" son los
+# tipos con los que ahora se leen los parquet y la tabla player_season.
+#   python -m benchmarks.bench_memory_schema --source datos --db datos/model_data.db
+
+
+# Marco del modelo con los tipos anteriores
+def model_frame_before(df):
+    before = pd.DataFrame({'Player': (df['Season'].astype(str) + ', ' + df['Player'].astype(str)).astype(object)})
+    for column in NUMERICAL_COLUMNS:
+        before[column] = df[column].astype('float64')
+    for column in POSITION_COLUMNS:
+        before[column] = df[column].astype(bool)
+    return before
+
+
+# Marco de player_season con los tipos de read_sql_query
+def player_season_before(conn):
+    df = pd.read_sql_query(f'SELECT * FROM {PLAYER_SEASON}', conn)
+    text = df.select_dtypes(exclude='number').columns
+    return df.astype({c: object for c in text})
+
+
+def info(df):
+    buffer = io.StringIO()
+    df.info(memory_usage='deep', buf=buffer)
+    return buffer.getvalue()
+
+
+def report(name, before, after, verbose):
+    size_before = before.memory_usage(deep=True).sum()
+    size_after = after.memory_usage(deep=True).sum()
+    print(f'{name}: {len(after)} filas')
+    print(f'  antes   {size_before / 2**20:8.2f} MiB')
+    print(f'  después {size_after / 2**20:8.2f} MiB  ({size_before / size_after:.1f}x menos)')
+    if verbose:
+        print(info(before))
+        print(info(after))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reporte de memoria de los tipos compactos.')
+    parser.add_argument('--source', default='datos', help='Carpeta con los archivos processed_{temporada}.parquet')
+    parser.add_argument('--db', help='Base de datos SQLite con la tabla player_season')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar la salida completa de df.info()')
+    args = parser.parse_args()
+
+    model = read_seasons(args.source)
+    report('Datos del modelo', model_frame_before(model), model, args.verbose)
+
+    if args.db:
+        conn = sqlite3.connect(args.db)
+        try:
+            before = player_season_before(conn)
+        finally:
+            conn.close()
+        report(PLAYER_SEASON, before, compact_frame(before), args.verbose)
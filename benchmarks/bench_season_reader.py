@@ -0,0 +1,91 @@
+import argparse
+import io
+import time
+
+import pandas as pd
+
+from datos.features import processed_files
+from datos.season_reader import iter_batches
+
+# Compara la lectura de los archivos processed_{temporada}.parquet con filtros en el lector
+# (datos/season_reader.py) contra el ciclo actual: pd.read_parquet de todas las columnas de
+# cada temporada y filtro en pandas. Se miden los bytes leídos del disco y el tiempo.
+#   python -m benchmarks.bench_season_reader --source datos
+
+QUERIES = {
+    'delanteros >= 900 min': dict(columns=['Player', 'standard_Gls', 'standard_Ast', 'shooting_Sh'],
+                                  positions=['FW'], min_minutes=900),
+    'un jugador': dict(columns=['Player', 'standard_Min', 'standard_Gls'], player='Marcus Rashford'),
+    'porteros, una temporada': dict(seasons=['2022-2023'], columns=['Player', 'standard_Min'], positions=['GK']),
+}
+
+
+# Archivo que cuenta los bytes leídos
+class CountingFile(io.FileIO):
+    def __init__(self, path, counter):
+        super().__init__(path, 'rb')
+        self.counter = counter
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.counter[0] += len(data)
+        return data
+
+    def readinto(self, buffer):
+        count = super().readinto(buffer)
+        self.counter[0] += count or 0
+        return count
+
+
+# Ciclo actual: todas las columnas de cada temporada y filtro en pandas
+def pandas_loop(files, counter, columns=None, positions=None, min_minutes=None, player=None):
+    frames = []
+    for season, path in files.items():
+        with CountingFile(path, counter) as f:
+            df = pd.read_parquet(f)
+        if positions:
+            df = df[df[positions].any(axis=1)]
+        if min_minutes is not None:
+            df = df[df['standard_Min'] >= min_minutes]
+        if player is not None:
+            # Como en iter_batches: sin columna Season el nombre viene como "temporada, jugador"
+            df = df[df['Player'] == (player if 'Season' in df.columns else f'{season}, {player}')]
+        frames.append(df[columns].assign(Season=season))
+    return pd.concat(frames, ignore_index=True)
+
+
+def pushdown(files, counter, **query):
+    opened = {season: CountingFile(path, counter) for season, path in files.items()}
+    stats = {}
+    try:
+        batches = list(iter_batches(opened, stats=stats, **query))
+    finally:
+        for f in opened.values():
+            f.close()
+    return sum(batch.num_rows for batch in batches), stats
+
+
+def measure(function, *args, **kwargs):
+    counter = [0]
+    start = time.perf_counter()
+    result = function(*args, counter, **kwargs)
+    return result, counter[0], time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del lector de temporadas con filtros.')
+    parser.add_argument('--source', default='datos', help='Carpeta con los archivos processed_{temporada}.parquet')
+    args = parser.parse_args()
+
+    for name, query in QUERIES.items():
+        query = dict(query)
+        files = processed_files(args.source, query.pop('seasons', None))
+        if not files:
+            print(f'{name}: no hay archivos para estas temporadas')
+            continue
+        df, before_bytes, before_time = measure(pandas_loop, files, **query)
+        (rows, stats), after_bytes, after_time = measure(pushdown, files, **query)
+        assert rows == len(df), (name, rows, len(df))
+        print(f'{name}: {rows} filas, {stats["grupos leídos"]}/{stats["grupos"]} grupos leídos')
+        print(f'  antes   {before_bytes / 2**20:8.2f} MiB  {before_time * 1000:8.0f} ms')
+        print(f'  después {after_bytes / 2**20:8.2f} MiB  {after_time * 1000:8.0f} ms')
@@ -0,0 +1,73 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from datos.similarity import SimilarityIndex
+
+# Compara find_similar_players de modelo.py (búsqueda del nombre en el DataFrame,
+# cosine_similarity contra todas las filas y argsort completo por consulta) con
+# SimilarityIndex (vectores normalizados, diccionario de etiquetas, producto matricial y
+# argpartition), para 1 consulta y para un lote de 1.000.
+#   python -m benchmarks.bench_similarity --rows 4801
+# Con --embeddings se usan embeddings reales guardados con np.save.
+
+
+# La función de modelo.py
+def find_similar_players(player_name, player_embeddings, df, n=5):
+    player_idx = df[df['Player'] == player_name].index[0]
+    player_vec = player_embeddings[player_idx].reshape(1, -1)
+    similarities = cosine_similarity(player_vec, player_embeddings).flatten()
+    similar_indices = np.argsort(-similarities)[1:n + 1]
+    return df.iloc[similar_indices]['Player'].values
+
+
+def timed(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de la búsqueda de jugadores similares.')
+    parser.add_argument('--rows', type=int, default=4801, help='Jugadores (embeddings aleatorios)')
+    parser.add_argument('--dim', type=int, default=16, help='Dimensión de los embeddings')
+    parser.add_argument('--embeddings', help='Archivo .npy con embeddings reales')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.embeddings:
+        embeddings = np.load(args.embeddings)
+    else:
+        # Salidas de una capa ReLU: valores no negativos
+        embeddings = np.maximum(rng.normal(size=(args.rows, args.dim)), 0).astype(np.float32)
+    keys = [f'jugador {i}' for i in range(len(embeddings))]
+    df = pd.DataFrame({'Player': keys})
+    queries = [keys[i] for i in rng.choice(len(keys), args.queries)]
+
+    start = time.perf_counter()
+    index = SimilarityIndex(embeddings, keys)
+    print(f'Índice: {len(index)} jugadores, creado en {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    # Mismos resultados (el orden puede variar solo entre similitudes empatadas)
+    expected = find_similar_players(queries[0], embeddings, df, args.k)
+    got = [key for key, _ in index.similar(queries[0], args.k)]
+    print('Mismos resultados:', list(expected) == got)
+
+    before_one = timed(lambda: find_similar_players(queries[0], embeddings, df, args.k), args.repeat)
+    after_one = timed(lambda: index.similar(queries[0], args.k), args.repeat)
+    before_many = timed(lambda: [find_similar_players(q, embeddings, df, args.k) for q in queries], 1)
+    after_many = timed(lambda: index.similar(queries, args.k), args.repeat)
+
+    print(f'1 consulta:     antes {before_one * 1000:9.2f} ms   después {after_one * 1000:9.2f} ms'
+          f'   ({before_one / after_one:.0f}x)')
+    print(f'{args.queries} consultas: antes {before_many * 1000:9.2f} ms   después {after_many * 1000:9.2f} ms'
+          f'   ({before_many / after_many:.0f}x)')
@@ -0,0 +1,73 @@
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from collections import defaultdict
+
+from datos.data_sqlite3 import load_table, seasons, urls
+from datos.fixture_server import fixture_path
+from datos.writer import SQLiteWriter
+
+# Compara el tiempo de carga y el tamaño del archivo entre df.to_sql (el camino anterior)
+# y SQLiteWriter, usando las páginas de FBREF guardadas como fixtures.
+#   python -m benchmarks.bench_sqlite_writer datos/fixtures
+
+
+# Función para leer y normalizar todas las tablas guardadas, agrupadas por temporada
+def load_fixtures(root):
+    tables = defaultdict(dict)
+    for season in seasons:
+        for table_id, url in urls.items():
+            path = fixture_path(root, url.format(season))
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8') as f, contextlib.redirect_stdout(io.StringIO()):
+                df = load_table(f.read(), table_id)
+            if df is not None:
+                tables[season][f'{season}_{table_id}'] = df
+    return tables
+
+
+def load_to_sql(path, tables):
+    conn = sqlite3.connect(path)
+    for season_tables in tables.values():
+        for table_name, df in season_tables.items():
+            df.to_sql(table_name, conn, if_exists='replace', index=False)
+    conn.close()
+
+
+def load_writer(path, tables):
+    with SQLiteWriter(path) as writer:
+        for season_tables in tables.values():
+            for table_name, df in season_tables.items():
+                writer.write(table_name, df)
+            writer.commit()
+
+
+def run(name, load, tables, repeat):
+    times, size = [], 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.db')
+            started = time.perf_counter()
+            load(path, tables)
+            times.append(time.perf_counter() - started)
+            size = os.path.getsize(path)
+    print(f'{name:<14} mejor {min(times) * 1000:8.1f} ms   tamaño {size / 1024:8.1f} KiB')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de escritura en SQLite.')
+    parser.add_argument('fixtures', help='Directorio con los fixtures HTML de FBREF')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tables = load_fixtures(args.fixtures)
+    n_tables = sum(len(t) for t in tables.values())
+    n_rows = sum(len(df) for t in tables.values() for df in t.values())
+    print(f'{n_tables} tablas, {n_rows} filas en {len(tables)} temporadas')
+    run('df.to_sql', load_to_sql, tables, args.repeat)
+    run('SQLiteWriter', load_writer, tables, args.repeat)
@@ -0,0 +1,103 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Rendimiento del entrenamiento del autoencoder en CPU: muestras por segundo y memoria
+# máxima (RSS). "en memoria" repite modelo.py (matriz completa, train_test_split y model.fit
+# con lotes de 32); "almacén" y "parquet" usan los pipelines tf.data de datos/training.py
+# con lotes grandes. Todos usan la misma tasa de aprendizaje (la de modelo.py, o escalada al
+# lote con --scale-lr en los pipelines) y se reporta la val_loss final de cada uno para
+# comparar la pérdida además de la velocidad. Cada escenario corre en un proceso nuevo.
+#   python -m benchmarks.bench_training --source datos --epochs 5 --batch-size 1024
+
+IN_MEMORY = '''
+import time, numpy as np
+from sklearn.model_selection import train_test_split
+from datos.features import load_feature_store
+from datos.training import build_autoencoder
+X = np.array(load_feature_store({features!r}).features)
+X_train, X_val = train_test_split(X, test_size=0.2, random_state=42)
+model = build_autoencoder(X.shape[1])
+start = time.perf_counter()
+history = model.fit(X_train, X_train, epochs={epochs}, batch_size=32, validation_data=(X_val, X_val), verbose=0)
+print(len(X_train) * {epochs} / (time.perf_counter() - start), history.history['val_loss'][-1])
+'''
+
+STORE = '''
+import time
+from datos.features import load_feature_store
+from datos.training import LEARNING_RATE, build_autoencoder, scaled_learning_rate, split_rows, store_dataset
+store = load_feature_store({features!r})
+train_rows, val_rows = split_rows(len(store.features))
+train = store_dataset(store.features, train_rows, {batch_size})
+val = store_dataset(store.features, val_rows, {batch_size}, shuffle=False)
+model = build_autoencoder(store.features.shape[1], learning_rate={learning_rate})
+start = time.perf_counter()
+history = model.fit(train, epochs={epochs}, validation_data=val, verbose=0)
+print(len(train_rows) * {epochs} / (time.perf_counter() - start), history.history['val_loss'][-1])
+'''
+
+PARQUET = '''
+import time
+from datos.features import FEATURE_COLUMNS
+from datos.training import LEARNING_RATE, build_autoencoder, parquet_dataset, scaled_learning_rate
+train = parquet_dataset({source!r}, 'train', {batch_size})
+val = parquet_dataset({source!r}, 'val', {batch_size})
+rows = sum(int(x.shape[0]) for x, _ in train)
+model = build_autoencoder(len(FEATURE_COLUMNS), learning_rate={learning_rate})
+start = time.perf_counter()
+history = model.fit(train, epochs={epochs}, validation_data=val, verbose=0)
+print(rows * {epochs} / (time.perf_counter() - start), history.history['val_loss'][-1])
+'''
+
+REPORT = '''
+import resource, sys
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(rss * (1 if sys.platform == 'darwin' else 1024))
+'''
+
+
+# Función para correr un escenario en un proceso nuevo: (muestras por segundo, val_loss final,
+# memoria máxima en bytes)
+def run(code):
+    result = subprocess.run([sys.executable, '-c', code + REPORT], capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'falló')
+        return None, None, None
+    throughput, val_loss, rss = result.stdout.split()[-3:]
+    return float(throughput), float(val_loss), int(rss)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del entrenamiento con tf.data contra model.fit en memoria.')
+    parser.add_argument('--source', default='datos', help='Carpeta con los archivos processed_{temporada}.parquet')
+    parser.add_argument('--features', help='Almacén de características (por defecto se construye uno temporal)')
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--scale-lr', action='store_true', help='Escalar la tasa de aprendizaje con el lote')
+    args = parser.parse_args()
+
+    try:
+        import tensorflow  # noqa: F401
+    except ImportError:
+        sys.exit('TensorFlow no está instalado')
+
+    with tempfile.TemporaryDirectory() as out:
+        features = args.features
+        if features is None:
+            from datos.features import build_feature_store
+
+            features = os.path.join(out, 'features')
+            build_feature_store(args.source, features)
+
+        learning_rate = f'scaled_learning_rate({args.batch_size})' if args.scale_lr else 'LEARNING_RATE'
+        options = dict(source=args.source, features=features, epochs=args.epochs, batch_size=args.batch_size,
+                       learning_rate=learning_rate)
+        scenarios = (('en memoria (lote 32)', IN_MEMORY), (f'almacén (lote {args.batch_size})', STORE),
+                     (f'parquet (lote {args.batch_size})', PARQUET))
+        for name, code in scenarios:
+            throughput, val_loss, rss = run(code.format(**options))
+            if throughput is not None:
+                print(f'{name:<24} {throughput:10.0f} muestras/s   val_loss {val_loss:.5f}   {rss / 2**20:6.0f} MiB')
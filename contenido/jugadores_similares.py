@@ -0,0 +1,4 @@
+from datos.similar_page import render
+
+# Jugadores similares: toda la página vive en datos/similar_page.py
+render()
@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from datos.similarity import normalize, top_k
+
+# Índice aproximado (IVF) para buscar jugadores similares sin recorrer todos los embeddings.
+# Los vectores normalizados se agrupan con k-means esférico en n_lists listas; cada lista
+# queda contigua en disco, así que una búsqueda compara la consulta con los centroides, lee
+# solo las n_probe listas más cercanas y hace la búsqueda exacta dentro de ellas.
+#
+# El índice se guarda en una carpeta (junto al modelo) como archivos .npy que se abren con
+# mmap_mode='r': centroides, vectores ordenados por lista, límites de cada lista, la fila
+# original de cada vector y los atributos para filtrar (posiciones, temporada y minutos).
+#   python -m datos.ann --embeddings player_embeddings.npy --features datos/features --out ann
+
+ARRAYS = ('centroids', 'vectors', 'offsets', 'ids', 'positions', 'seasons', 'minutes')
+META_FILE = 'meta.json'
+
+# Bit de cada posición en la columna positions
+POSITION_BITS = {'GK': 1, 'DF': 2, 'MF': 4, 'FW': 8}
+
+# Filas por bloque al asignar vectores a los centroides
+ASSIGN_BLOCK = 65536
+
+
+# Función para convertir una temporada "2023-2024" en su año de inicio
+def season_year(season):
+    return int(str(season)[:4])
+
+
+# Función para convertir columnas booleanas de posición (n x 4, en el orden GK/DF/MF/FW) en bits
+def position_bits(flags):
+    flags = np.asarray(flags, dtype=bool)
+    return (flags * np.array(list(POSITION_BITS.values()), dtype=np.uint8)).sum(axis=1).astype(np.uint8)
+
+
+# Atributos de filtrado a partir del almacén de características (datos/features.py)
+def store_attributes(store):
+    columns = list(store.columns)
+    positions = np.asarray(store.features[:, [columns.index(p) for p in POSITION_BITS]])
+    # Los minutos están escalados con Min-Max en el almacén
+    i = columns.index('standard_Min')
+    minutes = np.rint(store.features[:, i] * (store.maximum[i] - store.minimum[i]) + store.minimum[i])
+    return {'positions': position_bits(positions > 0.5),
+            'seasons': np.array([season_year(s) for s in store.index['Season']], dtype=np.int16),
+            'minutes': minutes.astype(np.int32)}
+
+
+# Función para filtrar filas por sus atributos: positions (al menos una de las posiciones),
+# seasons (primera y última temporada, inclusive) y min_minutes (un número, o
+# {temporada: minutos} para exigir distintos minutos en cada temporada)
+def attribute_mask(positions_bits, season_years, minutes, positions=None, seasons=None, min_minutes=None):
+    mask = np.ones(len(minutes), dtype=bool)
+    if positions:
+        mask &= (positions_bits & sum(POSITION_BITS[p] for p in positions)) != 0
+    if seasons is not None:
+        first, last = (season_year(s) for s in seasons)
+        mask &= (season_years >= first) & (season_years <= last)
+    if isinstance(min_minutes, dict):
+        cut = np.zeros(len(minutes))
+        for season, season_minutes in min_minutes.items():
+            cut[season_years == season_year(season)] = season_minutes
+        mask &= minutes >= cut
+    elif min_minutes is not None:
+        mask &= minutes >= min_minutes
+    return mask
+
+
+# Asignación de cada vector a su centroide más cercano, por bloques
+def assign(vectors, centroids):
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        labels[start:start + ASSIGN_BLOCK] = np.argmax(vectors[start:start + ASSIGN_BLOCK] @ centroids.T, axis=1)
+    return labels
+
+
+# Función para agrupar vectores normalizados con k-means esférico
+def spherical_kmeans(vectors, n_lists, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        labels = assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=n_lists)
+        # Las listas vacías se vuelven a sembrar con vectores al azar
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids, assign(vectors, centroids)
+
+
+# Función para construir y guardar el índice. positions (bits), seasons (año de inicio) y
+# minutes son opcionales; sin ellos no se puede filtrar por ese atributo.
+def build_ann_index(embeddings, out_dir, positions=None, seasons=None, minutes=None, n_lists=None,
+                    iterations=10, seed=0):
+    vectors = normalize(embeddings)
+    n = len(vectors)
+    n_lists = min(n, n_lists or max(1, int(np.sqrt(n))))
+    centroids, labels = spherical_kmeans(vectors, n_lists, iterations, seed)
+
+    # Los vectores de cada lista quedan contiguos
+    order = np.argsort(labels, kind='stable')
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(labels, minlength=n_lists))
+    arrays = {
+        'centroids': centroids,
+        'vectors': vectors[order],
+        'offsets': offsets,
+        'ids': order.astype(np.int64),
+        'positions': (np.full(n, 0xFF, np.uint8) if positions is None else np.asarray(positions, np.uint8))[order],
+        'seasons': (np.zeros(n, np.int16) if seasons is None else np.asarray(seasons, np.int16))[order],
+        'minutes': (np.zeros(n, np.int32) if minutes is None else np.asarray(minutes, np.int32))[order],
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f'{name}.npy'), array)
+    with open(os.path.join(out_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'rows': n, 'dim': int(vectors.shape[1]), 'n_lists': n_lists, 'iterations': iterations,
+                   'seed': seed}, f, indent=2)
+    return AnnIndex(arrays)
+
+
+class AnnIndex:
+    def __init__(self, arrays, n_probe=8):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.n_probe = n_probe
+
+    # Función para abrir un índice guardado; los arreglos quedan mapeados en memoria
+    @classmethod
+    def load(cls, out_dir, n_probe=8, mmap_mode='r'):
+        return cls({name: np.load(os.path.join(out_dir, f'{name}.npy'), mmap_mode=mmap_mode) for name in ARRAYS},
+                   n_probe)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Máscara de los atributos de las filas [start, end) según los filtros
+    def _filter(self, start, end, **filters):
+        return attribute_mask(self.positions[start:end], self.seasons[start:end], self.minutes[start:end], **filters)
+
+    # Búsqueda de los k vectores más parecidos a una consulta. Devuelve (filas originales,
+    # similitudes). Filtros: positions (al menos una de las posiciones), seasons (primera y
+    # última temporada) y min_minutes. exclude es una fila original que no se devuelve (el
+    # propio jugador). Si las listas visitadas no alcanzan k resultados se visitan más.
+    def search(self, query, k=5, n_probe=None, positions=None, seasons=None, min_minutes=None, exclude=None):
+        query = normalize(query).ravel()
+        n_lists = len(self.centroids)
+        n_probe = min(n_probe or self.n_probe, n_lists)
+        lists = np.argsort(-(self.centroids @ query), kind='stable')
+        visited = 0
+        found_ids, found_scores = [], []
+        found = 0
+        while visited < n_lists:
+            for list_id in lists[visited:n_probe]:
+                start, end = int(self.offsets[list_id]), int(self.offsets[list_id + 1])
+                if start == end:
+                    continue
+                mask = self._filter(start, end, positions=positions, seasons=seasons, min_minutes=min_minutes)
+                ids = np.asarray(self.ids[start:end])
+                if exclude is not None:
+                    mask &= ids != exclude
+                if not mask.any():
+                    continue
+                found_ids.append(ids[mask])
+                found_scores.append(np.asarray(self.vectors[start:end])[mask] @ query)
+                found += int(mask.sum())
+            visited = n_probe
+            if found >= k:
+                break
+            n_probe = min(n_lists, n_probe * 2)
+        if not found_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ids, scores = np.concatenate(found_ids), np.concatenate(found_scores)
+        best, values = top_k(scores, k)
+        return ids[best], values
+
+    def search_batch(self, queries, k=5, **filters):
+        results = [self.search(query, k, **filters) for query in np.atleast_2d(queries)]
+        return [ids for ids, _ in results], [scores for _, scores in results]
+
+
+# Función para medir recall@k: fracción de los k vecinos exactos que devuelve el índice aproximado
+def recall_at_k(approximate, exact):
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approximate, exact))
+    total = sum(len(e) for e in exact)
+    return hits / total if total else 1.0
+
+
+def main(argv=None):
+    from datos.features import load_feature_store
+
+    parser = argparse.ArgumentParser(description='Construye el índice aproximado de jugadores similares.')
+    parser.add_argument('--embeddings', required=True, help='Archivo .npy con los embeddings de los jugadores')
+    parser.add_argument('--features', help='Almacén de características con las mismas filas (para los filtros)')
+    parser.add_argument('--out', required=True, help='Carpeta del índice')
+    parser.add_argument('--lists', type=int, help='Número de listas (por defecto, raíz cuadrada de las filas)')
+    parser.add_argument('--iterations', type=int, default=10, help='Iteraciones de k-means')
+    args = parser.parse_args(argv)
+
+    embeddings = np.load(args.embeddings, mmap_mode='r')
+    attributes = store_attributes(load_feature_store(args.features)) if args.features else {}
+    start = time.perf_counter()
+    index = build_ann_index(embeddings, args.out, n_lists=args.lists, iterations=args.iterations, **attributes)
+    print(f'Índice con {len(index)} jugadores y {len(index.centroids)} listas en {args.out} '
+          f'({time.perf_counter() - start:.1f} s)')
+
+
+if __name__ == '__main__':
+    main()
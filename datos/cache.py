@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+from datos.config import LIVE_SEASONS, SETTINGS
+from datos.connections import ConnectionManager
+
+# Caché de datos para las páginas de Streamlit. Cada cambio de un widget vuelve a ejecutar
+# todo el script; con esta caché las consultas de una misma (temporada, equipo, métricas)
+# se hacen una sola vez por proceso y se comparten entre sesiones. Las temporadas
+# terminadas no cambian, así que nunca expiran; la temporada en curso tiene un TTL para
+# que la actualización diaria del scraper se vea sin reiniciar la aplicación.
+# Las consultas (y con ellas pandas) se importan al hacer la primera consulta.
+
+
+# Caché LRU acotada; las entradas de temporadas en curso expiran después de ttl segundos
+class SeasonCache:
+    def __init__(self, maxsize=256, ttl=15 * 60, live_seasons=LIVE_SEASONS, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.live_seasons = set(live_seasons)
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # La clave siempre empieza por la temporada: (temporada, equipo, métricas)
+    def get(self, key, load):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # La carga se hace fuera del candado para no bloquear a las demás sesiones
+        value = load()
+        expires = now + self.ttl if key[0] in self.live_seasons else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entradas': len(self._entries),
+                'capacidad': self.maxsize,
+                'aciertos': self.hits,
+                'fallos': self.misses,
+                'desalojos': self.evictions,
+                'tasa de aciertos': self.hits / total if total else 0.0,
+            }
+
+
+# Acceso a los datos de las páginas: consultas por métricas y equipos con caché
+class DataCache:
+    def __init__(self, settings=SETTINGS, **cache_options):
+        self.connections = ConnectionManager(settings)
+        self.cache = SeasonCache(live_seasons=settings.live_seasons, **cache_options)
+
+    # Devuelve una copia para que cada página pueda modificar su DataFrame sin tocar la caché
+    def metrics(self, season, metrics, team=None):
+        from datos.query_builder import get_metrics
+
+        key = (season, team, tuple(metrics))
+        return self.cache.get(key, lambda: self._query(season, get_metrics, list(metrics), team)).copy()
+
+    def percentiles(self, season, metrics, team=None):
+        from datos.percentiles import get_percentiles
+
+        key = (season, team, ('percentiles',) + tuple(metrics))
+        return self.cache.get(key, lambda: self._query(season, get_percentiles, list(metrics), team)).copy()
+
+    # Minutos mínimos para aparecer en los percentiles de la temporada
+    def minutes_cut(self, season):
+        from datos.percentiles import minutes_cut
+
+        return self.cache.get((season, None, 'minutes_cut'), lambda: self._query(season, minutes_cut))
+
+    def teams(self, season):
+        from datos.query_builder import list_teams
+
+        return list(self.cache.get((season, None, 'teams'), lambda: self._query(season, list_teams)))
+
+    # Las temporadas terminadas se leen con las conexiones inmutables
+    def _query(self, season, function, *args):
+        with self.connections.connection(season) as conn:
+            return function(conn, season, *args)
+
+    def stats(self):
+        return self.cache.stats()
+
+    def pool_stats(self):
+        return self.connections.stats()
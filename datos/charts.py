@@ -0,0 +1,182 @@
+import math
+import threading
+from io import BytesIO
+
+from datos.cache import SeasonCache
+
+# Gráficos de pizza renderizados a bytes (PNG o SVG). Se dibujan con la API de objetos de
+# matplotlib sobre el backend Agg, sin pyplot: la figura no queda registrada en ningún
+# estado global y se libera al terminar. Los bytes se guardan en una caché LRU por
+# (temporada, equipo, jugador, métricas, renombres, formato), así que cambiar de jugador
+# y volver, o abrir la página desde otra sesión, ya no vuelve a dibujar la figura.
+# numpy y matplotlib se importan dentro de las funciones que dibujan, así que una página
+# que solo sirve gráficos desde la caché nunca los carga.
+
+# Métricas de cada categoría del gráfico y su color
+PIZZA_GROUPS = [
+    (['shooting_Sh', 'shooting_SoT/90', 'gca_SCA90', 'possession_Att Pen', 'possession_Succ'], '#EC313A'),  # Rojo vivo para ataque
+    (['passing_Att', 'passing_Cmp', 'passing_KP', 'passing_PrgP', 'possession_Rec'], '#1CD787'),  # Verde vivo para posesión
+    (['misc_TklW', 'misc_Int', 'misc_Recov', 'misc_Fls', 'misc_Won'], '#0E70BE'),  # Azul vivo para defensa
+]
+
+PIZZA_METRICS = [metric for metrics, _ in PIZZA_GROUPS for metric in metrics]
+# Nombres en español de las etiquetas del gráfico
+PIZZA_LABELS = {
+    'Percentil_shooting_Sh': 'Tiros',
+    'Percentil_shooting_SoT/90': 'Tiros a puerta por 90',
+    'Percentil_gca_SCA90': 'Acciones de creación por 90',
+    'Percentil_possession_Att Pen': 'Toques en el área',
+    'Percentil_possession_Succ': 'Regates exitosos',
+    'Percentil_passing_Att': 'Pases intentados',
+    'Percentil_passing_Cmp': 'Pases completados',
+    'Percentil_passing_KP': 'Pases clave',
+    'Percentil_passing_PrgP': 'Pases progresivos',
+    'Percentil_possession_Rec': 'Recepciones',
+    'Percentil_misc_TklW': 'Entradas ganadas',
+    'Percentil_misc_Int': 'Intercepciones',
+    'Percentil_misc_Recov': 'Recuperaciones',
+    'Percentil_misc_Fls': 'Faltas cometidas',
+    'Percentil_misc_Won': 'Duelos aéreos ganados',
+}
+
+
+# Función para cambiar los nombres de las columnas de percentiles
+def rename_columns(column_names, rename_dict):
+    return [rename_dict.get(col, col) for col in column_names]
+
+
+# Función para crear un gráfico de "pizza" con fondo negro y colores vivos.
+# values tiene un percentil por métrica de groups (NaN si el jugador no tiene el dato).
+def pizza_figure(values, player_name, season, team, pos, groups=PIZZA_GROUPS, rename_dict=None):
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from datos.percentiles import percentile_column
+
+    metrics = [percentile_column(m) for group, _ in groups for m in group]
+    colors = [color for group, color in groups for _ in group]
+    values = np.asarray(values, dtype='float64')
+
+    # Ángulos de inicio de cada rebanada
+    num_vars = len(metrics)
+    angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False)
+
+    # Si se proporcionó un diccionario de renombres, actualizar las etiquetas
+    if rename_dict:
+        metrics = rename_columns(metrics, rename_dict)
+
+    # Figura sin pyplot: no se registra en el gestor de figuras y se libera con el objeto
+    fig = Figure(figsize=(10, 10), facecolor='black')  # Fondo negro
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(polar=True)
+    ax.set_facecolor('black')  # Fondo negro en el gráfico
+
+    # Todas las rebanadas en una sola llamada
+    ax.bar(angles, np.nan_to_num(values), width=2 * np.pi / num_vars, color=colors,
+           edgecolor='white', alpha=1.0, align='edge')
+
+    # Colocar los valores en el borde superior de la rebanada, centrado entre las divisiones
+    for angle, value, color in zip(angles + np.pi / num_vars, values, colors):
+        if np.isnan(value):
+            continue
+        bbox_props = dict(boxstyle="round,pad=0.3", facecolor=color, edgecolor="white", linewidth=2)
+        ax.text(angle, value, f'{value:.0f}', horizontalalignment='center', verticalalignment='center',
+                size=10, color='white', weight='semibold', bbox=bbox_props)
+
+    # Añadir etiquetas a cada métrica en el centro de la rebanada
+    ax.set_yticklabels([])  # Quitamos los labels de las líneas circulares
+    ax.set_xticks(angles)  # Los ángulos para las etiquetas
+    ax.set_xticklabels(metrics, fontsize=12, fontweight='bold', color='white', wrap=True)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('center')  # Centrar el texto entre las rebanadas
+
+    # Ajustar el límite del gráfico para que las líneas divisorias no se superpongan
+    ax.set_ylim(0, 105)  # Esto mantiene los valores dentro del rango de 0 a 100
+
+    # Añadir título personalizado
+    ax.set_title(f'{player_name}, {season}', size=20, color='white', pad=20)  # Título principal
+    ax.text(0, -1.2, f'{team}, {pos}', ha='center', size=15, color='white')  # Subtítulo debajo del título
+
+    # Añadir glosario de colores debajo del gráfico
+    ax.text(-0.7, -1.6, 'Rojo - Ataque', ha='center', size=12, color='#EC313A', bbox=dict(facecolor='black', edgecolor='none'))
+    ax.text(0, -1.6, 'Verde - Posesión', ha='center', size=12, color='#1CD787', bbox=dict(facecolor='black', edgecolor='none'))
+    ax.text(0.7, -1.6, 'Azul - Defensa', ha='center', size=12, color='#0E70BE', bbox=dict(facecolor='black', edgecolor='none'))
+
+    # Añadir la descripción de los percentiles
+    ax.text(0, -2.0, '* valores convertidos a percentiles en la Premier League', ha='center', size=10, color='white', style='italic')
+
+    return fig
+
+
+# Función para convertir una figura en bytes y liberarla (clear=False permite guardar la
+# misma figura en varios formatos antes de liberarla)
+def figure_bytes(fig, fmt='png', dpi=100, clear=True):
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight', facecolor=fig.get_facecolor())
+    finally:
+        if clear:
+            fig.clear()
+    return buffer.getvalue()
+
+
+# Valores de percentiles de una fila, en el orden de groups
+def row_values(row, groups=PIZZA_GROUPS):
+    from datos.percentiles import percentile_column
+
+    return [row.get(percentile_column(m), math.nan) for group, _ in groups for m in group]
+
+
+# Renderizador de gráficos de pizza con caché de bytes
+class PizzaRenderer:
+    def __init__(self, data, maxsize=512, fmt='png', dpi=100, groups=PIZZA_GROUPS):
+        self.data = data
+        self.fmt = fmt
+        self.dpi = dpi
+        self.groups = groups
+        self.metrics = [m for group, _ in groups for m in group]
+        self.cache = SeasonCache(maxsize=maxsize)
+        # matplotlib no garantiza dibujar en paralelo desde varios hilos
+        self._draw_lock = threading.Lock()
+
+    def _key(self, season, team, player_id, rename_dict):
+        renames = tuple(sorted((rename_dict or {}).items()))
+        return (season, team, player_id, tuple(self.metrics), renames, self.fmt)
+
+    def _render(self, row, player, season, team, pos, rename_dict):
+        with self._draw_lock:
+            fig = pizza_figure(row_values(row, self.groups), player, season, team, row.get('Pos', pos),
+                               self.groups, rename_dict)
+            return figure_bytes(fig, self.fmt, self.dpi)
+
+    # Bytes del gráfico de un jugador; los percentiles salen de la tabla de percentiles. El
+    # jugador se busca por player_id (dos jugadores con el mismo nombre no se confunden);
+    # player es el nombre del título. pos solo se usa si el jugador no tiene percentiles (no
+    # llegó al mínimo de minutos).
+    def chart(self, season, team, player_id, player, pos='', rename_dict=None):
+        def load():
+            df = self.data.percentiles(season, self.metrics, team)
+            rows = df[df['player_id'] == player_id].to_dict('records')
+            return self._render(rows[0] if rows else {}, player, season, team, pos, rename_dict)
+
+        return self.cache.get(self._key(season, team, player_id, rename_dict), load)
+
+    # Renderiza de antemano todos los jugadores de una temporada (o de un equipo). Con
+    # background=True se hace en un hilo aparte y se devuelve el hilo.
+    def prerender(self, season, team=None, rename_dict=None, background=True):
+        def run():
+            df = self.data.percentiles(season, self.metrics, team)
+            for row in df.to_dict('records'):
+                key = self._key(season, row['Squad'], row['player_id'], rename_dict)
+                self.cache.get(key, lambda: self._render(row, row['Player'], season, row['Squad'], row['Pos'], rename_dict))
+            return len(df)
+
+        if not background:
+            return run()
+        thread = threading.Thread(target=run, name=f'prerender-{season}', daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return self.cache.stats()
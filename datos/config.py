@@ -0,0 +1,90 @@
+import configparser
+import os
+from collections import namedtuple
+from pathlib import Path
+
+# Configuración compartida por las páginas de Streamlit y los scripts de datos. Este módulo
+# no importa nada pesado para que las páginas puedan leerlo al arrancar.
+#
+# La base de datos se configura en la sección [database] de un archivo INI (futbol.ini en
+# el directorio de trabajo, u otro con la variable FUTBOL_CONFIG) y cada opción puede
+# sobreescribirse con su variable de entorno:
+#
+#   [database]
+#   path = datos/model_data.db       ; FUTBOL_DB (por defecto, junto a este módulo)
+#   pool_size = 4                    ; FUTBOL_DB_POOL_SIZE
+#   mmap_size = 268435456            ; FUTBOL_DB_MMAP_SIZE (bytes)
+#   cache_size = 65536               ; FUTBOL_DB_CACHE_SIZE (KiB por conexión)
+#   live_seasons = 2024-2025         ; FUTBOL_LIVE_SEASONS (separadas por comas)
+#
+# Los artefactos del modelo de similitud (datos/similar_players.py) se leen de la sección [model]:
+#
+#   [model]
+#   dir = datos/modelo               ; FUTBOL_MODEL_DIR (por defecto, junto a este módulo)
+
+CONFIG_ENV = 'FUTBOL_CONFIG'
+CONFIG_FILE = 'futbol.ini'
+
+DEFAULTS = {
+    # Base de datos junto a este módulo (datos/model_data.db), sin depender del directorio de trabajo
+    'path': str(Path(__file__).with_name('model_data.db')),
+    'pool_size': '4',
+    'mmap_size': str(256 * 1024 * 1024),
+    'cache_size': str(64 * 1024),
+    'live_seasons': '2024-2025',
+}
+
+ENV_VARS = {
+    'path': 'FUTBOL_DB',
+    'pool_size': 'FUTBOL_DB_POOL_SIZE',
+    'mmap_size': 'FUTBOL_DB_MMAP_SIZE',
+    'cache_size': 'FUTBOL_DB_CACHE_SIZE',
+    'live_seasons': 'FUTBOL_LIVE_SEASONS',
+}
+
+MODEL_DEFAULTS = {
+    # Artefactos junto a este módulo (datos/modelo), como la base de datos
+    'dir': str(Path(__file__).with_name('modelo')),
+}
+MODEL_ENV_VARS = {'dir': 'FUTBOL_MODEL_DIR'}
+
+DatabaseSettings = namedtuple('DatabaseSettings', ['path', 'pool_size', 'mmap_size', 'cache_size', 'live_seasons'])
+
+
+# Función para leer la configuración: valores por defecto, archivo y variables de entorno
+def load_settings(config_file=None, environ=os.environ):
+    parser = configparser.ConfigParser()
+    parser.read_dict({'database': DEFAULTS})
+    # Si el archivo no existe se usan los valores por defecto
+    parser.read(config_file or environ.get(CONFIG_ENV, CONFIG_FILE), encoding='utf-8')
+    values = {key: environ.get(env, parser['database'][key]) for key, env in ENV_VARS.items()}
+    return DatabaseSettings(
+        path=values['path'],
+        pool_size=int(values['pool_size']),
+        mmap_size=int(values['mmap_size']),
+        cache_size=int(values['cache_size']),
+        live_seasons=tuple(s.strip() for s in values['live_seasons'].split(',') if s.strip()),
+    )
+
+
+# Función para leer la carpeta de los artefactos del modelo (sección [model])
+def load_model_dir(config_file=None, environ=os.environ):
+    parser = configparser.ConfigParser()
+    parser.read_dict({'model': MODEL_DEFAULTS})
+    parser.read(config_file or environ.get(CONFIG_ENV, CONFIG_FILE), encoding='utf-8')
+    return environ.get(MODEL_ENV_VARS['dir'], parser['model']['dir'])
+
+
+SETTINGS = load_settings()
+
+# Carpeta con los embeddings, el escalador y el encoder exportados al entrenar
+MODEL_DIR = load_model_dir()
+
+# Base de datos que leen las páginas
+DB_PATH = SETTINGS.path
+
+# Temporadas disponibles, de la más reciente a la más antigua
+SEASONS = ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021', '2019-2020', '2018-2019']
+
+# Temporadas que todavía reciben partidos (mismo valor por defecto que --live-season)
+LIVE_SEASONS = SETTINGS.live_seasons
@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Conexiones de solo lectura para las páginas de Streamlit. Un ConnectionManager por proceso
+# mantiene dos grupos pequeños de conexiones, compartidos por todas las sesiones:
+#   - temporada en curso: mode=ro, con los bloqueos normales de SQLite, porque el scraper
+#     la actualiza en el mismo archivo;
+#   - temporadas terminadas: mode=ro&immutable=1, sin bloqueos ni comprobaciones de cambios.
+#     Como el archivo es el mismo, antes de prestar una conexión se compara la firma del
+#     archivo (inodo, tamaño, fecha); si el scraper lo modificó, las conexiones se reabren.
+# Todas las conexiones activan mmap_size y cache_size y son query_only.
+
+
+# Función para abrir una conexión de solo lectura que se puede usar desde varios hilos
+def connect_readonly(db_path, immutable=False, mmap_size=0, cache_size=0):
+    uri = Path(db_path).resolve().as_uri() + '?mode=ro' + ('&immutable=1' if immutable else '')
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute('PRAGMA query_only=ON')
+    if mmap_size:
+        conn.execute(f'PRAGMA mmap_size={int(mmap_size)}')
+    if cache_size:
+        # Un valor negativo indica el tamaño en KiB en lugar de en páginas
+        conn.execute(f'PRAGMA cache_size={-int(cache_size)}')
+    return conn
+
+
+# Firma del archivo para detectar que el scraper lo modificó
+def file_signature(db_path):
+    stat = os.stat(db_path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+# No se liberó ninguna conexión antes del tiempo de espera
+class PoolExhaustedError(RuntimeError):
+    pass
+
+
+# Grupo de conexiones acotado y seguro entre hilos. Una condición protege el contador de
+# conexiones abiertas y la lista de libres: al devolver o descartar una conexión se despierta
+# a un hilo en espera, que vuelve a comprobar si puede tomar una libre o abrir otra.
+class ConnectionPool:
+    def __init__(self, connect, size=4, timeout=30.0, signature=None):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.signature = signature
+        # Conexiones libres (la última devuelta se presta primero)
+        self._idle = []
+        # Conexiones abiertas (incluidas las que se están abriendo) y la firma con la que se abrió cada una
+        self._open = 0
+        self._generation = {}
+        self._current = signature() if signature else None
+        self._lock = threading.Condition()
+        self._stats = {'creadas': 0, 'préstamos': 0, 'esperas': 0, 'espera_ms': 0.0, 'descartadas': 0}
+
+    # Si el archivo cambió, las conexiones abiertas se descartan (las prestadas, al devolverse)
+    def _check_signature(self):
+        if self.signature is None:
+            return
+        current = self.signature()
+        with self._lock:
+            if current == self._current:
+                return
+            self._current = current
+        self._close_idle()
+
+    def _close_idle(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            self._generation.pop(conn, None)
+            self._open -= 1
+            self._stats['descartadas'] += 1
+            # Hay lugar para abrir otra conexión
+            self._lock.notify()
+        conn.close()
+
+    def _release(self, conn):
+        with self._lock:
+            self._idle.append(conn)
+            self._lock.notify()
+
+    # Toma una conexión libre, abre una nueva si hay lugar o espera hasta timeout
+    def _acquire(self):
+        deadline = time.monotonic() + self.timeout
+        started = None
+        with self._lock:
+            while not self._idle and self._open >= self.size:
+                if started is None:
+                    started = time.perf_counter()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(f'Las {self.size} conexiones siguen en uso después de '
+                                             f'{self.timeout:g} s')
+                self._lock.wait(remaining)
+            if started is not None:
+                self._stats['esperas'] += 1
+                self._stats['espera_ms'] += (time.perf_counter() - started) * 1000
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+
+        try:
+            conn = self.connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._generation[conn] = self._current
+            self._stats['creadas'] += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        self._check_signature()
+        conn = self._acquire()
+        with self._lock:
+            self._stats['préstamos'] += 1
+            stale = self._generation.get(conn) != self._current
+        if stale:
+            self._discard(conn)
+            conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                stale = self._generation.get(conn) != self._current
+            if stale:
+                self._discard(conn)
+            else:
+                self._release(conn)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, tamaño=self.size, abiertas=self._open, libres=len(self._idle))
+        stats['en_uso'] = stats['abiertas'] - stats['libres']
+        return stats
+
+    def close(self):
+        self._close_idle()
+
+
+# Conexiones de las páginas: elige el grupo según la temporada consultada
+class ConnectionManager:
+    def __init__(self, settings):
+        self.settings = settings
+        self.live_seasons = set(settings.live_seasons)
+        self.live = ConnectionPool(lambda: self._connect(immutable=False), settings.pool_size)
+        self.archive = ConnectionPool(lambda: self._connect(immutable=True), settings.pool_size,
+                                      signature=lambda: file_signature(settings.path))
+
+    def _connect(self, immutable):
+        return connect_readonly(self.settings.path, immutable, self.settings.mmap_size, self.settings.cache_size)
+
+    # season=None (consultas que no dependen de la temporada) usa el grupo normal
+    def connection(self, season=None):
+        if season is None or season in self.live_seasons:
+            return self.live.connection()
+        return self.archive.connection()
+
+    def stats(self):
+        return {'temporada en curso': self.live.stats(), 'temporadas terminadas': self.archive.stats()}
+
+    def close(self):
+        self.live.close()
+        self.archive.close()
@@ -1,20 +1,18 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import pandas as pd
+import argparse
 import sqlite3
+from datetime import timedelta
+from io import StringIO
 
-# Iniciamos el WebDriver
-options = webdriver.ChromeOptions()
-options.add_argument('--headless')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-dev-shm-usage')
-driver = webdriver.Chrome(options=options)
+import pandas as pd
 
-# Conectamos a la base de datos SQLite (Si no existe se crea una)
-conn = sqlite3.connect('/content/data.db')
+from datos.config import LIVE_SEASONS, SETTINGS
+from datos.fetch import FallbackFetcher, HttpFetcher, SeleniumFetcher, find_table_html
+from datos.manifest import Manifest
+from datos.percentiles import PERCENTILES, build_percentiles
+from datos.player_season import PLAYER_SEASON, build_player_season
+from datos.players import StatTableWriter
+from datos.schema import normalize_table
+from datos.scraper import Job, Scraper
 
 # Lista de temporadas a considerar (Son todas las que estan disponibles en FBREF)
 seasons = ['2024-2025', '2023-2024', '2022-2023', '2021-2022', '2020-2021', '2019-2020', '2018-2019']
@@ -35,71 +33,102 @@ urls = {
     'stats_misc': 'https://fbref.com/en/comps/9/{}/misc/Premier-League-Stats'
 }
 
-# Definimos la función para cargar la tabla toamando el ID y el URL
-def load_table(url, table_id):
-  driver.get(url)
-  WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, table_id)))
-  soup = BeautifulSoup(driver.page_source, 'html.parser')
-  table = soup.find(id=table_id)
+FBREF_URL = 'https://fbref.com'
 
-  # Ajustamos los MultiIndex en los nombres de la columnas y convertimos los valores a numéricos
-  if table:
-    df = pd.read_html(str(table))[0]
-
-    if isinstance(df.columns, pd.MultiIndex):
-      df.columns = ['.'.join(filter(None, col)).strip() for col in df.columns]
-
-    # Definir las columnas que deben ser texto
-    text_columns = [
-            'Unnamed: 0_level_0.Rk', 'Unnamed: 1_level_0.Player',
-            'Unnamed: 2_level_0.Nation', 'Unnamed: 3_level_0.Pos',
-            'Unnamed: 4_level_0.Squad', 'Unnamed: 5_level_0.Age',
-            'Unnamed: 6_level_0.Born'
-        ]
-
-    # Renombrar las columnas eliminando el prefijo 'Unnamed: ...'
-    new_column_names = {
-            'Unnamed: 0_level_0.Rk': 'Rk',
-            'Unnamed: 1_level_0.Player': 'Player',
-            'Unnamed: 2_level_0.Nation': 'Nation',
-            'Unnamed: 3_level_0.Pos': 'Pos',
-            'Unnamed: 4_level_0.Squad': 'Squad',
-            'Unnamed: 5_level_0.Age': 'Age',
-            'Unnamed: 6_level_0.Born': 'Born'
-        }
-    df.rename(columns=new_column_names, inplace=True)
-
-    for column in df.columns:
-      if column not in new_column_names.values():
-        df[column] = pd.to_numeric(df[column], errors='coerce')
-
-    # Eliminar la última columna si contiene 'Matches' en su nombre
-    last_column = df.columns[-1]
-    if 'Matches' in last_column:
-        df.drop(columns=[last_column], inplace=True)
+# Definimos la función para cargar la tabla tomando el ID y el HTML de la página
+# (la tabla puede venir sola, en la página completa o dentro de un comentario HTML)
+def load_table(html, table_id):
+  table = find_table_html(html, table_id)
 
+  # Normalizamos nombres (con prefijo, p. ej. standard_Gls) y tipos según el esquema de la tabla
+  if table:
+    df = normalize_table(pd.read_html(StringIO(table))[0], table_id)
     print(f'Columnas en {table_id}: {df.columns.tolist()}')
     return df
 
   else:
-    print(f'No se encontró la tabla con el ID {table_id}')
     return None
 
-# Iteramos sobre las temporadas
-for season in seasons:
-  for stat_name, stat_url in urls.items():
-    formatted_url = stat_url.format(season)
-    table_id = stat_name
-    df = load_table(formatted_url, table_id)
-
-    if df is not None:
-      table_name = f'{season}_{table_id}'
-      df.to_sql(table_name, conn, if_exists='replace', index=False)
-      print(f'Datos de {table_name} guardados en la base de datos.')
-    else:
-      print(f'No se pudo obtener la tabla para {table_name}.')
-
-# Cerramos la conección a la base de datos y el WebDriver
-conn.close()
-driver.quit()
-print("Proceso completado, datos guardados en data.db")
\ No newline at end of file
+# Construimos la lista de tareas (temporada x tabla); base_url permite apuntar a un servidor local
+def build_jobs(seasons, urls, base_url=FBREF_URL):
+  jobs = []
+  for season in seasons:
+    for stat_name, stat_url in urls.items():
+      formatted_url = stat_url.format(season).replace(FBREF_URL, base_url.rstrip('/'), 1)
+      jobs.append(Job(f'{season}_{stat_name}', formatted_url, stat_name))
+  return jobs
+
+# Temporada a la que pertenece una tarea (las escrituras se confirman por temporada)
+def season_of(job):
+  return job.table_name.split('_', 1)[0]
+
+# Creamos el backend de descarga elegido
+def make_fetcher(backend, workers, fallback=True):
+  if backend == 'selenium':
+    return SeleniumFetcher()
+  fetcher = HttpFetcher(pool_size=workers)
+  if fallback:
+    fetcher = FallbackFetcher(fetcher, SeleniumFetcher())
+  return fetcher
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Descarga las tablas de FBREF a una base de datos SQLite.')
+  parser.add_argument('--db', default=SETTINGS.path, help='Ruta de la base de datos SQLite (por defecto, la de futbol.ini o FUTBOL_DB)')
+  parser.add_argument('--seasons', nargs='+', default=seasons, help='Temporadas a descargar')
+  parser.add_argument('--workers', type=int, default=4, help='Número de páginas descargadas en paralelo')
+  parser.add_argument('--rate', type=float, default=0.5, help='Peticiones por segundo permitidas por host')
+  parser.add_argument('--retries', type=int, default=3, help='Reintentos por página antes de darla por perdida')
+  parser.add_argument('--backoff', type=float, default=2.0, help='Espera base (s) entre reintentos')
+  parser.add_argument('--base-url', default=FBREF_URL, help='Servidor a consultar (p. ej. un fixture_server local)')
+  parser.add_argument('--save-fixtures', metavar='DIR', help='Guardar el HTML descargado para pruebas sin conexión')
+  parser.add_argument('--backend', choices=['http', 'selenium'], default='http',
+                      help='http descarga el HTML estático sin navegador; selenium usa Chrome headless')
+  parser.add_argument('--no-fallback', action='store_true',
+                      help='Con --backend http, no recurrir a Selenium cuando la tabla no aparece')
+  parser.add_argument('--incremental', action='store_true',
+                      help='Solo descargar tablas nuevas o de la temporada en curso, y reescribir solo si cambiaron')
+  parser.add_argument('--live-season', nargs='+', default=list(LIVE_SEASONS),
+                      help='Temporadas en curso, que se vuelven a descargar en modo incremental')
+  parser.add_argument('--max-age-hours', type=float, default=24,
+                      help='Antigüedad mínima de una tabla de la temporada en curso para volver a descargarla')
+  args = parser.parse_args(argv)
+
+  jobs = build_jobs(args.seasons, urls, args.base_url)
+  conn = sqlite3.connect(args.db)
+  try:
+    manifest = Manifest(conn, args.live_season, timedelta(hours=args.max_age_hours))
+  finally:
+    conn.close()
+  skipped = []
+  if args.incremental:
+    jobs, skipped = manifest.plan(jobs)
+    print(f'Modo incremental: {len(jobs)} tablas por descargar, {len(skipped)} al día')
+
+  fetcher = make_fetcher(args.backend, args.workers, fallback=not args.no_fallback)
+  sink = manifest.sink(StatTableWriter(args.db))
+  scraper = Scraper(manifest.fetcher(fetcher, jobs, force=not args.incremental), load_table, sink,
+                    workers=args.workers, rate=args.rate, retries=args.retries, backoff=args.backoff,
+                    fixtures_dir=args.save_fixtures, group_by=season_of)
+  try:
+    stats = scraper.run(jobs)
+  finally:
+    # Cerramos las sesiones HTTP y los WebDriver
+    fetcher.close()
+
+  print(stats.report())
+
+  # Reconstruimos la tabla consolidada y los percentiles si alguna tabla cambió
+  if stats.pages:
+    conn = sqlite3.connect(args.db)
+    try:
+      build_player_season(conn)
+      print(f'Tabla {PLAYER_SEASON} reconstruida.')
+      build_percentiles(conn)
+      print(f'Tabla {PERCENTILES} reconstruida.')
+    finally:
+      conn.close()
+  print(f"Proceso completado, datos guardados en {args.db}")
+  return stats
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,149 @@
+import argparse
+
+import numpy as np
+
+from datos.features import NUMERICAL_COLUMNS, POSITION_COLUMNS, scale
+
+# Inferencia del encoder del autoencoder solo con NumPy. El encoder son tres capas Dense
+# (64 -> 32 -> 16, ReLU), así que calcular los embeddings es multiplicar matrices: no hace
+# falta importar TensorFlow (segundos de arranque y cientos de MB) para procesar jugadores
+# nuevos o actualizados en la aplicación, por ejemplo las filas en vivo de 2024-2025.
+#
+# export_encoder guarda los pesos de las capas Dense hasta la capa de embeddings en un .npz
+# (kernel_i, bias_i y activations) junto con las columnas y el escalado Min-Max del almacén
+# de características, para poder embeber filas sin escalar.
+#   python -m datos.encoder --model autoencoder.keras --features datos/features --out datos/modelo/encoder.npz
+
+# Capa de salida del encoder en modelo.py
+EMBEDDING_LAYER = 'embedding_layer'
+
+# Filas por bloque en predict
+BATCH_SIZE = 8192
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'tanh': lambda x: np.tanh(x, out=x),
+    'sigmoid': lambda x: np.divide(1, 1 + np.exp(-x), out=x),
+}
+
+
+# Nombre de la activación de una capa de Keras ('relu', 'linear', ...)
+def _activation_name(layer):
+    activation = layer.get_config().get('activation', 'linear')
+    if isinstance(activation, dict):
+        activation = activation.get('config', {}).get('name', activation.get('class_name'))
+    return str(activation).lower()
+
+
+# Función para exportar las capas Dense del modelo hasta la capa layer (incluida) a un .npz.
+# store es el almacén de características con el que se entrenó (columnas y escalado).
+def export_encoder(model, path, layer=EMBEDDING_LAYER, store=None):
+    layers = []
+    for keras_layer in model.layers:
+        weights = keras_layer.get_weights()
+        if weights:
+            activation = _activation_name(keras_layer)
+            if activation not in ACTIVATIONS:
+                raise ValueError(f'Activación no soportada en {keras_layer.name}: {activation}')
+            kernel = np.asarray(weights[0], dtype=np.float32)
+            bias = np.asarray(weights[1], dtype=np.float32) if len(weights) > 1 else np.zeros(kernel.shape[1], np.float32)
+            layers.append((kernel, bias, activation))
+        if keras_layer.name == layer:
+            break
+    else:
+        raise ValueError(f'El modelo no tiene la capa {layer}')
+    if store is None:
+        encoder = NumpyEncoder(layers)
+    else:
+        encoder = NumpyEncoder(layers, list(store.columns), np.asarray(store.minimum), np.asarray(store.maximum))
+    encoder.save(path)
+    return encoder
+
+
+class NumpyEncoder:
+    def __init__(self, layers, columns=None, minimum=None, maximum=None):
+        self.layers = layers
+        self.columns = columns
+        self.minimum = minimum
+        self.maximum = maximum
+
+    # Función para abrir los pesos exportados con export_encoder
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            activations = [str(a) for a in arrays['activations']]
+            layers = [(arrays[f'kernel_{i}'], arrays[f'bias_{i}'], a) for i, a in enumerate(activations)]
+            if 'columns' in arrays:
+                return cls(layers, [str(c) for c in arrays['columns']], arrays['minimum'], arrays['maximum'])
+        return cls(layers)
+
+    # Función para guardar los pesos en un .npz: kernel_i, bias_i, activations y, si están,
+    # las columnas y el escalado
+    def save(self, path):
+        arrays = {'activations': np.array([activation for _, _, activation in self.layers])}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel_{i}'] = kernel
+            arrays[f'bias_{i}'] = bias
+        if self.minimum is not None:
+            arrays.update(columns=np.array(self.columns), minimum=np.asarray(self.minimum, dtype=np.float64),
+                          maximum=np.asarray(self.maximum, dtype=np.float64))
+        np.savez(path, **arrays)
+
+    @property
+    def input_dim(self):
+        return self.layers[0][0].shape[0]
+
+    @property
+    def output_dim(self):
+        return self.layers[-1][0].shape[1]
+
+    # Función para calcular los embeddings de una matriz ya escalada, por bloques (como
+    # embedding_model.predict, en float32)
+    def predict(self, X, batch_size=BATCH_SIZE):
+        X = np.atleast_2d(X)
+        if X.shape[1] != self.input_dim:
+            raise ValueError(f'Se esperaban {self.input_dim} columnas y llegaron {X.shape[1]}')
+        out = np.empty((len(X), self.output_dim), dtype=np.float32)
+        for start in range(0, len(X), batch_size):
+            x = np.asarray(X[start:start + batch_size], dtype=np.float32)
+            for kernel, bias, activation in self.layers:
+                x = x @ kernel
+                x += bias
+                x = ACTIVATIONS[activation](x)
+            out[start:start + batch_size] = x
+        return out
+
+    # Función para construir la matriz del modelo a partir de filas sin escalar (un DataFrame
+    # con las columnas numéricas y las de posición, como los processed_{temporada}.parquet)
+    def transform(self, frame):
+        if self.minimum is None:
+            raise ValueError('El encoder se exportó sin el escalado del almacén de características')
+        numeric = frame[NUMERICAL_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+        positions = frame[POSITION_COLUMNS].fillna(False).to_numpy(dtype=np.float64)
+        return np.hstack([scale(numeric, self.minimum, self.maximum), positions]).astype(np.float32)
+
+    # Función para calcular los embeddings de filas sin escalar
+    def embed(self, frame, batch_size=BATCH_SIZE):
+        return self.predict(self.transform(frame), batch_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Exporta los pesos del encoder a un archivo .npz.')
+    parser.add_argument('--model', required=True, help='Autoencoder guardado con model.save (.keras)')
+    parser.add_argument('--features', help='Almacén de características con el que se entrenó (escalado)')
+    parser.add_argument('--out', required=True, help='Archivo .npz de salida')
+    parser.add_argument('--layer', default=EMBEDDING_LAYER, help='Última capa del encoder')
+    args = parser.parse_args(argv)
+
+    from tensorflow import keras
+
+    from datos.features import load_feature_store
+
+    store = load_feature_store(args.features) if args.features else None
+    encoder = export_encoder(keras.models.load_model(args.model), args.out, args.layer, store)
+    print(f'Encoder de {len(encoder.layers)} capas ({encoder.input_dim} -> {encoder.output_dim}) en {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+import argparse
+import configparser
+import csv
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from datos.features import FEATURE_COLUMNS, NUMERICAL_COLUMNS, processed_files
+
+# Entrenamientos reproducibles del autoencoder. La configuración se lee de la sección
+# [training] de un archivo INI (las opciones de la línea de comandos la sobreescriben):
+#
+#   [training]
+#   units = 64,32,16          ; capas del encoder (la última es la de embeddings)
+#   epochs = 50
+#   batch_size = 1024
+#   learning_rate = 1e-4      ; la de modelo.py
+#   scale_lr = false          ; escalar la tasa de aprendizaje con el lote (regla lineal)
+#   seed = 42
+#   val_fraction = 0.2
+#   patience = 10             ; épocas sin mejorar val_loss antes de parar
+#   source = datos            ; carpeta con los processed_{temporada}.parquet
+#   features =                ; almacén de características (en lugar de los parquet)
+#   seasons =                 ; temporadas separadas por comas (vacío: todas; también filtra el almacén)
+#   out = datos/entrenamientos
+#
+# Cada entrenamiento vive en out/<hash>, donde el hash (SHA-256) cubre la configuración, el
+# contenido de los archivos de entrada y el código del modelo. Si la carpeta ya tiene
+# metrics.json, el entrenamiento no se repite. Si se interrumpió, continúa desde la última
+# época guardada (BackupAndRestore). Al terminar la carpeta contiene:
+#
+#   config.json     configuración y hashes de las entradas
+#   model.keras     autoencoder con los pesos de la mejor val_loss
+#   encoder.npz     pesos del encoder para NumPy (datos/encoder.py)
+#   scaler.json     mínimos y máximos del escalado Min-Max
+#   features.json   columnas de entrada del modelo, en orden
+#   history.csv     pérdida por época (también de las sesiones anteriores)
+#   metrics.json    mejor val_loss, época, épocas entrenadas y tiempo
+#
+# out/latest guarda el nombre del último entrenamiento terminado.
+#   python -m datos.experiments --config entrenamiento.ini
+#   python -m datos.experiments --epochs 100 --batch-size 2048
+
+TRAINING_SECTION = 'training'
+
+DEFAULTS = {
+    'units': '64,32,16',
+    'epochs': '50',
+    'batch_size': '1024',
+    'learning_rate': '1e-4',
+    'scale_lr': 'false',
+    'seed': '42',
+    'val_fraction': '0.2',
+    'patience': '10',
+    'source': 'datos',
+    'features': '',
+    'seasons': '',
+    'out': 'datos/entrenamientos',
+}
+
+TrainingConfig = namedtuple('TrainingConfig', ['units', 'epochs', 'batch_size', 'learning_rate', 'scale_lr',
+                                               'seed', 'val_fraction', 'patience', 'source', 'features', 'seasons', 'out'])
+
+# Columnas y escalado con la forma que espera export_encoder (como un almacén de características)
+_Scaling = namedtuple('_Scaling', ['columns', 'minimum', 'maximum'])
+
+# Archivos del almacén de características que forman parte de las entradas
+STORE_FILES = ('features.npy', 'index.parquet', 'meta.json')
+
+# Código que define el modelo, el pipeline, el entrenamiento y la exportación: si cambia,
+# cambia el hash
+CODE_FILES = ('training.py', 'features.py', 'experiments.py', 'encoder.py')
+
+LATEST_FILE = 'latest'
+BACKUP_DIR = 'backup'
+BEST_WEIGHTS = 'best.weights.h5'
+
+# Bloque de lectura al calcular el hash de un archivo
+HASH_BLOCK = 1 << 20
+
+
+# Función para leer la configuración: valores por defecto, archivo y opciones (sin None)
+def load_training_config(config_file=None, **overrides):
+    parser = configparser.ConfigParser(inline_comment_prefixes=(';',))
+    parser.read_dict({TRAINING_SECTION: DEFAULTS})
+    if config_file:
+        if not parser.read(config_file, encoding='utf-8'):
+            raise FileNotFoundError(f'No existe el archivo de configuración {config_file}')
+    values = dict(parser[TRAINING_SECTION])
+    values.update({key: str(value) for key, value in overrides.items() if value is not None})
+    return TrainingConfig(
+        units=tuple(int(n) for n in values['units'].split(',') if n.strip()),
+        epochs=int(values['epochs']),
+        batch_size=int(values['batch_size']),
+        learning_rate=float(values['learning_rate']),
+        scale_lr=values['scale_lr'].strip().lower() in ('1', 'yes', 'true', 'on'),
+        seed=int(values['seed']),
+        val_fraction=float(values['val_fraction']),
+        patience=int(values['patience']),
+        source=values['source'],
+        features=values['features'] or None,
+        seasons=tuple(s.strip() for s in values['seasons'].split(',') if s.strip()) or None,
+        out=values['out'],
+    )
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Función para obtener los hashes de los archivos de entrada: {nombre: sha256}
+def input_hashes(config):
+    if config.features:
+        paths = [os.path.join(config.features, name) for name in STORE_FILES]
+    else:
+        paths = list(processed_files(config.source, config.seasons).values())
+        if not paths:
+            raise FileNotFoundError(f'No hay archivos processed_{{temporada}}.parquet en {config.source}')
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths += [os.path.join(here, name) for name in CODE_FILES]
+    return {os.path.basename(path): file_hash(path) for path in paths}
+
+
+# Función para calcular el identificador del entrenamiento: hash de la configuración (sin la
+# carpeta de salida) y de las entradas
+def run_id(config, inputs):
+    settings = config._replace(out=None)._asdict()
+    payload = json.dumps({'config': settings, 'inputs': inputs}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# Mejor val_loss y su época según history.csv (de todas las sesiones)
+def _best_from_history(path):
+    if not os.path.exists(path):
+        return None, None
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.DictReader(f) if row.get('val_loss')]
+    if not rows:
+        return None, None
+    best = min(rows, key=lambda row: float(row['val_loss']))
+    return float(best['val_loss']), int(best['epoch'])
+
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# Función para entrenar según la configuración. Devuelve (carpeta del entrenamiento, métricas);
+# si ya existía con el mismo hash devuelve sus métricas sin entrenar (salvo con force=True).
+def run_training(config, force=False, verbose=1):
+    inputs = input_hashes(config)
+    run_dir = os.path.join(config.out, run_id(config, inputs))
+    metrics_path = os.path.join(run_dir, 'metrics.json')
+    if os.path.exists(metrics_path) and not force:
+        with open(metrics_path, encoding='utf-8') as f:
+            return run_dir, dict(json.load(f), cached=True)
+
+    import tensorflow as tf
+
+    from datos.encoder import export_encoder
+    from datos.training import build_autoencoder, make_datasets, scaled_learning_rate
+
+    # force empieza de cero: sin checkpoints ni historia del entrenamiento anterior
+    if force and os.path.isdir(run_dir):
+        shutil.rmtree(run_dir)
+    os.makedirs(run_dir, exist_ok=True)
+    _write_json(os.path.join(run_dir, 'config.json'), {'config': config._asdict(), 'inputs': inputs})
+
+    # Misma semilla y operaciones deterministas: dos entrenamientos iguales dan los mismos pesos
+    tf.keras.utils.set_random_seed(config.seed)
+    tf.config.experimental.enable_op_determinism()
+    train, val, minimum, maximum = make_datasets(config.source, config.features, config.batch_size,
+                                                 config.seasons, config.val_fraction, config.seed,
+                                                 deterministic=True)
+    learning_rate = config.learning_rate
+    if config.scale_lr:
+        learning_rate = scaled_learning_rate(config.batch_size, learning_rate)
+    model = build_autoencoder(len(FEATURE_COLUMNS), config.units, learning_rate)
+
+    # Al continuar un entrenamiento, el mejor checkpoint solo se reemplaza si mejora la val_loss anterior
+    history_path = os.path.join(run_dir, 'history.csv')
+    best_path = os.path.join(run_dir, BEST_WEIGHTS)
+    best_loss, _ = _best_from_history(history_path)
+    callbacks = [
+        tf.keras.callbacks.BackupAndRestore(os.path.join(run_dir, BACKUP_DIR)),
+        tf.keras.callbacks.ModelCheckpoint(best_path, monitor='val_loss', save_best_only=True,
+                                           save_weights_only=True, initial_value_threshold=best_loss),
+        tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=config.patience),
+        tf.keras.callbacks.CSVLogger(history_path, append=True),
+    ]
+    start = time.perf_counter()
+    model.fit(train, epochs=config.epochs, validation_data=val, callbacks=callbacks, verbose=verbose)
+    elapsed = time.perf_counter() - start
+
+    # Artefactos con los pesos de la mejor época. Si ninguna época guardó checkpoint (val_loss
+    # siempre NaN, o una sesión reanudada que no mejoró y sin checkpoint previo) quedan los
+    # pesos de la última época.
+    if os.path.exists(best_path):
+        model.load_weights(best_path)
+    model.save(os.path.join(run_dir, 'model.keras'))
+    store = _Scaling(FEATURE_COLUMNS, np.asarray(minimum), np.asarray(maximum))
+    export_encoder(model, os.path.join(run_dir, 'encoder.npz'), store=store)
+    _write_json(os.path.join(run_dir, 'scaler.json'),
+                {'minimum': dict(zip(NUMERICAL_COLUMNS, store.minimum.tolist())),
+                 'maximum': dict(zip(NUMERICAL_COLUMNS, store.maximum.tolist()))})
+    _write_json(os.path.join(run_dir, 'features.json'), FEATURE_COLUMNS)
+
+    best_loss, best_epoch = _best_from_history(history_path)
+    with open(history_path, newline='', encoding='utf-8') as f:
+        epochs_run = len({row['epoch'] for row in csv.DictReader(f)})
+    metrics = {'val_loss': best_loss, 'best_epoch': best_epoch, 'epochs': epochs_run,
+               'seconds': round(elapsed, 1)}
+    # metrics.json se escribe al final: marca el entrenamiento como terminado
+    _write_json(metrics_path, metrics)
+    with open(os.path.join(config.out, LATEST_FILE), 'w', encoding='utf-8') as f:
+        f.write(os.path.basename(run_dir) + '\n')
+    return run_dir, dict(metrics, cached=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Entrena el autoencoder de forma reproducible.')
+    parser.add_argument('--config', help='Archivo INI con la sección [training]')
+    parser.add_argument('--units', help='Capas del encoder, separadas por comas (p. ej. 64,32,16)')
+    parser.add_argument('--epochs', type=int)
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--learning-rate', type=float)
+    parser.add_argument('--scale-lr', action='store_true', default=None,
+                        help='Escalar la tasa de aprendizaje con el lote (regla lineal desde lotes de 32)')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--patience', type=int)
+    parser.add_argument('--val-fraction', type=float, help='Fracción de filas para validación')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a incluir (por defecto, todas)')
+    parser.add_argument('--source', help='Carpeta con los archivos processed_{temporada}.parquet')
+    parser.add_argument('--features', help='Almacén de características (en lugar de los parquet)')
+    parser.add_argument('--out', help='Carpeta de los entrenamientos')
+    parser.add_argument('--force', action='store_true', help='Entrenar aunque ya exista un resultado')
+    args = parser.parse_args(argv)
+
+    config = load_training_config(args.config, units=args.units, epochs=args.epochs, batch_size=args.batch_size,
+                                  learning_rate=args.learning_rate, scale_lr=args.scale_lr, seed=args.seed,
+                                  patience=args.patience, val_fraction=args.val_fraction,
+                                  seasons=','.join(args.seasons) if args.seasons else None,
+                                  source=args.source, features=args.features, out=args.out)
+    run_dir, metrics = run_training(config, args.force)
+    state = 'sin cambios, resultado en caché' if metrics['cached'] else f'{metrics["seconds"]} s'
+    if metrics['val_loss'] is None:
+        # Sin val_loss en history.csv (p. ej. el conjunto de validación quedó vacío)
+        print(f'{run_dir}: sin val_loss registrada ({state})')
+    else:
+        print(f'{run_dir}: val_loss {metrics["val_loss"]:.5f} en la época {metrics["best_epoch"]} ({state})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import os
+import re
+import sqlite3
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+from datos.charts import PIZZA_LABELS, PIZZA_METRICS, figure_bytes, pizza_figure, row_values
+from datos.config import SETTINGS
+from datos.percentiles import get_percentiles, primary_position
+from datos.player_season import season_tables
+
+# Exportación de gráficos de pizza por lotes: todos los jugadores de una temporada, de un
+# equipo o de una posición, como archivos PNG/SVG/PDF en una carpeta o en un solo zip.
+# Los percentiles se leen (o calculan) una sola vez por temporada en el proceso principal;
+# el dibujo se reparte entre varios procesos con el backend Agg.
+
+FORMATS = ('png', 'svg', 'pdf')
+
+# PNG y PDF ya vienen comprimidos; el SVG es texto y sí se comprime
+ZIP_COMPRESSION = {'png': zipfile.ZIP_STORED, 'pdf': zipfile.ZIP_STORED, 'svg': zipfile.ZIP_DEFLATED}
+
+
+def _init_worker():
+    matplotlib.use('Agg')
+
+
+# Función para generar un nombre de archivo válido
+def safe_name(name):
+    return re.sub(r'[\\/:*?"<>|]+', '_', str(name)).strip()
+
+
+# Ruta del gráfico dentro de la salida; el player_id distingue a los jugadores con el mismo
+# nombre (como en datos/players.py), que si no se sobreescribirían entre sí
+def chart_path(season, team, player, player_id, fmt):
+    return f'{season}/{safe_name(team)}/{safe_name(player)}_{player_id}.{fmt}'
+
+
+# Tarea de un proceso: dibuja la figura una vez y la guarda en todos los formatos pedidos
+def render_task(task):
+    row, season, formats, dpi, labels = task
+    fig = pizza_figure(row_values(row), row['Player'], season, row['Squad'], row['Pos'], rename_dict=labels)
+    try:
+        return [(chart_path(season, row['Squad'], row['Player'], row['player_id'], fmt),
+                 figure_bytes(fig, fmt, dpi, clear=False)) for fmt in formats]
+    finally:
+        fig.clear()
+
+
+# Función para armar las tareas de una temporada con una sola lectura de percentiles
+def season_tasks(conn, season, teams=None, positions=None, formats=('png',), dpi=100, labels=PIZZA_LABELS):
+    df = get_percentiles(conn, season, PIZZA_METRICS)
+    if teams:
+        df = df[df['Squad'].isin(teams)]
+    if positions:
+        df = df[primary_position(df['Pos']).isin(positions)]
+    return [(row, season, tuple(formats), dpi, labels) for row in df.to_dict('records')]
+
+
+# Destino de los archivos: una carpeta o un zip
+class ChartOutput:
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path, 'w') if path.endswith('.zip') else None
+
+    def write(self, name, content):
+        if self.zip is not None:
+            self.zip.writestr(name, content, compress_type=ZIP_COMPRESSION[name.rsplit('.', 1)[-1]])
+            return
+        target = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+
+    def close(self):
+        if self.zip is not None:
+            self.zip.close()
+
+
+def _write_results(results, output):
+    count = 0
+    for files in results:
+        for name, content in files:
+            output.write(name, content)
+        count += 1
+    return count
+
+
+# Dibuja las tareas en paralelo; los archivos se escriben en el proceso principal
+def export_charts(tasks, output, workers=None, chunksize=4):
+    if workers == 1:
+        return _write_results(map(render_task, tasks), output)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return _write_results(executor.map(render_task, tasks, chunksize=chunksize), output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Exporta los gráficos de pizza de una temporada, equipo o posición.')
+    parser.add_argument('--db', default=SETTINGS.path, help='Ruta de la base de datos SQLite (por defecto, la de futbol.ini o FUTBOL_DB)')
+    parser.add_argument('--out', required=True, help='Carpeta de salida o archivo .zip')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a exportar (por defecto, todas)')
+    parser.add_argument('--teams', nargs='+', help='Equipos a exportar (por defecto, toda la liga)')
+    parser.add_argument('--positions', nargs='+', choices=['GK', 'DF', 'MF', 'FW'],
+                        help='Posiciones primarias a exportar')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['png'], help='Formatos de imagen')
+    parser.add_argument('--dpi', type=int, default=100, help='Resolución de las imágenes PNG')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Procesos para dibujar')
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        seasons = args.seasons or sorted(season_tables(conn), reverse=True)
+        tasks = []
+        for season in seasons:
+            tasks += season_tasks(conn, season, args.teams, args.positions, args.formats, args.dpi)
+    finally:
+        conn.close()
+
+    output = ChartOutput(args.out)
+    start = time.perf_counter()
+    try:
+        count = export_charts(tasks, output, args.workers)
+    finally:
+        output.close()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed else 0.0
+    print(f'Gráficos exportados: {count} en {elapsed:.1f} s ({rate:.2f} gráficos/s, {args.workers} procesos)')
+    print(f'Archivos guardados en {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# Almacén de características del modelo de similitud. Las 15 columnas que usa el autoencoder
+# (11 numéricas escaladas a [0, 1] con Min-Max y las 4 posiciones) se guardan una sola vez
+# como una matriz float32 contigua en un archivo .npy, que se abre con np.load(mmap_mode='r')
+# sin copiarla a memoria. La temporada, el nombre y el player_id de cada fila van aparte en
+# index.parquet, y los mínimos y máximos del escalado en meta.json.
+#
+# Los archivos processed_{temporada}.parquet se recorren por lotes dos veces: la primera
+# cuenta las filas completas y calcula mínimos y máximos; la segunda escribe cada lote ya
+# escalado en su lugar dentro de la matriz. Así nunca hay en memoria más de un lote además
+# de la propia matriz.
+#   python -m datos.features --source datos --out datos/features
+
+NUMERICAL_COLUMNS = ['Age', 'standard_Min', 'standard_Gls', 'standard_Ast',
+                     'shooting_Sh', 'shooting_SoT', 'passing_Cmp', 'passing_Att',
+                     'defense_Tkl', 'defense_TklW', 'possession_Touches']
+
+POSITION_COLUMNS = ['GK', 'DF', 'MF', 'FW']
+
+FEATURE_COLUMNS = NUMERICAL_COLUMNS + POSITION_COLUMNS
+
+FEATURES_FILE = 'features.npy'
+INDEX_FILE = 'index.parquet'
+META_FILE = 'meta.json'
+
+BATCH_SIZE = 65536
+
+PROCESSED_FILE = re.compile(r'processed_(\d{4}-\d{4})\.parquet$')
+
+FeatureStore = namedtuple('FeatureStore', ['features', 'index', 'columns', 'minimum', 'maximum'])
+
+
+# Función para encontrar los archivos procesados de cada temporada: {temporada: ruta}
+def processed_files(source, seasons=None):
+    files = {}
+    for name in sorted(os.listdir(source), reverse=True):
+        match = PROCESSED_FILE.match(name)
+        if match and (seasons is None or match.group(1) in seasons):
+            files[match.group(1)] = os.path.join(source, name)
+    return files
+
+
+# Lotes de un archivo: (Player y player_id, matriz numérica float64, posiciones bool) solo de
+# las filas sin NaN. En los archivos sin player_id la columna queda vacía.
+def valid_batches(path, batch_size=BATCH_SIZE):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    ids = 'player_id' in parquet.schema_arrow.names
+    columns = ['Player'] + (['player_id'] if ids else []) + FEATURE_COLUMNS
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        # Los conteos vienen en int16; los vacíos se convierten en NaN
+        numeric = np.column_stack([batch.column(c).to_numpy(zero_copy_only=False).astype(np.float64)
+                                   for c in NUMERICAL_COLUMNS])
+        valid = ~np.isnan(numeric).any(axis=1)
+        if not valid.any():
+            continue
+        positions = np.column_stack([batch.column(c).fill_null(False).to_numpy(zero_copy_only=False)
+                                     for c in POSITION_COLUMNS])
+        player_id = batch.column('player_id') if ids else pa.nulls(batch.num_rows, pa.int32())
+        players = pa.record_batch([batch.column('Player'), player_id.cast(pa.int32())], ['Player', 'player_id'])
+        yield players.filter(pa.array(valid)), numeric[valid], positions[valid]
+
+
+# Primera pasada: filas completas y rango de cada columna numérica
+def scan(files, batch_size=BATCH_SIZE):
+    rows = 0
+    minimum = np.full(len(NUMERICAL_COLUMNS), np.inf)
+    maximum = np.full(len(NUMERICAL_COLUMNS), -np.inf)
+    for path in files.values():
+        for _, numeric, _ in valid_batches(path, batch_size):
+            rows += len(numeric)
+            np.minimum(minimum, numeric.min(axis=0), out=minimum)
+            np.maximum(maximum, numeric.max(axis=0), out=maximum)
+    return rows, minimum, maximum
+
+
+# Función para escalar con Min-Max (igual que MinMaxScaler: columnas constantes quedan en 0)
+def scale(numeric, minimum, maximum):
+    span = np.asarray(maximum, dtype=np.float64) - minimum
+    span[span == 0] = 1.0
+    return (numeric - minimum) / span
+
+
+# Función para construir el almacén a partir de los archivos processed_{temporada}.parquet
+def build_feature_store(source, out_dir, seasons=None, batch_size=BATCH_SIZE):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    files = processed_files(source, seasons)
+    if not files:
+        raise FileNotFoundError(f'No hay archivos processed_{{temporada}}.parquet en {source}')
+    rows, minimum, maximum = scan(files, batch_size)
+
+    os.makedirs(out_dir, exist_ok=True)
+    features_path = os.path.join(out_dir, FEATURES_FILE)
+    # Se escribe en un archivo temporal para no dejar a medias un almacén que otros estén leyendo
+    tmp_path = features_path + '.tmp'
+    features = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32,
+                                         shape=(rows, len(FEATURE_COLUMNS)))
+    players, ids, season_column = [], [], []
+    start = 0
+    for season, path in files.items():
+        for batch, numeric, positions in valid_batches(path, batch_size):
+            end = start + len(numeric)
+            features[start:end, :len(NUMERICAL_COLUMNS)] = scale(numeric, minimum, maximum)
+            features[start:end, len(NUMERICAL_COLUMNS):] = positions
+            # En los archivos anteriores el nombre venía como "temporada, jugador"
+            players.append(pc.replace_substring_regex(batch.column('Player').cast(pa.string()), r'^\d{4}-\d{4}, ', ''))
+            ids.append(batch.column('player_id'))
+            season_column.append(pa.array(np.full(len(numeric), season)))
+            start = end
+    features.flush()
+    del features
+    os.replace(tmp_path, features_path)
+
+    index = pa.table({'Season': pa.chunked_array(season_column, pa.string()).dictionary_encode(),
+                      'Player': pa.chunked_array(players, pa.string()).dictionary_encode(),
+                      'player_id': pa.chunked_array(ids, pa.int32())})
+    pq.write_table(index, os.path.join(out_dir, INDEX_FILE))
+    with open(os.path.join(out_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'columns': FEATURE_COLUMNS, 'rows': rows, 'seasons': list(files),
+                   'minimum': dict(zip(NUMERICAL_COLUMNS, minimum.tolist())),
+                   'maximum': dict(zip(NUMERICAL_COLUMNS, maximum.tolist()))}, f, indent=2)
+    return rows
+
+
+# Función para abrir el almacén: la matriz queda mapeada en memoria, de solo lectura
+def load_feature_store(out_dir, mmap_mode='r'):
+    import pandas as pd
+
+    with open(os.path.join(out_dir, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    features = np.load(os.path.join(out_dir, FEATURES_FILE), mmap_mode=mmap_mode)
+    index = pd.read_parquet(os.path.join(out_dir, INDEX_FILE))
+    # Los almacenes anteriores no tienen player_id; los vacíos no deben convertir los ids en float
+    if 'player_id' in index:
+        index['player_id'] = index['player_id'].astype('Int32')
+    minimum = np.array([meta['minimum'][c] for c in NUMERICAL_COLUMNS])
+    maximum = np.array([meta['maximum'][c] for c in NUMERICAL_COLUMNS])
+    return FeatureStore(features, index, meta['columns'], minimum, maximum)
+
+
+# Etiquetas "temporada, jugador" como las que usaba modelo.py
+def player_labels(index):
+    return (index['Season'].astype(str) + ', ' + index['Player'].astype(str)).to_numpy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Construye el almacén de características del modelo.')
+    parser.add_argument('--source', default='datos', help='Carpeta con los archivos processed_{temporada}.parquet')
+    parser.add_argument('--out', default='datos/features', help='Carpeta del almacén')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a incluir (por defecto, todas)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Filas por lote al leer los parquet')
+    args = parser.parse_args(argv)
+
+    rows = build_feature_store(args.source, args.out, args.seasons, args.batch_size)
+    print(f'Almacén de características: {rows} filas x {len(FEATURE_COLUMNS)} columnas en {args.out}')
+
+
+if __name__ == '__main__':
+    main()
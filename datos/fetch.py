@@ -0,0 +1,160 @@
+import threading
+from collections import namedtuple
+
+from lxml import etree
+
+# Backends de descarga para el scraper. Todos son invocables con la firma
+# fetch(url, table_id) y devuelven un HTML que contiene la tabla buscada:
+#   - HttpFetcher: HTTP simple con sesión keep-alive, sin navegador. Lee la
+#     respuesta por bloques y se detiene en cuanto encuentra la tabla.
+#   - SeleniumFetcher: Chrome headless, se mantiene como respaldo.
+
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/124.0 Safari/537.36')
+
+
+# HTML descargado junto con los validadores HTTP que permiten una petición condicional
+Page = namedtuple('Page', ['html', 'etag', 'last_modified'])
+
+
+class TableNotFoundError(LookupError):
+    pass
+
+
+# El servidor respondió 304: la página no cambió desde la última descarga
+class NotModifiedError(Exception):
+    pass
+
+
+# Función para buscar una tabla por ID en un HTML que llega por bloques.
+# FBREF deja varias tablas dentro de comentarios HTML (<!-- <table ...> -->),
+# así que también se revisan los comentarios. Devuelve el HTML de la tabla o None.
+def find_table_html(chunks, table_id):
+    if isinstance(chunks, (str, bytes)):
+        chunks = [chunks]
+    marker = f'id="{table_id}"'
+    parser = etree.HTMLPullParser(events=('start', 'end', 'comment'))
+    target = None
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == 'comment':
+                if marker in (element.text or ''):
+                    table = find_table_html(element.text, table_id)
+                    if table is not None:
+                        return table
+            elif event == 'start':
+                if target is None and element.get('id') == table_id:
+                    target = element
+            elif element is target:
+                return etree.tostring(element, encoding='unicode', method='html', with_tail=False)
+            elif target is None:
+                # Liberamos los nodos ya procesados para que la memoria no crezca con la página
+                element.clear()
+
+    parser.close()
+    return None
+
+
+# Descarga con HTTP: una sesión con pool de conexiones keep-alive compartida por los workers
+class HttpFetcher:
+    def __init__(self, timeout=30, pool_size=10, chunk_size=64 * 1024):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def __call__(self, url, table_id):
+        return self.fetch_page(url, table_id).html
+
+    # Petición condicional: con etag/last_modified el servidor puede responder 304
+    def fetch_page(self, url, table_id, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304:
+                raise NotModifiedError(url)
+            response.raise_for_status()
+            table = find_table_html(response.iter_content(self.chunk_size), table_id)
+            validators = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if table is None:
+            raise TableNotFoundError(f'No se encontró la tabla con el ID {table_id}')
+        return Page(table, *validators)
+
+    def close(self):
+        self.session.close()
+
+
+# Descarga con Selenium: cada worker usa su propio WebDriver (se crean bajo demanda)
+class SeleniumFetcher:
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _driver(self):
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            from selenium import webdriver
+
+            # Iniciamos el WebDriver
+            options = webdriver.ChromeOptions()
+            options.add_argument('--headless')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
+            driver = webdriver.Chrome(options=options)
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+
+    def __call__(self, url, table_id):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        driver = self._driver()
+        driver.get(url)
+        WebDriverWait(driver, self.timeout).until(EC.presence_of_element_located((By.ID, table_id)))
+        return driver.page_source
+
+    # El navegador no expone los encabezados HTTP, así que no hay petición condicional
+    def fetch_page(self, url, table_id, etag=None, last_modified=None):
+        return Page(self(url, table_id), None, None)
+
+    def close(self):
+        for driver in self._drivers:
+            driver.quit()
+        self._drivers.clear()
+
+
+# Usa el backend principal y recurre al de respaldo si la tabla no aparece en el HTML estático
+class FallbackFetcher:
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+
+    def __call__(self, url, table_id):
+        return self.fetch_page(url, table_id).html
+
+    def fetch_page(self, url, table_id, etag=None, last_modified=None):
+        try:
+            return self.primary.fetch_page(url, table_id, etag, last_modified)
+        except TableNotFoundError:
+            print(f'{table_id} no está en el HTML estático, usando Selenium')
+            return self.fallback.fetch_page(url, table_id)
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
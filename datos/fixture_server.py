@@ -0,0 +1,70 @@
+import argparse
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+# Servidor HTTP local que sirve páginas de FBREF guardadas en disco.
+# Permite probar el scraper sin conexión: cada URL se mapea a un archivo
+# <directorio>/<ruta de la URL>.html, por ejemplo
+#   https://fbref.com/en/comps/9/2023-2024/stats/Premier-League-Stats
+#   -> fixtures/en/comps/9/2023-2024/stats/Premier-League-Stats.html
+
+
+# Función para obtener la ruta del archivo que corresponde a una URL
+def fixture_path(root, url):
+    path = unquote(urlsplit(url).path).strip('/')
+    return os.path.join(root, *path.split('/')) + '.html'
+
+
+# Función para guardar el HTML de una página como fixture
+def save_fixture(root, url, html):
+    path = fixture_path(root, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, root, **kwargs):
+        self.root = root
+        super().__init__(*args, directory=root, **kwargs)
+
+    def translate_path(self, path):
+        return fixture_path(self.root, path)
+
+    def guess_type(self, path):
+        return 'text/html; charset=utf-8'
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Función para crear el servidor; con port=0 se elige un puerto libre
+def make_server(root, host='127.0.0.1', port=0):
+    handler = partial(FixtureHandler, root=os.path.abspath(root))
+    return ThreadingHTTPServer((host, port), handler)
+
+
+# Función para levantar el servidor en un hilo y obtener su URL base
+def serve_fixtures(root, host='127.0.0.1', port=0):
+    server = make_server(root, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sirve páginas de FBREF guardadas en disco.')
+    parser.add_argument('root', help='Directorio con los fixtures HTML')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    server = make_server(args.root, args.host, args.port)
+    print(f'Sirviendo {args.root} en http://{args.host}:{server.server_address[1]} (Ctrl+C para terminar)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from datos.fetch import NotModifiedError, find_table_html
+from datos.scraper import Unchanged
+
+# Manifiesto de descargas para el modo incremental. Por cada tabla guardamos la URL,
+# los validadores HTTP (ETag/Last-Modified), el hash del HTML de la tabla, el número
+# de filas y la fecha de descarga. Con eso:
+#   - las temporadas terminadas no se vuelven a descargar si ya están en la base,
+#   - la temporada en curso se descarga como máximo una vez cada max_age,
+#   - si el servidor responde 304 o el hash no cambió, la tabla no se reescribe.
+
+MANIFEST_TABLE = '_manifest'
+
+Entry = namedtuple('Entry', ['table_name', 'url', 'etag', 'last_modified',
+                             'content_hash', 'row_count', 'fetched_at'])
+
+
+# Función para crear la tabla del manifiesto si no existe
+def ensure_manifest(conn):
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{MANIFEST_TABLE}" (
+            table_name TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            fetched_at TEXT NOT NULL
+        )''')
+    conn.commit()
+
+
+# Función para leer el manifiesto completo (solo entradas cuya tabla sigue existiendo)
+def load_manifest(conn):
+    ensure_manifest(conn)
+    rows = conn.execute(f'''
+        SELECT m.* FROM "{MANIFEST_TABLE}" m
+        JOIN sqlite_master t ON t.type = 'table' AND t.name = m.table_name''').fetchall()
+    return {row[0]: Entry(*row) for row in rows}
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class Manifest:
+    def __init__(self, conn, live_seasons, max_age=timedelta(days=1)):
+        self.entries = load_manifest(conn)
+        self.live_seasons = set(live_seasons)
+        self.max_age = max_age
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    # Decide qué tareas hay que descargar; devuelve (pendientes, omitidas)
+    def plan(self, jobs, now=None):
+        now = now or _now()
+        pending, skipped = [], []
+        for job in jobs:
+            entry = self.entries.get(job.table_name)
+            if entry is None:
+                pending.append(job)
+            elif job.table_name.split('_', 1)[0] not in self.live_seasons:
+                skipped.append(job)
+            elif now - datetime.fromisoformat(entry.fetched_at) < self.max_age:
+                skipped.append(job)
+            else:
+                pending.append(job)
+        return pending, skipped
+
+    # Envuelve un backend para hacer peticiones condicionales y detectar tablas sin cambios.
+    # Las entradas se buscan por el nombre de la tabla de cada tarea y no por la URL, así que
+    # cambiar --base-url no descarta los validadores ni el hash.
+    def fetcher(self, backend, jobs, force=False):
+        tables = {(job.url, job.table_id): job.table_name for job in jobs}
+
+        def fetch(url, table_id):
+            table_name = tables[url, table_id]
+            job_entry = self.entries.get(table_name)
+            validators = (job_entry.etag, job_entry.last_modified) if job_entry and not force else (None, None)
+            try:
+                page = backend.fetch_page(url, table_id, *validators)
+            except NotModifiedError:
+                raise Unchanged(url)
+            table = find_table_html(page.html, table_id)
+            if table is None:
+                return page.html
+            digest = content_hash(table)
+            if job_entry and not force and job_entry.content_hash == digest:
+                raise Unchanged(url)
+            with self._lock:
+                self._pending[table_name] = (url, page.etag, page.last_modified, digest)
+            return table
+        return fetch
+
+    # Envuelve el escritor para registrar cada tabla guardada en la misma transacción
+    def sink(self, writer):
+        return ManifestSink(self, writer)
+
+    def _pop_pending(self, table_name):
+        with self._lock:
+            return self._pending.pop(table_name)
+
+
+class ManifestSink:
+    def __init__(self, manifest, writer):
+        self.manifest = manifest
+        self.writer = writer
+
+    def open(self):
+        self.writer.open()
+        return self
+
+    def write(self, table_name, df):
+        self.writer.write(table_name, df)
+        url, etag, last_modified, digest = self.manifest._pop_pending(table_name)
+        self.writer.execute(f'INSERT OR REPLACE INTO "{MANIFEST_TABLE}" VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (table_name, url, etag, last_modified, digest, len(df), _now().isoformat()))
+
+    # Para tablas sin cambios solo se actualiza la fecha de la última comprobación
+    def unchanged(self, job):
+        self.writer.execute(f'UPDATE "{MANIFEST_TABLE}" SET fetched_at = ? WHERE table_name = ?',
+                            (_now().isoformat(), job.table_name))
+
+    def commit(self):
+        self.writer.commit()
+
+    def close(self):
+        self.writer.close()
@@ -0,0 +1,121 @@
+import argparse
+import sqlite3
+
+import pandas as pd
+
+from datos.config import LIVE_SEASONS, SETTINGS
+from datos.player_season import PLAYER_SEASON, list_metrics, query_player_season
+from datos.query_builder import get_metrics
+from datos.schema import compact_frame
+from datos.writer import quote, write_table
+
+# Percentiles de toda la liga por temporada y posición primaria. Se calculan una vez al
+# terminar la descarga con un solo groupby().rank(pct=True) por temporada y se guardan en
+# la tabla percentiles; las páginas solo leen las filas del equipo con el índice. Solo se
+# comparan jugadores con la misma posición primaria que jugaron al menos un 25% de los
+# minutos de la temporada, igual que hacía calculate_percentiles en app.py.
+
+PERCENTILES = 'percentiles'
+
+# Columnas de identificación que se guardan junto a los percentiles
+ROW_COLUMNS = ['player_id', 'Player', 'Squad', 'Pos', 'standard_MP', 'standard_Min']
+
+MIN_MINUTES_PCT = 0.25
+
+
+def percentile_column(metric):
+    return f'Percentil_{metric}'
+
+
+# Función para procesar la columna de posición y obtener solo la posición primaria
+def primary_position(pos_column):
+    return pos_column.astype('string').str.split(',').str[0].str.strip()
+
+
+# Función para calcular los minutos máximos jugados en una temporada
+def max_minutes(season, matches_played):
+    # Temporada en curso: basada en los partidos jugados hasta ahora
+    if season in LIVE_SEASONS:
+        return matches_played * 90
+    # Temporadas terminadas (38 partidos)
+    return 38 * 90
+
+
+# Función para calcular los percentiles de una temporada completa (todas las filas de la liga)
+def compute_percentiles(df, season, metrics, min_minutes_pct=MIN_MINUTES_PCT):
+    df = df.assign(Pos=primary_position(df['Pos']))
+    minutes = pd.to_numeric(df['standard_Min'], errors='coerce')
+    matches_played = pd.to_numeric(df['standard_MP'], errors='coerce').max()
+    df = df[minutes >= min_minutes_pct * max_minutes(season, matches_played)]
+
+    ranks = df.groupby('Pos')[list(metrics)].rank(pct=True) * 100
+    ranks.columns = [percentile_column(m) for m in metrics]
+    ids = df[[c for c in ROW_COLUMNS if c in df.columns]]
+    return pd.concat([ids, ranks.astype('float32')], axis=1).reset_index(drop=True)
+
+
+# Función para obtener los minutos mínimos que pide compute_percentiles en una temporada
+def minutes_cut(conn, season, min_minutes_pct=MIN_MINUTES_PCT):
+    matches_played = pd.to_numeric(get_metrics(conn, season, ['standard_MP'])['standard_MP'], errors='coerce').max()
+    return min_minutes_pct * max_minutes(season, matches_played)
+
+
+def has_table(conn, table_name):
+    query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+    return conn.execute(query, (table_name,)).fetchone() is not None
+
+
+# Función para construir (o reconstruir) la tabla percentiles a partir de player_season
+def build_percentiles(conn, min_minutes_pct=MIN_MINUTES_PCT):
+    metrics = [m for m in list_metrics(conn) if m not in ROW_COLUMNS]
+    seasons = [row[0] for row in conn.execute(f'SELECT DISTINCT "Season" FROM {PLAYER_SEASON} ORDER BY 1')]
+
+    frames = []
+    for season in seasons:
+        df = query_player_season(conn, season, metrics, columns=ROW_COLUMNS)
+        frames.append(compute_percentiles(df, season, metrics, min_minutes_pct).assign(Season=season))
+    percentiles = pd.concat(frames, ignore_index=True)
+    percentiles = percentiles[['Season'] + [c for c in percentiles.columns if c != 'Season']]
+
+    with conn:
+        write_table(conn, PERCENTILES, percentiles)
+        conn.execute(f'CREATE INDEX idx_{PERCENTILES}_squad ON {PERCENTILES} ("Season", "Squad")')
+        conn.execute(f'CREATE INDEX idx_{PERCENTILES}_player ON {PERCENTILES} ("Season", "player_id")')
+    conn.execute(f'ANALYZE {PERCENTILES}')
+    return seasons
+
+
+# Función para obtener los percentiles de un equipo (o de toda la liga) en una temporada.
+# Si la tabla percentiles existe es una sola lectura por índice; si no (base antigua), se
+# calculan al vuelo sobre toda la liga y después se filtra el equipo.
+def get_percentiles(conn, season, metrics, team=None):
+    metrics = list(dict.fromkeys(metrics))
+    if has_table(conn, PERCENTILES):
+        columns = ['player_id', 'Player', 'Squad', 'Pos'] + [percentile_column(m) for m in metrics]
+        where, params = ['"Season" = ?'], [season]
+        if team is not None:
+            where.append('"Squad" = ?')
+            params.append(team)
+        query = (f'SELECT {", ".join(map(quote, columns))} FROM {PERCENTILES} '
+                 f'WHERE {" AND ".join(where)}')
+        return compact_frame(pd.read_sql_query(query, conn, params=params))
+
+    df = get_metrics(conn, season, ['player_id', 'Player', 'Squad', 'Pos', 'standard_MP', 'standard_Min'] + metrics)
+    df = compute_percentiles(df, season, metrics)
+    if team is not None:
+        df = df[df['Squad'] == team].reset_index(drop=True)
+    return df.drop(columns=['standard_MP', 'standard_Min'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Construye la tabla de percentiles por temporada y posición.')
+    parser.add_argument('--db', default=SETTINGS.path, help='Ruta de la base de datos SQLite (por defecto, la de futbol.ini o FUTBOL_DB)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        seasons = build_percentiles(conn)
+        rows = conn.execute(f'SELECT COUNT(*) FROM {PERCENTILES}').fetchone()[0]
+        print(f'{PERCENTILES}: {rows} filas, temporadas {seasons}')
+    finally:
+        conn.close()
@@ -0,0 +1,134 @@
+import os
+
+import streamlit as st
+
+from datos.cache import DataCache
+from datos.charts import PIZZA_LABELS, PizzaRenderer
+from datos.config import SEASONS, SETTINGS
+
+# Página de análisis de jugadores, compartida por app.py y contenido/analisis_de_jugadores.py.
+# Importarla es barato: pandas se carga con la primera consulta y matplotlib solo cuando
+# hay que dibujar un gráfico que no está en la caché.
+
+# Descripción de la funcionalidad
+DESCRIPTION = """
+    Explora detalladamente las estadísticas de los jugadores de fútbol a lo largo de las temporadas seleccionadas. Con esta herramienta podrás:
+
+**Seleccionar una Temporada y Equipo:** Navega a través de varias temporadas para obtener un contexto detallado y actual de cada equipo.
+
+**Visualizar el Desempeño de Jugadores en Formato de Pizza Chart:** El gráfico de pizza, segmentado en categorías de ataque, posesión y defensa, te permitirá comparar el rendimiento del jugador seleccionado en diferentes aspectos del juego. Los valores de las métricas están convertidos a percentiles de la liga, proporcionando una referencia visual clara sobre cómo se posiciona el jugador en comparación con sus colegas.
+
+**Ver Estadísticas en Detalle:** Los datos de cada jugador se muestran en una tabla para una referencia numérica exacta. Aquí puedes explorar sus goles, asistencias, intercepciones, pases, entre otras estadísticas clave.
+"""
+
+# Explicación de los colores del gráfico
+LEGEND = """
+**¿Qué representan los colores en el gráfico de pizza?**
+
+**Rojo:** Métricas relacionadas al ataque (e.g., tiros, tiros a puerta).
+         
+**Verde:** Métricas de posesión y control (e.g., pases clave, pases progresivos).
+         
+**Azul:** Métricas defensivas (e.g., intercepciones, duelos aéreos ganados).
+         
+>Las métricas se basan en los datos oficiales de cada temporada y equipo, permitiendo un análisis actualizado y profundo. Navega entre temporadas y jugadores para descubrir y comparar cómo destaca cada uno en sus habilidades y contribuciones al equipo.
+         """
+
+
+# Función para conectar a la base de datos: una sola caché y un grupo de conexiones de
+# solo lectura por proceso, compartidos entre todas las sesiones
+@st.cache_resource
+def connect_db(settings):
+    return DataCache(settings)
+
+# Función para obtener el renderizador de gráficos de pizza (con su caché de imágenes)
+@st.cache_resource
+def get_renderer(settings):
+    return PizzaRenderer(connect_db(settings))
+
+# Función para listar equipos por temporada
+def list_teams_by_season(data, season):
+    return data.teams(season)
+
+# Función para crear el Pizza Chart de un jugador
+def get_players_stats(data, season, team):
+    columns = ['player_id', 'Player', 'Pos', 'standard_MP', 'standard_Min', 
+               'standard_Gls', 'standard_Ast', 'shooting_Sh', 'shooting_SoT', 
+               'passing_Cmp%', 'defense_TklW', 'defense_Int', 
+               'misc_Fls', 'misc_Fld', 'misc_CrdY', 'misc_CrdR']
+    
+    # Una sola consulta que une las tablas necesarias y trae solo estas columnas (con caché)
+    return data.metrics(season, columns, team)
+
+
+# Función para mostrar la página completa. La base de datos sale de la configuración
+# (futbol.ini o FUTBOL_DB); db_path permite indicar otra.
+def render(db_path=None):
+    settings = SETTINGS if db_path is None else SETTINGS._replace(path=db_path)
+
+    # Configuración de Streamlit
+    st.title("Análisis Avanzado de Desempeño de Jugadores")
+
+    # Descripción de la funcionalidad
+    st.write(DESCRIPTION)
+
+    # Conectar a la base de datos
+    data = connect_db(settings)
+    renderer = get_renderer(settings)
+
+    # Crear columnas para la alineación
+    col1, col2 = st.columns([2, 1])
+
+    # Selectbox para la temporada (en col1)
+    with col1:
+        season_selected = st.selectbox("Selecciona la temporada", SEASONS)
+
+        # Obtener equipos de la temporada seleccionada
+        teams = sorted(list_teams_by_season(data, season_selected))
+        team_selected = st.selectbox("Selecciona el equipo", teams)
+
+    # Mostrar imagen en col2
+    with col2:
+        image_path = f'./imagenes/{team_selected}.png'
+        if os.path.exists(image_path):
+            st.image(image_path, caption=team_selected, use_column_width=True)
+        else:
+            st.write(f"No se encontró la imagen del equipo {team_selected}")
+
+    # Mostrar las estadísticas de jugadores
+    st.write(f"Estadísticas de jugadores del equipo **{team_selected}** en la temporada {season_selected}")
+    players_df = get_players_stats(data, season_selected, team_selected)
+    st.dataframe(players_df.drop(columns='player_id'))
+
+    # Seleccionar un jugador por su player_id; si dos jugadores del equipo tienen el mismo
+    # nombre, la etiqueta agrega la posición y el id para distinguirlos
+    players = players_df.drop_duplicates('player_id').set_index('player_id')
+    repeated = players['Player'].duplicated(keep=False)
+    labels = {player_id: f"{row.Player} ({row.Pos}, id {player_id})" if repeated[player_id] else row.Player
+              for player_id, row in players.iterrows()}
+    player_id = st.selectbox('Selecciona un jugador para comparar su desempeño', list(labels),
+                             format_func=labels.__getitem__)
+    player_selected = players.loc[player_id, 'Player']
+
+    # Diccionario de renombre de columnas
+    rename_dict = PIZZA_LABELS
+
+    # Mostrar gráfico con los datos del jugador seleccionado
+    st.write(f"Gráfico de pizza de desempeño para **{player_selected}**")
+    # Los percentiles de la liga se leen de la tabla precalculada y la imagen sale de la caché
+    pos = players.loc[player_id, 'Pos']
+    chart = renderer.chart(season_selected, team_selected, player_id, player_selected, pos, rename_dict)
+
+    # Mostrar el gráfico en Streamlit
+    st.image(chart)
+
+    st.write(LEGEND)
+
+    # Panel de depuración de la caché de datos
+    if st.sidebar.checkbox('Mostrar estadísticas de la caché'):
+        st.sidebar.write(data.stats())
+        st.sidebar.write(renderer.stats())
+        st.sidebar.write(data.pool_stats())
+        # Renderizar en segundo plano los gráficos de todos los jugadores de la temporada
+        if st.sidebar.button('Pre-renderizar la temporada'):
+            renderer.prerender(season_selected, rename_dict=rename_dict)
@@ -0,0 +1,149 @@
+import argparse
+import re
+import sqlite3
+
+import pandas as pd
+
+from datos.config import SETTINGS
+from datos.players import backfill_player_ids
+from datos.schema import ID_COLUMNS, STAT_TABLES, compact_frame
+from datos.writer import quote
+
+# Tabla consolidada player_season: una fila por (temporada, equipo, jugador) con todas las
+# métricas de las 11 tablas de FBREF como columnas (standard_Gls, passing_Cmp, ...).
+# Se construye una vez a partir de las tablas {temporada}_{tabla} y permite consultar
+# cualquier subconjunto de métricas de un equipo o de toda la liga con un solo recorrido
+# del índice, sin interpolar nombres de tablas ni combinar DataFrames en pandas.
+
+PLAYER_SEASON = 'player_season'
+
+# La tabla de estadísticas estándar incluye a todos los jugadores; las demás se unen a ella
+BASE_TABLE = 'stats_standard'
+
+# Columnas que identifican a un jugador dentro de una temporada: el player_id estable y el
+# equipo (un jugador transferido tiene una fila por equipo)
+KEY_COLUMNS = ['player_id', 'Squad']
+
+SEASON_TABLE = re.compile(r'^(\d{4}-\d{4})_(stats_\w+)$')
+
+
+# Función para listar las tablas por temporada: {temporada: [tabla, ...]}
+def season_tables(conn):
+    tables = {}
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+        match = SEASON_TABLE.match(name)
+        if match and match.group(2) in STAT_TABLES:
+            tables.setdefault(match.group(1), []).append(match.group(2))
+    return tables
+
+
+# Función para obtener las columnas de una tabla y su tipo declarado
+def table_columns(conn, table_name):
+    return [(row[1], row[2]) for row in conn.execute(f'PRAGMA table_info({quote(table_name)})')]
+
+
+# Función para construir (o reconstruir) player_season a partir de las tablas por temporada
+def build_player_season(conn, seasons=None):
+    tables = season_tables(conn)
+    seasons = [s for s in (seasons or sorted(tables)) if BASE_TABLE in tables.get(s, [])]
+
+    # Las bases descargadas antes de player_id reciben la columna (y su índice) aquí mismo
+    with conn:
+        backfill_player_ids(conn, [f'{season}_{table}' for season in seasons for table in tables[season]])
+
+    # Unión de las métricas de todas las temporadas, en el orden de STAT_TABLES
+    metrics = {}
+    for table in STAT_TABLES:
+        for season in seasons:
+            if table in tables[season]:
+                for column, sql_type in table_columns(conn, f'{season}_{table}'):
+                    if column not in ID_COLUMNS:
+                        metrics.setdefault(column, (table, sql_type or 'REAL'))
+
+    id_columns = [c for c in ID_COLUMNS if c != 'Rk']
+    definitions = ['"Season" TEXT NOT NULL']
+    definitions += [f'{quote(c)} {"INTEGER" if ID_COLUMNS[c].startswith("Int") else "TEXT"}'
+                    + (' NOT NULL' if c in ('player_id', 'Player', 'Squad') else '') for c in id_columns]
+    definitions += [f'{quote(c)} {sql_type}' for c, (_, sql_type) in metrics.items()]
+
+    with conn:
+        conn.execute(f'DROP TABLE IF EXISTS {PLAYER_SEASON}')
+        conn.execute(f'CREATE TABLE {PLAYER_SEASON} ({", ".join(definitions)})')
+        # Una sola fila por (temporada, equipo, jugador): si una tabla de FBREF trae una fila
+        # repetida, INSERT OR IGNORE descarta la combinación extra en vez de multiplicar filas
+        conn.execute(f'CREATE UNIQUE INDEX idx_{PLAYER_SEASON}_key '
+                     f'ON {PLAYER_SEASON} ("Season", "player_id", "Squad")')
+
+        for season in seasons:
+            aliases = {table: f't{i}' for i, table in enumerate(tables[season])}
+            available = {table: {c for c, _ in table_columns(conn, f'{season}_{table}')}
+                         for table in tables[season]}
+            select = ['?'] + [f'{aliases[BASE_TABLE]}.{quote(c)}' for c in id_columns]
+            for column, (table, _) in metrics.items():
+                if table in aliases and column in available[table]:
+                    select.append(f'{aliases[table]}.{quote(column)}')
+                else:
+                    select.append('NULL')
+
+            base = aliases[BASE_TABLE]
+            joins = []
+            for table, alias in aliases.items():
+                if table == BASE_TABLE:
+                    continue
+                on = ' AND '.join(f'{alias}.{quote(k)} = {base}.{quote(k)}' for k in KEY_COLUMNS)
+                joins.append(f'LEFT JOIN {quote(f"{season}_{table}")} {alias} ON {on}')
+
+            conn.execute(f'INSERT OR IGNORE INTO {PLAYER_SEASON} SELECT {", ".join(select)} '
+                         f'FROM {quote(f"{season}_{BASE_TABLE}")} {base} {" ".join(joins)}', (season,))
+
+        conn.execute(f'CREATE INDEX idx_{PLAYER_SEASON}_squad ON {PLAYER_SEASON} ("Season", "Squad")')
+        conn.execute(f'CREATE INDEX idx_{PLAYER_SEASON}_pos ON {PLAYER_SEASON} ("Season", "Pos")')
+    conn.execute(f'ANALYZE {PLAYER_SEASON}')
+    return seasons
+
+
+# Función para listar las métricas disponibles en player_season
+def list_metrics(conn):
+    return [c for c, _ in table_columns(conn, PLAYER_SEASON) if c not in ID_COLUMNS and c != 'Season']
+
+
+# Límite superior para buscar por posición primaria con el índice: 'DF' cubre 'DF' y 'DF,MF'
+def _prefix_upper_bound(prefix):
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+# Consulta de métricas para una temporada: todo un equipo (team) o toda la liga, con filtro
+# opcional por posición primaria (pos). Devuelve Player, Squad, Pos y las métricas pedidas.
+def query_player_season(conn, season, metrics, team=None, pos=None, columns=('Player', 'Squad', 'Pos')):
+    known = set(list_metrics(conn)) | set(ID_COLUMNS)
+    unknown = [m for m in metrics if m not in known]
+    if unknown:
+        raise KeyError(f'Métricas desconocidas en {PLAYER_SEASON}: {unknown}')
+
+    selected = list(dict.fromkeys(list(columns) + list(metrics)))
+    where, params = ['"Season" = ?'], [season]
+    if team is not None:
+        where.append('"Squad" = ?')
+        params.append(team)
+    if pos is not None:
+        where.append('"Pos" >= ? AND "Pos" < ?')
+        params += [pos, _prefix_upper_bound(pos)]
+
+    query = (f'SELECT {", ".join(map(quote, selected))} FROM {PLAYER_SEASON} '
+             f'WHERE {" AND ".join(where)}')
+    return compact_frame(pd.read_sql_query(query, conn, params=params))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Construye la tabla consolidada player_season.')
+    parser.add_argument('--db', default=SETTINGS.path, help='Ruta de la base de datos SQLite (por defecto, la de futbol.ini o FUTBOL_DB)')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a incluir (por defecto, todas)')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        seasons = build_player_season(conn, args.seasons)
+        rows = conn.execute(f'SELECT COUNT(*) FROM {PLAYER_SEASON}').fetchone()[0]
+        print(f'{PLAYER_SEASON}: {rows} filas, {len(list_metrics(conn))} métricas, temporadas {seasons}')
+    finally:
+        conn.close()
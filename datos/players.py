@@ -0,0 +1,100 @@
+import pandas as pd
+
+from datos.writer import SQLiteWriter, quote
+
+# Identidad estable de los jugadores. Cada combinación (nombre, año de nacimiento,
+# nacionalidad) recibe un player_id entero la primera vez que aparece y lo conserva
+# para siempre. El player_id se guarda en todas las tablas de estadísticas (con índice)
+# y las uniones entre tablas se hacen por (player_id, Squad) en lugar de por el nombre:
+# dos jugadores con el mismo nombre ya no se mezclan y un jugador transferido a mitad
+# de temporada tiene una fila por equipo, así que el número de filas se mantiene lineal.
+
+PLAYERS_TABLE = 'players'
+
+# Valores que se guardan en la clave cuando FBREF no trae el dato (UNIQUE no compara NULL)
+UNKNOWN_BORN = 0
+UNKNOWN_NATION = ''
+
+
+def ensure_players(conn):
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {PLAYERS_TABLE} (
+            player_id INTEGER PRIMARY KEY,
+            Player TEXT NOT NULL,
+            Born INTEGER NOT NULL,
+            Nation TEXT NOT NULL,
+            UNIQUE (Player, Born, Nation)
+        )''')
+
+
+# Función para obtener la clave de identidad de cada fila de una tabla de FBREF
+def identity_keys(df):
+    born = df['Born'] if 'Born' in df.columns else pd.Series(pd.NA, index=df.index)
+    nation = df['Nation'] if 'Nation' in df.columns else pd.Series(pd.NA, index=df.index)
+    return pd.DataFrame({
+        'Player': df['Player'].astype(object),
+        'Born': pd.to_numeric(born, errors='coerce').fillna(UNKNOWN_BORN).astype('int64'),
+        'Nation': nation.astype(object).where(nation.notna(), UNKNOWN_NATION),
+    }, index=df.index)
+
+
+# Tabla temporal con las identidades del lote que se está guardando
+KEYS_TABLE = '_player_keys'
+
+
+# Función para asignar player_id a cada fila: registra las identidades nuevas y devuelve
+# una Serie Int32 alineada con df. Solo se leen de players las identidades del lote (unión
+# con una tabla temporal por el índice UNIQUE), no la tabla completa. Las filas sin nombre
+# de jugador quedan con player_id vacío.
+def assign_player_ids(conn, df):
+    ensure_players(conn)
+    keys = identity_keys(df)
+    unique = list(keys[keys['Player'].notna()].drop_duplicates().itertuples(index=False, name=None))
+    conn.executemany(f'INSERT OR IGNORE INTO {PLAYERS_TABLE} (Player, Born, Nation) VALUES (?, ?, ?)', unique)
+    conn.execute(f'CREATE TEMP TABLE IF NOT EXISTS {KEYS_TABLE} (Player TEXT, Born INTEGER, Nation TEXT)')
+    conn.execute(f'DELETE FROM {KEYS_TABLE}')
+    conn.executemany(f'INSERT INTO {KEYS_TABLE} VALUES (?, ?, ?)', unique)
+    ids = pd.read_sql_query(f'SELECT p.player_id, p.Player, p.Born, p.Nation FROM {KEYS_TABLE} k '
+                            f'JOIN {PLAYERS_TABLE} p USING (Player, Born, Nation)', conn)
+    merged = keys.merge(ids, on=['Player', 'Born', 'Nation'], how='left')
+    return pd.Series(merged['player_id'].astype('Int32').array, index=df.index, name='player_id')
+
+
+# Función para agregar player_id como primera columna de una tabla de FBREF
+def with_player_ids(conn, df):
+    df = df.copy()
+    df.insert(0, 'player_id', assign_player_ids(conn, df))
+    return df
+
+
+def index_player_id(conn, table_name):
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {quote(f"idx_{table_name}_player_id")} '
+                 f'ON {quote(table_name)} ("player_id", "Squad")')
+
+
+# Escritor para las tablas de FBREF: agrega player_id e indexa (player_id, Squad)
+class StatTableWriter(SQLiteWriter):
+    def write(self, table_name, df):
+        self.begin()
+        super().write(table_name, with_player_ids(self.conn, df))
+        index_player_id(self.conn, table_name)
+
+
+# Función para agregar player_id a tablas que ya existen en una base descargada antes
+def backfill_player_ids(conn, tables):
+    ensure_players(conn)
+    for table_name in tables:
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info({quote(table_name)})')]
+        if 'player_id' in columns or 'Player' not in columns:
+            continue
+        key_columns = [c for c in ('Player', 'Born', 'Nation') if c in columns]
+        df = pd.read_sql_query(f'SELECT rowid, {", ".join(map(quote, key_columns))} '
+                               f'FROM {quote(table_name)}', conn)
+        df['player_id'] = assign_player_ids(conn, df)
+        conn.execute(f'ALTER TABLE {quote(table_name)} ADD COLUMN "player_id" INTEGER')
+        conn.executemany(f'UPDATE {quote(table_name)} SET "player_id" = ? WHERE rowid = ?',
+                         zip(df['player_id'].astype(object).where(df['player_id'].notna(), None).tolist(),
+                             df['rowid'].tolist()))
+        index_player_id(conn, table_name)
+        print(f'player_id agregado a {table_name}')
+
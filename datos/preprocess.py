@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import re
+import time
+
+# Preprocesamiento de los archivos {temporada}_data.parquet para el modelo, por lotes. Cada
+# archivo se lee de a BATCH_SIZE filas y cada lote se transforma y se escribe enseguida en
+# processed_{temporada}.parquet, así que la memoria depende del tamaño del lote y no del
+# número de filas ni de temporadas. Las transformaciones son las mismas que hacía
+# modelo.py, con operaciones vectorizadas:
+#   - se agrega la columna "Season"; "Player" queda solo con el nombre y "player_id" (el
+#     identificador de datos/players.py) se conserva si el archivo lo trae;
+#   - "Pos" se queda con la primera posición y se convierte en columnas GK/DF/MF/FW booleanas
+#     (en parquet se guardan como bits);
+#   - "Age" se convierte a número; en la temporada en curso FBREF la trae como "años-días"
+#     ("25-123") y se conservan los años (los valores no numéricos quedan vacíos);
+#   - las columnas del modelo que no existen en una temporada quedan vacías (las filas van
+#     a cuarentena como incompletas, igual que con cualquier estadística vacía);
+#   - se descarta "Squad".
+# Los tipos son los compactos de datos/schema.py: Season y Player con diccionario, los
+# conteos en int16/int32 y las tasas en float32.
+# Cada lote se valida antes de escribirlo: las filas sin ninguna estadística (la gran mayoría
+# de las filas exportadas) se descartan, y las duplicadas o con alguna estadística vacía se
+# guardan aparte en quarantine/{temporada}.parquet con el motivo. quality_report.json
+# resume por temporada las filas leídas, conservadas y descartadas por motivo.
+# Los archivos se escriben con estadísticas por columna y grupos de filas de ROW_GROUP_SIZE,
+# para que los lectores puedan saltarse grupos completos al filtrar.
+#   python -m datos.preprocess --source datos --out datos
+
+from datos.features import NUMERICAL_COLUMNS, POSITION_COLUMNS
+from datos.schema import metric_dtype
+
+BATCH_SIZE = 65536
+ROW_GROUP_SIZE = 131072
+
+OUTPUT_COLUMNS = ['Season', 'Player', 'player_id'] + NUMERICAL_COLUMNS + POSITION_COLUMNS
+
+QUARANTINE_DIR = 'quarantine'
+QUARANTINE_DUPLICATED = 'duplicada'
+QUARANTINE_INCOMPLETE = 'incompleta'
+REPORT_FILE = 'quality_report.json'
+REPORT_KEYS = ['leídas', 'conservadas', 'vacías', 'duplicadas', 'incompletas']
+
+DATA_FILE = re.compile(r'(\d{4}-\d{4})_data\.parquet$')
+
+
+# Función para encontrar los archivos exportados de cada temporada: {temporada: ruta}
+def data_files(source, seasons=None):
+    files = {}
+    for name in sorted(os.listdir(source), reverse=True):
+        match = DATA_FILE.match(name)
+        if match and (seasons is None or match.group(1) in seasons):
+            files[match.group(1)] = os.path.join(source, name)
+    return files
+
+
+# Tipo de cada columna del modelo en el parquet (mismo criterio que compact_frame)
+def column_type(column):
+    import pyarrow as pa
+
+    dtype = 'Int16' if column == 'Age' else metric_dtype(column)
+    return {'Int16': pa.int16(), 'Int32': pa.int32()}.get(dtype, pa.float32())
+
+
+def output_schema():
+    import pyarrow as pa
+
+    return pa.schema([('Season', pa.dictionary(pa.int8(), pa.string())),
+                      ('Player', pa.dictionary(pa.int32(), pa.string())),
+                      ('player_id', pa.int32())]
+                     + [(c, column_type(c)) for c in NUMERICAL_COLUMNS]
+                     + [(c, pa.bool_()) for c in POSITION_COLUMNS])
+
+
+# Función para transformar un lote (DataFrame) a las columnas del modelo
+def transform_batch(df, season):
+    import pandas as pd
+
+    out = pd.DataFrame(index=df.index)
+    out['Season'] = pd.Categorical([season] * len(df))
+    out['Player'] = df['Player'].astype('category')
+    # Los archivos exportados antes de player_season no traen el identificador
+    if 'player_id' in df:
+        out['player_id'] = pd.to_numeric(df['player_id'], errors='coerce').astype('Int32')
+    else:
+        out['player_id'] = pd.array([pd.NA] * len(df), dtype='Int32')
+    # Las columnas que faltan en la temporada (preprocess_season solo lee las que existen) quedan vacías
+    df = df.reindex(columns=['Pos'] + NUMERICAL_COLUMNS)
+    for column in NUMERICAL_COLUMNS:
+        values = df[column]
+        if column == 'Age':
+            # "25-123" (años-días) -> "25"
+            values = values.astype('string').str.split('-', n=1).str[0]
+        out[column] = pd.to_numeric(values, errors='coerce').astype('float64')
+    # Primera posición ("FW,MF" -> "FW"); las posiciones vacías quedan en False
+    position = df['Pos'].astype('string').str.split(',', n=1).str[0].str.strip()
+    for column in POSITION_COLUMNS:
+        out[column] = position.eq(column).fillna(False).astype(bool)
+    return out
+
+
+# Función para validar un lote ya transformado. Devuelve (filas válidas, filas en cuarentena
+# con su motivo, número de filas vacías). seen guarda el hash de las filas ya escritas de la
+# temporada para detectar duplicados entre lotes.
+def validate_batch(df, seen):
+    import pandas as pd
+
+    missing = df[NUMERICAL_COLUMNS].isna()
+    empty = missing.all(axis=1)
+    df = df[~empty]
+    missing = missing[~empty]
+
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    duplicated = pd.Series(hashes, index=df.index).duplicated().to_numpy() | pd.Index(hashes).isin(seen)
+    incomplete = missing.any(axis=1).to_numpy() & ~duplicated
+    valid = ~(duplicated | incomplete)
+    seen.update(hashes[valid].tolist())
+
+    reasons = pd.Series(QUARANTINE_DUPLICATED, index=df.index).where(duplicated, QUARANTINE_INCOMPLETE)
+    quarantined = df[~valid].assign(Motivo=reasons[~valid])
+    return df[valid], quarantined, int(empty.sum())
+
+
+# Escritura de un parquet en grupos de filas completos; el archivo se crea con la primera escritura
+class RowGroupWriter:
+    def __init__(self, path, schema, row_group_size=ROW_GROUP_SIZE):
+        self.path = path
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.writer = None
+        self.pending = []
+        self.pending_rows = 0
+        self.rows = 0
+
+    def write(self, df):
+        import pyarrow as pa
+
+        if df.empty:
+            return
+        self.pending.append(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+        self.pending_rows += len(df)
+        # Se acumulan lotes hasta completar un grupo de filas
+        if self.pending_rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self.pending:
+            return
+        if self.writer is None:
+            # Se escribe en un archivo temporal para no dejar a medias un archivo que otros estén leyendo
+            self.writer = pq.ParquetWriter(self.path + '.tmp', self.schema, compression='zstd', write_statistics=True)
+        self.writer.write_table(pa.concat_tables(self.pending), row_group_size=self.row_group_size)
+        self.rows += self.pending_rows
+        self.pending, self.pending_rows = [], 0
+
+    # Devuelve True si se escribió el archivo
+    def close(self, always=False):
+        import pyarrow.parquet as pq
+
+        self.flush()
+        if self.writer is None and always:
+            self.writer = pq.ParquetWriter(self.path + '.tmp', self.schema, compression='zstd', write_statistics=True)
+        if self.writer is None:
+            return False
+        self.writer.close()
+        os.replace(self.path + '.tmp', self.path)
+        return True
+
+
+# Función para procesar una temporada por lotes; devuelve el reporte de calidad de la temporada
+def preprocess_season(path, out_path, season, batch_size=BATCH_SIZE, row_group_size=ROW_GROUP_SIZE,
+                      quarantine_path=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    columns = [c for c in ['Player', 'player_id', 'Pos'] + NUMERICAL_COLUMNS if c in parquet.schema_arrow.names]
+    schema = output_schema()
+    output = RowGroupWriter(out_path, schema, row_group_size)
+    quarantine = RowGroupWriter(quarantine_path, schema.append(pa.field('Motivo', pa.string())), row_group_size)
+    report = dict.fromkeys(REPORT_KEYS, 0)
+    seen = set()
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        valid, quarantined, empty = validate_batch(transform_batch(batch.to_pandas(), season), seen)
+        output.write(valid)
+        if quarantine_path:
+            quarantine.write(quarantined)
+        report['leídas'] += batch.num_rows
+        report['vacías'] += empty
+        report['duplicadas'] += int((quarantined['Motivo'] == QUARANTINE_DUPLICATED).sum())
+        report['incompletas'] += int((quarantined['Motivo'] == QUARANTINE_INCOMPLETE).sum())
+    output.close(always=True)
+    quarantine.close()
+    report['conservadas'] = output.rows
+    return report
+
+
+# Función para procesar todas las temporadas, una a la vez. Devuelve {temporada: reporte}
+# y guarda el reporte en quality_report.json junto a los archivos procesados.
+def preprocess(source, out_dir, seasons=None, batch_size=BATCH_SIZE, row_group_size=ROW_GROUP_SIZE, quarantine=True):
+    files = data_files(source, seasons)
+    if not files:
+        raise FileNotFoundError(f'No hay archivos {{temporada}}_data.parquet en {source}')
+    os.makedirs(out_dir, exist_ok=True)
+    if quarantine:
+        os.makedirs(os.path.join(out_dir, QUARANTINE_DIR), exist_ok=True)
+    reports = {}
+    for season, path in files.items():
+        out_path = os.path.join(out_dir, f'processed_{season}.parquet')
+        quarantine_path = os.path.join(out_dir, QUARANTINE_DIR, f'{season}.parquet') if quarantine else None
+        reports[season] = preprocess_season(path, out_path, season, batch_size, row_group_size, quarantine_path)
+    with open(os.path.join(out_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(reports, f, indent=2, ensure_ascii=False)
+    return reports
+
+
+# Función para mostrar el reporte de calidad como tabla
+def format_report(reports):
+    lines = [f'{"Temporada":<10}' + ''.join(f'{key:>13}' for key in REPORT_KEYS)]
+    for season, report in reports.items():
+        lines.append(f'{season:<10}' + ''.join(f'{report[key]:>13}' for key in REPORT_KEYS))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Preprocesa los archivos {temporada}_data.parquet para el modelo.')
+    parser.add_argument('--source', default='.', help='Carpeta con los archivos {temporada}_data.parquet')
+    parser.add_argument('--out', default='.', help='Carpeta de los archivos processed_{temporada}.parquet')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a procesar (por defecto, todas)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Filas por lote')
+    parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_SIZE, help='Filas por grupo en el parquet')
+    parser.add_argument('--no-quarantine', action='store_true',
+                        help='Descartar las filas duplicadas o incompletas en lugar de guardarlas aparte')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reports = preprocess(args.source, args.out, args.seasons, args.batch_size, args.row_group_size,
+                         quarantine=not args.no_quarantine)
+    print(format_report(reports))
+    print(f'Preprocesamiento completado en {time.perf_counter() - start:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
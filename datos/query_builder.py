@@ -0,0 +1,70 @@
+import pandas as pd
+
+from datos.player_season import BASE_TABLE, KEY_COLUMNS, PLAYER_SEASON, query_player_season
+from datos.schema import ID_COLUMNS, STAT_TABLES, compact_frame
+from datos.writer import quote
+
+# Constructor de consultas por métricas: recibe métricas calificadas con el prefijo de su
+# tabla (shooting_Sh, gca_SCA90, misc_Won, ...) y genera una sola consulta que une solo las
+# tablas necesarias y proyecta solo las columnas pedidas. Todos los valores (temporada,
+# equipo) van como parámetros; los nombres de tablas y columnas se escapan con quote().
+
+TABLES_BY_PREFIX = {prefix: table for table, prefix in STAT_TABLES.items()}
+
+
+# Función para obtener la tabla de FBREF a la que pertenece una métrica
+def metric_table(metric):
+    if metric in ID_COLUMNS:
+        return BASE_TABLE
+    prefix = metric.split('_', 1)[0]
+    if prefix not in TABLES_BY_PREFIX or '_' not in metric:
+        raise KeyError(f'La métrica {metric} no tiene el prefijo de una tabla conocida')
+    return TABLES_BY_PREFIX[prefix]
+
+
+# Función para generar la consulta (sql, params) de unas métricas en una temporada.
+# Las tablas se unen a stats_standard por (player_id, Squad) usando su índice, igual que
+# player_season.
+def build_metrics_query(season, metrics, team=None):
+    tables = [BASE_TABLE] + [t for t in dict.fromkeys(map(metric_table, metrics)) if t != BASE_TABLE]
+    aliases = {table: f't{i}' for i, table in enumerate(tables)}
+    base = aliases[BASE_TABLE]
+
+    select = [f'{aliases[metric_table(m)]}.{quote(m)}' for m in dict.fromkeys(metrics)]
+    joins = []
+    for table in tables[1:]:
+        alias = aliases[table]
+        on = ' AND '.join(f'{alias}.{quote(k)} = {base}.{quote(k)}' for k in KEY_COLUMNS)
+        joins.append(f'LEFT JOIN {quote(f"{season}_{table}")} {alias} ON {on}')
+
+    sql = f'SELECT {", ".join(select)} FROM {quote(f"{season}_{BASE_TABLE}")} {base} {" ".join(joins)}'
+    params = []
+    if team is not None:
+        sql += f' WHERE {base}."Squad" = ?'
+        params.append(team)
+    return sql, params
+
+
+def has_player_season(conn):
+    query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+    return conn.execute(query, (PLAYER_SEASON,)).fetchone() is not None
+
+
+# Función para obtener un DataFrame con las métricas pedidas de un equipo (o de toda la liga).
+# Si existe la tabla consolidada player_season se lee de ahí con un solo recorrido del índice;
+# si no, se une únicamente las tablas por temporada que contienen esas métricas.
+def get_metrics(conn, season, metrics, team=None):
+    metrics = list(dict.fromkeys(metrics))
+    if has_player_season(conn):
+        return query_player_season(conn, season, metrics, team=team, columns=())
+    sql, params = build_metrics_query(season, metrics, team)
+    return compact_frame(pd.read_sql_query(sql, conn, params=params))
+
+
+# Función para listar los equipos de una temporada
+def list_teams(conn, season):
+    if has_player_season(conn):
+        sql, params = f'SELECT DISTINCT "Squad" FROM {PLAYER_SEASON} WHERE "Season" = ?', [season]
+    else:
+        sql, params = f'SELECT DISTINCT "Squad" FROM {quote(f"{season}_{BASE_TABLE}")}', []
+    return [row[0] for row in conn.execute(sql, params)]
@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+# Esquema declarativo de las tablas de FBREF. Cada tabla se normaliza en un solo paso
+# justo después de read_html: nombres finales con prefijo (standard_Gls, passing_Cmp, ...),
+# tipos elegidos de antemano y una única conversión numérica para todo el bloque.
+# Con esto ya no hace falta el renombrado posterior con CREATE TABLE ... AS SELECT.
+
+# Columnas de identificación comunes a todas las tablas y su tipo.
+# player_id no viene de FBREF: se asigna al guardar la tabla (ver datos/players.py)
+ID_COLUMNS = {
+    'player_id': 'Int32',
+    'Rk': 'Int16',
+    'Player': 'string',
+    'Nation': 'category',
+    'Pos': 'category',
+    'Squad': 'category',
+    'Age': 'string',
+    'Born': 'Int16',
+}
+
+# Prefijo de cada tabla (el mismo que usaba get_prefixed_column_name: la última palabra del ID)
+STAT_TABLES = {
+    'stats_standard': 'standard',
+    'stats_keeper': 'keeper',
+    'stats_keeper_adv': 'adv',
+    'stats_shooting': 'shooting',
+    'stats_passing': 'passing',
+    'stats_passing_types': 'types',
+    'stats_gca': 'gca',
+    'stats_defense': 'defense',
+    'stats_possession': 'possession',
+    'stats_playing_time': 'time',
+    'stats_misc': 'misc',
+}
+
+# Métricas de conteo (enteros). Todo lo que no aparece aquí es una tasa o promedio (float32)
+COUNT_COLUMNS = {
+    'MP', 'Starts', 'Min', 'Gls', 'Ast', 'G+A', 'G-PK', 'PK', 'PKatt', 'CrdY', 'CrdR', '2CrdY',
+    'PrgC', 'PrgP', 'PrgR', 'Sh', 'SoT', 'FK', 'Cmp', 'Att', 'KP', '1/3', 'PPA', 'CrsPA',
+    'Live', 'Dead', 'TB', 'Sw', 'Crs', 'TI', 'CK', 'In', 'Out', 'Str', 'Off', 'Blocks',
+    'Tkl', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Lost', 'Pass', 'Int', 'Tkl+Int', 'Clr',
+    'Err', 'Touches', 'Def Pen', 'Att Pen', 'Succ', 'Tkld', 'Carries', 'CPA', 'Mis', 'Dis',
+    'Rec', 'Fls', 'Fld', 'PKwon', 'PKcon', 'OG', 'Recov', 'Won', 'SCA', 'GCA', 'PassLive',
+    'PassDead', 'TO', 'Def', 'GA', 'SoTA', 'Saves', 'W', 'D', 'L', 'CS', 'PKA', 'PKsv', 'PKm',
+    'Thr', 'Opp', 'Stp', '#OPA', 'Compl', 'Subs', 'unSub', 'onG', 'onGA', '+/-', 'Mn/Start',
+    'Mn/Sub',
+}
+
+# Conteos que pueden superar el rango de int16 (distancias en yardas)
+WIDE_COUNT_COLUMNS = {'TotDist', 'PrgDist'}
+
+# Grupos de encabezado cuyas columnas son tasas aunque la métrica se llame igual que un conteo
+RATE_GROUPS = {'Per 90 Minutes'}
+
+
+# Función para obtener el nombre final de una métrica con el prefijo de su tabla
+def prefixed_name(prefix, column):
+    if column in ID_COLUMNS:
+        return column
+    return f'{prefix}_{column}'
+
+
+# Función para elegir el tipo de una métrica a partir de su grupo y su nombre
+def column_dtype(group, column):
+    if column in ID_COLUMNS:
+        return ID_COLUMNS[column]
+    if group in RATE_GROUPS:
+        return 'float32'
+    if column in WIDE_COUNT_COLUMNS:
+        return 'Int32'
+    if column in COUNT_COLUMNS:
+        return 'Int16'
+    return 'float32'
+
+
+# Tipos de las columnas de identificación al leer de SQLite: los textos que se repiten en
+# muchas filas (temporada, equipo, nombre) se leen como categorías
+FRAME_COLUMNS = dict(ID_COLUMNS, Season='category', Player='category')
+
+INT16_MAX = np.iinfo(np.int16).max
+
+
+# Función para elegir el tipo de una columna ya guardada (standard_Min, passing_Cmp:1, ...)
+def metric_dtype(name):
+    if name in FRAME_COLUMNS:
+        return FRAME_COLUMNS[name]
+    leaf = name.split('_', 1)[-1].split(':')[0]
+    if leaf in WIDE_COUNT_COLUMNS:
+        return 'Int32'
+    if leaf in COUNT_COLUMNS:
+        return 'Int16'
+    return 'float32'
+
+
+# Función para pasar un DataFrame leído de SQLite o de parquet a los tipos compactos.
+# Las columnas repetidas (p. ej. standard_Gls:1, que es por 90 minutos) no se pueden
+# distinguir por el nombre, así que un conteo con decimales se deja en float32 y uno que
+# no cabe en int16 pasa a Int32.
+def compact_frame(df):
+    dtypes = {}
+    for column in df.columns:
+        dtype = metric_dtype(column)
+        if dtype not in ('string', 'category') and not pd.api.types.is_numeric_dtype(df[column]):
+            # Texto que no es una métrica conocida: se deja como está
+            continue
+        if dtype.startswith('Int'):
+            values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            if np.nanmax(np.abs(values - np.round(values)), initial=0) > 0:
+                dtype = 'float32'
+            elif dtype == 'Int16' and np.nanmax(np.abs(values), initial=0) > INT16_MAX:
+                dtype = 'Int32'
+        dtypes[column] = dtype
+    return df.astype(dtypes)
+
+
+# Función para calcular los nombres y tipos finales de una tabla a partir de sus encabezados.
+# Los nombres repetidos (p. ej. Gls en Performance y en Per 90 Minutes) se numeran como
+# lo hacía SQLite al renombrar: standard_Gls, standard_Gls:1, ...
+def resolve_columns(table_id, columns):
+    prefix = STAT_TABLES.get(table_id, table_id.split('_')[-1])
+    if isinstance(columns, pd.MultiIndex):
+        groups = columns.get_level_values(0)
+        leaves = columns.get_level_values(-1)
+    else:
+        groups = [''] * len(columns)
+        leaves = columns
+
+    names, dtypes, seen = [], {}, {}
+    for group, leaf in zip(groups, leaves):
+        leaf = str(leaf).strip()
+        name = prefixed_name(prefix, leaf)
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}:{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+        dtypes[name] = column_dtype('' if str(group).startswith('Unnamed') else group, leaf)
+    return names, dtypes
+
+
+# Función para normalizar una tabla recién leída con read_html
+def normalize_table(df, table_id):
+    names, dtypes = resolve_columns(table_id, df.columns)
+    df.columns = names
+
+    # Eliminar la última columna si contiene 'Matches' en su nombre
+    if names[-1].endswith('Matches'):
+        df = df.iloc[:, :-1]
+        del dtypes[names[-1]]
+
+    # Quitar las filas de encabezado que FBREF repite dentro del cuerpo de la tabla
+    if 'Player' in df.columns:
+        df = df[df['Player'] != 'Player']
+
+    # Conversión numérica de todas las métricas en una sola pasada
+    text_columns = [c for c in df.columns if dtypes[c] in ('string', 'category')]
+    numeric_columns = [c for c in df.columns if c not in text_columns]
+    block = df[numeric_columns].to_numpy(dtype=object).ravel()
+    values = pd.to_numeric(pd.Series(block), errors='coerce').to_numpy(dtype='float64')
+    values = values.reshape(len(df), len(numeric_columns))
+
+    # Si un conteo trae decimales (FBREF cambió el formato), se guarda como float32
+    fractional = np.nanmax(np.abs(values - np.round(values)), axis=0, initial=0) > 0
+    for column, is_fractional in zip(numeric_columns, fractional):
+        if is_fractional and dtypes[column].startswith('Int'):
+            print(f'{table_id}: {column} tiene decimales, se guarda como float32')
+            dtypes[column] = 'float32'
+
+    out = pd.DataFrame(values, columns=numeric_columns, index=df.index)
+    for column in text_columns:
+        out[column] = df[column]
+    return out[list(df.columns)].astype(dtypes).reset_index(drop=True)
@@ -0,0 +1,237 @@
+import queue
+import random
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from datos.fixture_server import save_fixture
+
+# Motor de scraping concurrente: un grupo acotado de workers descarga y procesa
+# las páginas, y un único hilo escritor guarda las tablas terminadas en SQLite
+# (SQLite solo admite un escritor a la vez, así evitamos bloqueos).
+
+# Una tarea de scraping: nombre de la tabla destino, URL y ID de la tabla en el HTML
+Job = namedtuple('Job', ['table_name', 'url', 'table_id'])
+
+# Resultado de una tarea: DataFrame (o None), segundos invertidos, intentos realizados
+# y si la tabla resultó sin cambios respecto a la última descarga
+Result = namedtuple('Result', ['job', 'df', 'latency', 'attempts', 'error', 'unchanged'],
+                    defaults=(False,))
+
+_DONE = object()
+
+# Segundos de espera de cada intento de poner un resultado en la cola del escritor; entre
+# intentos se revisa que el escritor siga vivo
+PUT_TIMEOUT = 0.5
+
+
+# Lo lanza fetch o parse cuando la tabla no cambió: no hay nada que escribir
+class Unchanged(Exception):
+    pass
+
+
+# Limitador de peticiones por host: garantiza un intervalo mínimo entre peticiones
+# al mismo host sin importar cuántos workers estén activos
+class RateLimiter:
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Estadísticas de la corrida: páginas por segundo y latencia por tabla
+class RunStats:
+    def __init__(self):
+        self.results = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add(self, result):
+        self.results.append(result)
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def pages(self):
+        return sum(1 for r in self.results if r.df is not None)
+
+    @property
+    def unchanged(self):
+        return [r for r in self.results if r.unchanged]
+
+    @property
+    def failed(self):
+        return [r for r in self.results if r.df is None and not r.unchanged]
+
+    def pages_per_second(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        lines = [f'Páginas descargadas: {self.pages} de {len(self.results)} '
+                 f'en {self.elapsed:.1f} s ({self.pages_per_second():.2f} páginas/s)']
+        if self.unchanged:
+            lines.append(f'Tablas sin cambios: {len(self.unchanged)}')
+        lines.append('Latencia por tabla:')
+        for r in sorted(self.results, key=lambda r: r.latency, reverse=True):
+            if r.unchanged:
+                status = 'sin cambios'
+            else:
+                status = 'ok' if r.df is not None else f'error: {r.error}'
+            lines.append(f'  {r.job.table_name:<35} {r.latency:7.2f} s  intentos={r.attempts}  {status}')
+        return '\n'.join(lines)
+
+
+class Scraper:
+    # fetch(url, table_id) devuelve el HTML de la página
+    # parse(html, table_id) devuelve un DataFrame o None si la tabla no existe
+    # sink recibe las tablas en el hilo escritor: open(), write(table_name, df), commit(),
+    #   close() y, opcionalmente, unchanged(job) para las tablas sin cambios
+    # group_by(job) agrupa las tareas en transacciones (p. ej. una por temporada): las tablas
+    #   de un grupo se guardan juntas cuando termina su última tarea; sin él se confirma
+    #   después de cada tabla
+    def __init__(self, fetch, parse, sink, workers=4, rate=1.0, retries=3,
+                 backoff=2.0, fixtures_dir=None, group_by=None):
+        self.fetch = fetch
+        self.parse = parse
+        self.sink = sink
+        self.group_by = group_by
+        self.workers = workers
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.fixtures_dir = fixtures_dir
+
+    # Descarga y procesa una tabla, reintentando con espera exponencial
+    def _run_job(self, job):
+        started = time.perf_counter()
+        error = None
+        for attempt in range(1, self.retries + 2):
+            try:
+                self.limiter.wait(job.url)
+                html = self.fetch(job.url, job.table_id)
+                if self.fixtures_dir:
+                    save_fixture(self.fixtures_dir, job.url, html)
+                df = self.parse(html, job.table_id)
+                if df is None:
+                    error = f'No se encontró la tabla con el ID {job.table_id}'
+                    print(error)
+                return Result(job, df, time.perf_counter() - started, attempt, error)
+            except Unchanged:
+                return Result(job, None, time.perf_counter() - started, attempt, None, True)
+            except LookupError as e:
+                # La página respondió pero no contiene la tabla: reintentar no ayuda
+                print(e)
+                return Result(job, None, time.perf_counter() - started, attempt, str(e))
+            except Exception as e:
+                error = repr(e)
+                if attempt <= self.retries:
+                    delay = self.backoff * 2 ** (attempt - 1) * (1 + random.random() / 2)
+                    print(f'Error en {job.table_name} (intento {attempt}): {error}. Reintentando en {delay:.1f} s')
+                    time.sleep(delay)
+        return Result(job, None, time.perf_counter() - started, self.retries + 1, error)
+
+    def _group(self, job):
+        return self.group_by(job) if self.group_by else job
+
+    # Hilo escritor: única conexión a SQLite, consume las tablas terminadas de la cola
+    # y las guarda en una transacción cuando termina cada grupo de tareas. Si el sink falla
+    # (open o commit: base bloqueada, disco lleno, ruta inválida) el error queda en failure
+    # y el hilo termina; run lo vuelve a lanzar.
+    def _writer(self, results, stats, remaining, failure):
+        try:
+            self._consume(results, stats, remaining)
+        except BaseException as e:
+            failure.append(e)
+
+    def _consume(self, results, stats, remaining):
+        self.sink.open()
+        # Resultados de los grupos que todavía tienen tareas sin terminar
+        pending = defaultdict(list)
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    break
+                group = self._group(result.job)
+                pending[group].append(result)
+                remaining[group] -= 1
+                if not remaining[group]:
+                    self._save(pending.pop(group), stats)
+            # Si la descarga se interrumpió, lo que llegó de los grupos incompletos también se guarda
+            for group_results in pending.values():
+                self._save(group_results, stats)
+        finally:
+            self.sink.close()
+
+    # Escribe los resultados de un grupo completo y confirma su transacción. Con temporadas
+    # intercaladas, cada COMMIT solo incluye las tablas de su grupo.
+    def _save(self, group_results, stats):
+        for result in group_results:
+            if result.unchanged:
+                if hasattr(self.sink, 'unchanged'):
+                    self.sink.unchanged(result.job)
+                print(f'{result.job.table_name} sin cambios, se conserva la tabla actual.')
+            elif result.df is not None:
+                try:
+                    self.sink.write(result.job.table_name, result.df)
+                    print(f'Datos de {result.job.table_name} guardados en la base de datos.')
+                except Exception as e:
+                    result = result._replace(df=None, error=repr(e))
+            if result.df is None and not result.unchanged:
+                print(f'No se pudo obtener la tabla para {result.job.table_name}.')
+            stats.add(result)
+        self.sink.commit()
+
+    # Pone un elemento en la cola sin bloquearse si el escritor murió; devuelve False en ese caso
+    @staticmethod
+    def _put(results, item, writer):
+        while writer.is_alive():
+            try:
+                results.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run(self, jobs):
+        stats = RunStats()
+        remaining = Counter(self._group(job) for job in jobs)
+        results = queue.Queue(maxsize=self.workers * 2)
+        failure = []
+        writer = threading.Thread(target=self._writer, args=(results, stats, remaining, failure))
+        writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self._run_job, job) for job in jobs]
+                for future in as_completed(futures):
+                    if not self._put(results, future.result(), writer):
+                        # El escritor falló: las tareas que no empezaron se cancelan
+                        for pending in futures:
+                            pending.cancel()
+                        break
+        finally:
+            self._put(results, _DONE, writer)
+            writer.join()
+            stats.stop()
+        if failure:
+            raise failure[0]
+        return stats
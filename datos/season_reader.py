@@ -0,0 +1,122 @@
+from functools import reduce
+
+from datos.features import POSITION_COLUMNS, processed_files
+
+# Lectura de los archivos processed_{temporada}.parquet con los filtros aplicados en el
+# lector. Antes de leer se revisan las estadísticas (mínimo, máximo, nulos) de cada grupo
+# de filas y se descartan los grupos que no pueden cumplir los filtros; de los grupos que
+# quedan solo se leen las columnas pedidas más las de los filtros. Los filtros son:
+#   - positions: al menos una de las columnas GK/DF/MF/FW pedidas es verdadera;
+#   - min_minutes: standard_Min >= min_minutes;
+#   - player: nombre del jugador sin la temporada (p. ej. "Marcus Rashford").
+# read_seasons devuelve un DataFrame; iter_season_batches, lotes de Arrow uno a uno.
+
+BATCH_SIZE = 65536
+
+
+# Estadísticas de una columna en un grupo de filas: (mínimo, máximo, todos nulos)
+def _column_stats(row_group, index):
+    column = row_group.column(index)
+    stats = column.statistics
+    if stats is None:
+        return None, None, False
+    all_null = stats.null_count == row_group.num_rows
+    if not stats.has_min_max:
+        return None, None, all_null
+    return stats.min, stats.max, all_null
+
+
+# Función para decidir si un grupo de filas puede tener filas que cumplan los filtros
+def keep_row_group(row_group, names, positions=None, min_minutes=None, label=None):
+    if positions:
+        # Si ninguna de las posiciones pedidas tiene un True en el grupo, se salta
+        maxima = [_column_stats(row_group, names[p])[1] for p in positions]
+        if all(m is False for m in maxima):
+            return False
+    if min_minutes is not None:
+        _, maximum, all_null = _column_stats(row_group, names['standard_Min'])
+        if all_null or (maximum is not None and maximum < min_minutes):
+            return False
+    if label is not None:
+        minimum, maximum, all_null = _column_stats(row_group, names['Player'])
+        if all_null or (minimum is not None and not minimum <= label <= maximum):
+            return False
+    return True
+
+
+# Máscara de las filas de un lote que cumplen los filtros (None si no hay filtros)
+def _row_mask(batch, positions=None, min_minutes=None, label=None):
+    import pyarrow.compute as pc
+
+    masks = []
+    if positions:
+        masks.append(reduce(pc.or_, [batch.column(p) for p in positions]))
+    if min_minutes is not None:
+        masks.append(pc.greater_equal(batch.column('standard_Min'), min_minutes))
+    if label is not None:
+        masks.append(pc.equal(batch.column('Player'), label))
+    return reduce(pc.and_, masks) if masks else None
+
+
+def _filter_columns(positions=None, min_minutes=None, player=None):
+    columns = list(positions or [])
+    if min_minutes is not None:
+        columns.append('standard_Min')
+    if player is not None:
+        columns.append('Player')
+    return columns
+
+
+# Función para leer lotes de Arrow de varias temporadas con los filtros aplicados
+# files: {temporada: ruta o archivo abierto}, como los que devuelve processed_files
+def iter_batches(files, columns=None, positions=None, min_minutes=None, player=None, batch_size=BATCH_SIZE,
+                 stats=None):
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    unknown = set(positions or []) - set(POSITION_COLUMNS)
+    if unknown:
+        raise ValueError(f'Posiciones desconocidas: {sorted(unknown)}')
+    for season, path in files.items():
+        parquet = pq.ParquetFile(path)
+        metadata = parquet.metadata
+        names = {metadata.schema.column(i).name: i for i in range(metadata.num_columns)}
+        output = [c for c in columns or names if c != 'Season']
+        read_columns = list(dict.fromkeys(output + _filter_columns(positions, min_minutes, player)))
+        # En los archivos anteriores (sin columna Season) el nombre venía como "temporada, jugador"
+        label = player if player is None or 'Season' in names else f'{season}, {player}'
+        groups = [i for i in range(metadata.num_row_groups)
+                  if keep_row_group(metadata.row_group(i), names, positions, min_minutes, label)]
+        if stats is not None:
+            stats['grupos'] = stats.get('grupos', 0) + metadata.num_row_groups
+            stats['grupos leídos'] = stats.get('grupos leídos', 0) + len(groups)
+        if not groups:
+            continue
+        for batch in parquet.iter_batches(batch_size=batch_size, row_groups=groups, columns=read_columns):
+            mask = _row_mask(batch, positions, min_minutes, label)
+            if mask is not None:
+                batch = batch.filter(mask)
+            if batch.num_rows == 0:
+                continue
+            batch = batch.select(output)
+            season_column = pa.DictionaryArray.from_arrays(pa.array(np.zeros(batch.num_rows, np.int8)), [season])
+            yield pa.RecordBatch.from_arrays(batch.columns + [season_column], names=output + ['Season'])
+
+
+def iter_season_batches(source='datos', seasons=None, columns=None, positions=None, min_minutes=None,
+                        player=None, batch_size=BATCH_SIZE):
+    return iter_batches(processed_files(source, seasons), columns, positions, min_minutes, player, batch_size)
+
+
+# Función para leer varias temporadas en un solo DataFrame
+def read_seasons(source='datos', seasons=None, columns=None, positions=None, min_minutes=None, player=None,
+                 batch_size=BATCH_SIZE):
+    import pandas as pd
+    import pyarrow as pa
+
+    batches = list(iter_season_batches(source, seasons, columns, positions, min_minutes, player, batch_size))
+    if not batches:
+        return pd.DataFrame(columns=(list(columns) if columns else []) + ['Season'])
+    return pa.Table.from_batches(batches).to_pandas()
+
@@ -0,0 +1,116 @@
+import os
+import time
+
+import streamlit as st
+
+from datos.ann import POSITION_BITS
+from datos.charts import PIZZA_LABELS
+from datos.config import MODEL_DIR, SETTINGS
+from datos.player_page import connect_db, get_renderer
+
+# Página de jugadores similares. Los embeddings y los atributos exportados al entrenar
+# (datos/similar_players.py) se abren una sola vez por proceso; cada búsqueda es un producto
+# matriz-vector sobre los embeddings, así que responde en milisegundos sin cargar TensorFlow.
+
+# Descripción de la funcionalidad
+DESCRIPTION = """
+    Encuentra a los jugadores con un perfil de juego parecido al de un jugador elegido. El modelo de redes neuronales resume las estadísticas de cada jugador en una temporada en un vector (embedding) y la similitud coseno entre vectores indica qué tan parecidos son.
+
+**Filtrar la Búsqueda:** Limita los resultados por posición, por rango de temporadas y por minutos jugados.
+
+**Comparar en Pizza Charts:** El gráfico del jugador elegido se muestra junto al del jugador similar que selecciones, con los percentiles de la liga en cada temporada.
+"""
+
+
+# Función para abrir los artefactos del modelo: uno por proceso, compartido entre sesiones
+@st.cache_resource
+def load_similar_players(model_dir):
+    from datos.similar_players import SimilarPlayers
+
+    return SimilarPlayers.load(model_dir)
+
+
+# Función para obtener el equipo y la posición de un jugador en una temporada. Con player_id
+# se distingue entre jugadores con el mismo nombre; sin él (artefactos anteriores) se busca
+# por nombre.
+def find_player(data, renderer, season, player, player_id=None):
+    import pandas as pd
+
+    df = data.percentiles(season, renderer.metrics)
+    match = df['Player'] == player if pd.isna(player_id) else df['player_id'] == player_id
+    rows = df.loc[match, ['player_id', 'Squad', 'Pos']].to_dict('records')
+    return rows[0] if rows else None
+
+
+# Función para mostrar el Pizza Chart de un jugador (si está en la base de datos)
+def show_chart(data, renderer, season, player, player_id=None):
+    found = find_player(data, renderer, season, player, player_id)
+    if found is None:
+        st.write(f"No hay percentiles de **{player}** en la temporada {season}")
+        return
+    st.image(renderer.chart(season, found['Squad'], found['player_id'], player, found['Pos'], PIZZA_LABELS))
+
+
+# Función para mostrar la página completa. Los artefactos salen de la configuración
+# (futbol.ini o FUTBOL_MODEL_DIR); model_dir y db_path permiten indicar otros.
+def render(model_dir=None, db_path=None):
+    model_dir = model_dir or MODEL_DIR
+    settings = SETTINGS if db_path is None else SETTINGS._replace(path=db_path)
+
+    st.title("Jugadores Similares")
+    st.write(DESCRIPTION)
+
+    if not os.path.isdir(model_dir):
+        st.warning(f"No se encontraron los artefactos del modelo en `{model_dir}`. "
+                   "Se exportan al entrenar con `export_artifacts` (ver modelo.py).")
+        return
+    similar_players = load_similar_players(model_dir)
+    seasons = similar_players.seasons_available()
+
+    # Jugador de referencia
+    col1, col2 = st.columns(2)
+    with col1:
+        season_selected = st.selectbox("Selecciona la temporada", seasons)
+    with col2:
+        player_selected = st.selectbox("Selecciona un jugador", similar_players.players_in(season_selected))
+
+    # Filtros de la búsqueda
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        positions = st.multiselect("Posiciones", list(POSITION_BITS))
+    with col2:
+        first, last = st.select_slider("Temporadas", options=seasons[::-1], value=(seasons[-1], seasons[0]))
+    with col3:
+        min_minutes = st.number_input("Minutos mínimos", min_value=0, value=0, step=90)
+    k = st.slider("Número de jugadores", min_value=1, max_value=20, value=5)
+
+    # Solo se buscan jugadores con Pizza Chart: los que jugaron los minutos mínimos de los
+    # percentiles en su temporada (o los pedidos, si son más)
+    data = connect_db(settings)
+    renderer = get_renderer(settings)
+    cuts = {season: max(data.minutes_cut(season), min_minutes) for season in seasons}
+
+    key = f'{season_selected}, {player_selected}'
+    start = time.perf_counter()
+    results = similar_players.similar(key, k, positions=positions or None, seasons=(first, last), min_minutes=cuts)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    st.write(f"Jugadores similares a **{player_selected}** ({season_selected})")
+    st.dataframe(results.drop(columns='player_id', errors='ignore'))
+    st.caption(f"Búsqueda entre {len(similar_players)} jugadores en {elapsed:.1f} ms")
+    if results.empty:
+        st.write("Ningún jugador cumple los filtros.")
+        return
+
+    # Pizza Charts lado a lado: el jugador elegido y el similar seleccionado
+    labels = [f"{row.Player} ({row.Season})" for row in results.itertuples()]
+    choice = st.selectbox("Comparar con", range(len(labels)), format_func=labels.__getitem__)
+    other = results.iloc[choice]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**{player_selected}** ({season_selected})")
+        show_chart(data, renderer, season_selected, player_selected, similar_players.player(key).get('player_id'))
+    with col2:
+        st.write(f"**{other['Player']}** ({other['Season']}) · similitud {other['Similitud']:.3f}")
+        show_chart(data, renderer, other['Season'], other['Player'], other.get('player_id'))
@@ -0,0 +1,139 @@
+import json
+import os
+
+import numpy as np
+
+from datos.ann import POSITION_BITS, AnnIndex, attribute_mask, build_ann_index, store_attributes
+from datos.encoder import NumpyEncoder, export_encoder
+from datos.similarity import SimilarityIndex, normalize
+
+# Artefactos del modelo de similitud para la aplicación. Al entrenar (modelo.py) se exportan
+# a una carpeta los embeddings de todos los jugadores, los atributos para filtrar (posiciones,
+# temporada y minutos), los parámetros del escalado Min-Max y los pesos del encoder; con muchos
+# jugadores también el índice aproximado (datos/ann.py). La página de jugadores similares los
+# abre una sola vez por proceso: los embeddings quedan mapeados en memoria y cada consulta es
+# un producto matriz-vector (o unas pocas listas del índice aproximado), sin TensorFlow.
+#
+#   embeddings.npy    embeddings float32, una fila por jugador y temporada
+#   players.parquet   Season, Player, player_id, positions (bits), seasons (año de inicio), minutes
+#   scaler.json       columnas del modelo y mínimos/máximos del escalado
+#   encoder.npz       pesos del encoder para calcular embeddings con NumPy (datos/encoder.py)
+#   ann/              índice aproximado (solo con más de ANN_MIN_ROWS jugadores)
+
+EMBEDDINGS_FILE = 'embeddings.npy'
+PLAYERS_FILE = 'players.parquet'
+SCALER_FILE = 'scaler.json'
+ENCODER_FILE = 'encoder.npz'
+ANN_DIR = 'ann'
+
+# Columnas de cada jugador en players.parquet y en los resultados (los artefactos exportados
+# antes de player_id no lo traen)
+PLAYER_COLUMNS = ['Season', 'Player', 'player_id']
+
+# Desde este número de jugadores se exporta y se usa el índice aproximado
+ANN_MIN_ROWS = 100000
+
+
+# Función para convertir los bits de posición en texto ("DF,MF")
+def position_label(bits):
+    return ','.join(p for p, bit in POSITION_BITS.items() if bits & bit)
+
+
+# Función para exportar los artefactos desde el almacén de características (datos/features.py)
+# con el que se entrenó. encoder es el modelo de Keras que produce los embeddings.
+def export_artifacts(out_dir, embeddings, store, encoder=None, ann_min_rows=ANN_MIN_ROWS):
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if len(embeddings) != len(store.index):
+        raise ValueError(f'{len(embeddings)} embeddings para {len(store.index)} jugadores')
+    os.makedirs(out_dir, exist_ok=True)
+
+    np.save(os.path.join(out_dir, EMBEDDINGS_FILE), embeddings)
+    attributes = store_attributes(store)
+    players = store.index[[c for c in PLAYER_COLUMNS if c in store.index]].assign(**attributes)
+    players.to_parquet(os.path.join(out_dir, PLAYERS_FILE), index=False)
+    numerical = list(store.columns)[:len(store.minimum)]
+    with open(os.path.join(out_dir, SCALER_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'columns': list(store.columns),
+                   'minimum': dict(zip(numerical, np.asarray(store.minimum).tolist())),
+                   'maximum': dict(zip(numerical, np.asarray(store.maximum).tolist()))}, f, indent=2)
+    if encoder is not None:
+        export_encoder(encoder, os.path.join(out_dir, ENCODER_FILE), store=store)
+    if len(embeddings) >= ann_min_rows:
+        build_ann_index(embeddings, os.path.join(out_dir, ANN_DIR), **attributes)
+    return players
+
+
+class SimilarPlayers:
+    def __init__(self, embeddings, players, ann=None, encoder=None):
+        self.players = players
+        self.columns = [c for c in PLAYER_COLUMNS if c in players]
+        self.positions = players['positions'].to_numpy(np.uint8)
+        self.seasons = players['seasons'].to_numpy(np.int16)
+        self.minutes = players['minutes'].to_numpy(np.int32)
+        self.index = SimilarityIndex(embeddings, players['Season'].astype(str) + ', ' + players['Player'].astype(str))
+        self.ann = ann
+        self.encoder = encoder
+
+    # Función para abrir los artefactos exportados; el índice aproximado y el encoder se
+    # usan si existen
+    @classmethod
+    def load(cls, out_dir, mmap_mode='r'):
+        import pandas as pd
+
+        embeddings = np.load(os.path.join(out_dir, EMBEDDINGS_FILE), mmap_mode=mmap_mode)
+        players = pd.read_parquet(os.path.join(out_dir, PLAYERS_FILE))
+        ann_dir = os.path.join(out_dir, ANN_DIR)
+        ann = AnnIndex.load(ann_dir, mmap_mode=mmap_mode) if os.path.isdir(ann_dir) else None
+        encoder_path = os.path.join(out_dir, ENCODER_FILE)
+        encoder = NumpyEncoder.load(encoder_path) if os.path.exists(encoder_path) else None
+        return cls(embeddings, players, ann, encoder)
+
+    def __len__(self):
+        return len(self.players)
+
+    # Temporadas disponibles, de la más reciente a la más antigua
+    def seasons_available(self):
+        return sorted(self.players['Season'].astype(str).unique(), reverse=True)
+
+    # Jugadores de una temporada, en orden alfabético
+    def players_in(self, season):
+        return sorted(self.players.loc[self.players['Season'].astype(str) == season, 'Player'].astype(str).unique())
+
+    # Búsqueda de los k más similares a un vector normalizado, sin la fila exclude
+    def _search(self, vector, k, exclude, positions=None, seasons=None, min_minutes=None):
+        filters = {'positions': positions, 'seasons': seasons, 'min_minutes': min_minutes}
+        if self.ann is not None:
+            rows, scores = self.ann.search(vector, k, exclude=exclude, **filters)
+        else:
+            mask = attribute_mask(self.positions, self.seasons, self.minutes, **filters)
+            if exclude is not None:
+                mask[exclude] = False
+            rows, scores = self.index.search(vector, k, mask=mask, normalized=True)
+            rows, scores = rows[0], scores[0]
+        found = np.isfinite(scores)
+        rows, scores = rows[found], scores[found]
+        result = self.players.iloc[rows][self.columns].astype({'Season': str, 'Player': str})
+        return result.assign(Pos=[position_label(b) for b in self.positions[rows]], Min=self.minutes[rows],
+                             Similitud=scores.astype(float)).reset_index(drop=True)
+
+    # Fila de "temporada, jugador": Season, Player y player_id (si está en los artefactos)
+    def player(self, key):
+        row = self.players.iloc[self.index.row(key)]
+        return row[self.columns].to_dict()
+
+    # Función para buscar los k jugadores más similares a "temporada, jugador". Filtros:
+    # positions (al menos una de las posiciones), seasons (primera y última temporada) y
+    # min_minutes. Devuelve Season, Player, player_id, Pos, Min y Similitud, de mayor a menor
+    # similitud.
+    def similar(self, key, k=5, **filters):
+        row = self.index.row(key)
+        return self._search(self.index.vectors[row], k, row, **filters)
+
+    # Función para buscar jugadores similares a filas sin escalar que no están en los
+    # embeddings exportados (jugadores nuevos o actualizados, p. ej. la temporada en vivo).
+    # Los embeddings se calculan con el encoder en NumPy; devuelve un resultado por fila.
+    def similar_to_rows(self, frame, k=5, **filters):
+        if self.encoder is None:
+            raise ValueError('Los artefactos no incluyen el encoder (encoder.npz)')
+        vectors = normalize(self.encoder.embed(frame))
+        return [self._search(vector, k, None, **filters) for vector in vectors]
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Búsqueda exacta de jugadores similares sobre los embeddings del autoencoder. Los vectores
+# se normalizan (norma L2 = 1) una sola vez al crear el índice, así que la similitud coseno
+# es un producto punto: una consulta es un producto matriz-vector y un lote de consultas un
+# solo producto matriz-matriz. Los k mejores se eligen con argpartition (O(n)) y solo esos k
+# se ordenan. Un diccionario lleva de la etiqueta del jugador ("temporada, jugador") a su fila.
+
+# Consultas por bloque en search, para acotar la matriz de similitudes (bloque x filas)
+BLOCK_SIZE = 1024
+
+
+# Función para normalizar filas a norma 1 (las filas en cero quedan en cero)
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# Función para obtener los k mayores de cada fila de scores, ordenados: (índices, valores)
+def top_k(scores, k):
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        empty = np.empty(scores.shape[:-1] + (0,))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+    if k < scores.shape[-1]:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[-1]), scores.shape[:-1] + (k,))
+    values = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-values, axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1), np.take_along_axis(values, order, axis=-1)
+
+
+class SimilarityIndex:
+    def __init__(self, embeddings, keys):
+        self.vectors = normalize(embeddings)
+        self.keys = np.asarray(keys, dtype=object)
+        if len(self.keys) != len(self.vectors):
+            raise ValueError(f'{len(self.keys)} etiquetas para {len(self.vectors)} embeddings')
+        # Si una etiqueta se repite (jugador con dos equipos en la temporada) se usa la primera fila
+        self.rows = {}
+        for row, key in enumerate(self.keys):
+            self.rows.setdefault(key, row)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def row(self, key):
+        try:
+            return self.rows[key]
+        except KeyError:
+            raise KeyError(f'Jugador desconocido: {key}') from None
+
+    # Búsqueda de los k vectores más parecidos a cada consulta (una fila por consulta).
+    # exclude: fila a excluir por consulta (el propio jugador) o None; mask: filas permitidas.
+    def search(self, queries, k=5, exclude=None, mask=None, normalized=False):
+        queries = np.atleast_2d(queries if normalized else normalize(queries))
+        indices, values = [], []
+        for start in range(0, len(queries), BLOCK_SIZE):
+            scores = queries[start:start + BLOCK_SIZE] @ self.vectors.T
+            if mask is not None:
+                scores[:, ~mask] = -np.inf
+            if exclude is not None:
+                block = np.asarray(exclude[start:start + BLOCK_SIZE])
+                scores[np.arange(len(block)), block] = -np.inf
+            block_indices, block_values = top_k(scores, k)
+            indices.append(block_indices)
+            values.append(block_values)
+        return np.concatenate(indices), np.concatenate(values)
+
+    # Función para obtener los k jugadores más similares a uno o varios jugadores por etiqueta
+    def similar(self, keys, k=5, mask=None):
+        single = isinstance(keys, str)
+        rows = np.array([self.row(key) for key in ([keys] if single else keys)])
+        indices, values = self.search(self.vectors[rows], k, exclude=rows, mask=mask, normalized=True)
+        results = [[(self.keys[i], float(v)) for i, v in zip(row_indices, row_values) if np.isfinite(v)]
+                   for row_indices, row_values in zip(indices, values)]
+        return results[0] if single else results
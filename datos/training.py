@@ -0,0 +1,224 @@
+import argparse
+import time
+import zlib
+
+import numpy as np
+
+from datos.features import NUMERICAL_COLUMNS, POSITION_COLUMNS, processed_files, scan, valid_batches
+
+# Entrenamiento del autoencoder con tf.data, sin armar la matriz completa en memoria. Hay dos
+# fuentes de lotes:
+#   - parquet_dataset lee los processed_{temporada}.parquet por lotes (varios archivos en
+#     paralelo con interleave), descarta las filas con NaN y hace el escalado Min-Max dentro
+#     del pipeline con un map paralelo.
+#   - store_dataset lee filas del almacén de características mapeado en memoria
+#     (datos/features.py, ya escalado) con un map paralelo.
+# Las dos terminan en batch y prefetch, así que la lectura del siguiente lote se solapa con
+# el paso de entrenamiento. Con lotes grandes (1024 en lugar de 32) cada paso aprovecha
+# todos los núcleos de la CPU.
+#   python -m datos.training --source datos --batch-size 1024 --epochs 50
+#   python -m datos.training --features datos/features --batch-size 1024 --epochs 50
+
+# Lote de entrenamiento por defecto
+BATCH_SIZE = 1024
+
+# Filas por lote al leer los parquet
+READ_BATCH = 65536
+
+# Filas que se mezclan a la vez al leer de los parquet
+SHUFFLE_BUFFER = 65536
+
+# Fracción de validación y semilla (las de train_test_split en modelo.py)
+VAL_FRACTION = 0.2
+SEED = 42
+
+# Tasa de aprendizaje de modelo.py (medida con lotes de 32). Se usa igual con cualquier lote;
+# escalarla con el lote es opcional (scale_lr) hasta comparar la pérdida con la de modelo.py.
+LEARNING_RATE = 1e-4
+BASE_BATCH_SIZE = 32
+
+# Capas del encoder de modelo.py; el decoder repite las intermedias al revés
+UNITS = (64, 32, 16)
+
+
+# Función para escalar la tasa de aprendizaje con el tamaño del lote (regla lineal): con
+# lotes más grandes hay menos pasos por época y cada paso puede ser más largo
+def scaled_learning_rate(batch_size, learning_rate=LEARNING_RATE):
+    return learning_rate * batch_size / BASE_BATCH_SIZE
+
+
+# Función para construir el autoencoder de modelo.py (la capa de embeddings se llama embedding_layer)
+def build_autoencoder(input_dim, units=UNITS, learning_rate=LEARNING_RATE):
+    import tensorflow as tf
+    from tensorflow.keras.layers import Dense, Input
+    from tensorflow.keras.models import Model
+
+    inputs = Input(shape=(input_dim,))
+    x = inputs
+    for n in units[:-1]:
+        x = Dense(n, activation='relu')(x)
+    x = Dense(units[-1], activation='relu', name='embedding_layer')(x)
+    for n in reversed(units[1:-1]):
+        x = Dense(n, activation='relu')(x)
+    outputs = Dense(input_dim, activation='linear')(x)
+
+    model = Model(inputs=inputs, outputs=outputs)
+    model.compile(loss='mean_squared_error', optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate))
+    return model
+
+
+# Función para dividir las filas en entrenamiento y validación
+def split_rows(rows, val_fraction=VAL_FRACTION, seed=SEED):
+    order = np.random.default_rng(seed).permutation(rows)
+    n_val = int(round(rows * val_fraction))
+    return np.sort(order[n_val:]), np.sort(order[:n_val])
+
+
+# Lotes crudos (numéricas y posiciones en float32) de un archivo para un subconjunto. Cada
+# fila va a validación con probabilidad val_fraction; el sorteo depende solo de la semilla y
+# del archivo, así que entrenamiento y validación no cambian entre épocas.
+def _file_batches(path, validation, val_fraction, seed, read_batch):
+    path = path.decode() if isinstance(path, bytes) else path
+    validation = bool(validation)
+    rng = np.random.default_rng([int(seed), zlib.crc32(path.encode())])
+    for _, numeric, positions in valid_batches(path, int(read_batch)):
+        keep = (rng.random(len(numeric)) < val_fraction) == validation
+        if keep.any():
+            yield numeric[keep].astype(np.float32), positions[keep].astype(np.float32)
+
+
+# Función para crear el dataset de entrenamiento ('train') o validación ('val') desde los
+# parquet. minimum y maximum son los del escalado; si faltan se calculan con una pasada previa.
+# Con deterministic=True los lotes salen siempre en el mismo orden (entrenamientos reproducibles).
+def parquet_dataset(source, subset='train', batch_size=BATCH_SIZE, minimum=None, maximum=None, seasons=None,
+                    val_fraction=VAL_FRACTION, seed=SEED, shuffle_buffer=SHUFFLE_BUFFER, read_batch=READ_BATCH,
+                    deterministic=False):
+    import tensorflow as tf
+
+    if subset not in ('train', 'val'):
+        raise ValueError(f'Subconjunto desconocido: {subset}')
+    files = processed_files(source, seasons)
+    if not files:
+        raise FileNotFoundError(f'No hay archivos processed_{{temporada}}.parquet en {source}')
+    if minimum is None or maximum is None:
+        _, minimum, maximum = scan(files, read_batch)
+    span = np.asarray(maximum, dtype=np.float64) - minimum
+    span[span == 0] = 1.0
+    minimum = tf.constant(minimum, tf.float32)
+    span = tf.constant(span, tf.float32)
+
+    signature = (tf.TensorSpec([None, len(NUMERICAL_COLUMNS)], tf.float32),
+                 tf.TensorSpec([None, len(POSITION_COLUMNS)], tf.float32))
+    validation = subset == 'val'
+
+    def read(path):
+        return tf.data.Dataset.from_generator(_file_batches, output_signature=signature,
+                                              args=(path, validation, val_fraction, seed, read_batch))
+
+    # Escalado Min-Max dentro del pipeline
+    def prepare(numeric, positions):
+        return tf.concat([(numeric - minimum) / span, positions], axis=1)
+
+    dataset = tf.data.Dataset.from_tensor_slices(list(files.values()))
+    dataset = dataset.interleave(read, cycle_length=min(len(files), 4), num_parallel_calls=tf.data.AUTOTUNE,
+                                 deterministic=deterministic)
+    dataset = dataset.map(prepare, num_parallel_calls=tf.data.AUTOTUNE).unbatch()
+    if not validation and shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed)
+    dataset = dataset.batch(batch_size).map(lambda x: (x, x), num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+# Función para crear un dataset con las filas rows del almacén mapeado en memoria
+def store_dataset(features, rows, batch_size=BATCH_SIZE, shuffle=True, seed=SEED):
+    import tensorflow as tf
+
+    dim = features.shape[1]
+
+    # Filas ordenadas: lecturas más contiguas del archivo mapeado
+    def gather(indices):
+        return np.asarray(features[np.sort(indices)], dtype=np.float32)
+
+    def load(indices):
+        x = tf.numpy_function(gather, [indices], tf.float32)
+        x.set_shape([None, dim])
+        return x, x
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(rows, dtype=np.int64))
+    if shuffle:
+        dataset = dataset.shuffle(len(rows), seed=seed)
+    dataset = dataset.batch(batch_size).map(load, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+# Filas del almacén que pertenecen a las temporadas pedidas (todas si seasons es None)
+def season_rows(index, seasons=None):
+    if not seasons:
+        return np.arange(len(index))
+    rows = np.flatnonzero(index['Season'].astype(str).isin(list(seasons)).to_numpy())
+    if not len(rows):
+        raise ValueError(f'El almacén de características no tiene filas de las temporadas {list(seasons)}')
+    return rows
+
+
+# Función para crear los datasets de entrenamiento y validación desde los parquet de source
+# o desde el almacén de características features. Devuelve (train, val, mínimos, máximos).
+def make_datasets(source='datos', features=None, batch_size=BATCH_SIZE, seasons=None, val_fraction=VAL_FRACTION,
+                  seed=SEED, deterministic=False):
+    if features is not None:
+        from datos.features import load_feature_store
+
+        store = load_feature_store(features)
+        rows = season_rows(store.index, seasons)
+        train_idx, val_idx = split_rows(len(rows), val_fraction, seed)
+        train_rows, val_rows = rows[train_idx], rows[val_idx]
+        train = store_dataset(store.features, train_rows, batch_size, seed=seed)
+        val = store_dataset(store.features, val_rows, batch_size, shuffle=False)
+        return train, val, store.minimum, store.maximum
+
+    files = processed_files(source, seasons)
+    _, minimum, maximum = scan(files)
+    options = dict(batch_size=batch_size, minimum=minimum, maximum=maximum, seasons=seasons,
+                   val_fraction=val_fraction, seed=seed, deterministic=deterministic)
+    return parquet_dataset(source, 'train', **options), parquet_dataset(source, 'val', **options), minimum, maximum
+
+
+# Función para entrenar el autoencoder desde los parquet de source o desde el almacén de
+# características features. Devuelve (modelo, history). Con scale_lr=True la tasa de
+# aprendizaje se escala al tamaño del lote.
+def train_autoencoder(source='datos', features=None, epochs=50, batch_size=BATCH_SIZE, learning_rate=LEARNING_RATE,
+                      units=UNITS, seasons=None, val_fraction=VAL_FRACTION, seed=SEED, scale_lr=False, verbose=1):
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    train, val, _, _ = make_datasets(source, features, batch_size, seasons, val_fraction, seed)
+    model = build_autoencoder(len(NUMERICAL_COLUMNS) + len(POSITION_COLUMNS), units,
+                              scaled_learning_rate(batch_size, learning_rate) if scale_lr else learning_rate)
+    history = model.fit(train, epochs=epochs, validation_data=val, verbose=verbose)
+    return model, history
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Entrena el autoencoder con un pipeline tf.data.')
+    parser.add_argument('--source', default='datos', help='Carpeta con los archivos processed_{temporada}.parquet')
+    parser.add_argument('--features', help='Almacén de características (en lugar de los parquet)')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a incluir (por defecto, todas)')
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--learning-rate', type=float, default=LEARNING_RATE)
+    parser.add_argument('--scale-lr', action='store_true',
+                        help=f'Escalar la tasa de aprendizaje con el lote (regla lineal desde lotes de {BASE_BATCH_SIZE})')
+    parser.add_argument('--out', help='Archivo .keras donde guardar el modelo entrenado')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    model, history = train_autoencoder(args.source, args.features, args.epochs, args.batch_size,
+                                       args.learning_rate, seasons=args.seasons, scale_lr=args.scale_lr)
+    print(f'{args.epochs} épocas en {time.perf_counter() - start:.1f} s; '
+          f'val_loss final {history.history["val_loss"][-1]:.5f}')
+    if args.out:
+        model.save(args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+# Escritor SQLite para data.db y model_data.db. A diferencia de df.to_sql crea tablas con
+# tipos (INTEGER/REAL/TEXT, NOT NULL cuando la columna no tiene vacíos), inserta con una
+# sentencia preparada y executemany, y agrupa las escrituras en transacciones explícitas
+# (una por temporada en el scraper). Durante la carga usa WAL y synchronous=NORMAL; al
+# cerrar ejecuta ANALYZE y vuelve al journal por defecto para dejar un solo archivo.
+
+
+# Función para obtener el tipo SQLite de una columna de pandas
+def sqlite_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# Función para generar el CREATE TABLE con tipos a partir de un DataFrame
+def create_table_sql(table_name, df, missing=None):
+    if missing is None:
+        missing = df.isna().to_numpy()
+    has_missing = missing.any(axis=0)
+    columns = []
+    for i, (column, dtype) in enumerate(df.dtypes.items()):
+        definition = f'{quote(column)} {sqlite_type(dtype)}'
+        if len(df) and not has_missing[i]:
+            definition += ' NOT NULL'
+        columns.append(definition)
+    return f'CREATE TABLE {quote(table_name)} ({", ".join(columns)})'
+
+
+def insert_sql(table_name, columns):
+    placeholders = ', '.join('?' * len(columns))
+    return f'INSERT INTO {quote(table_name)} ({", ".join(map(quote, columns))}) VALUES ({placeholders})'
+
+
+# Función para convertir una columna en una lista de tipos nativos de Python (None para vacíos)
+def column_values(series, missing):
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        values = series.to_numpy(dtype='int64', na_value=0).tolist()
+    elif dtype == np.float32:
+        # Pasamos por texto para conservar el valor corto (98.7 y no 98.69999694824219)
+        values = series.to_numpy().astype(str).astype(np.float64).tolist()
+    elif pd.api.types.is_float_dtype(dtype):
+        values = series.to_numpy(dtype='float64', na_value=np.nan).tolist()
+    else:
+        values = series.to_numpy(dtype=object).tolist()
+    for i in np.flatnonzero(missing):
+        values[i] = None
+    return values
+
+
+# Función para convertir un DataFrame en filas listas para executemany
+def to_rows(df, missing=None):
+    if missing is None:
+        missing = df.isna().to_numpy()
+    return list(zip(*(column_values(series, missing[:, i])
+                      for i, (_, series) in enumerate(df.items()))))
+
+
+# Función para reemplazar una tabla completa: DROP, CREATE con tipos e INSERT por lotes.
+# Se hace dentro de un SAVEPOINT para que un error no deje la tabla a medias.
+def write_table(conn, table_name, df):
+    conn.execute('SAVEPOINT write_table')
+    try:
+        missing = df.isna().to_numpy()
+        conn.execute(f'DROP TABLE IF EXISTS {quote(table_name)}')
+        conn.execute(create_table_sql(table_name, df, missing))
+        conn.executemany(insert_sql(table_name, list(df.columns)), to_rows(df, missing))
+    except Exception:
+        conn.execute('ROLLBACK TO write_table')
+        conn.execute('RELEASE write_table')
+        raise
+    conn.execute('RELEASE write_table')
+
+
+class SQLiteWriter:
+    def __init__(self, db_path, bulk=True):
+        self.db_path = db_path
+        self.bulk = bulk
+        self.conn = None
+
+    def open(self):
+        # isolation_level=None: las transacciones se controlan con BEGIN/COMMIT explícitos
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        if self.bulk:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA temp_store=MEMORY')
+        return self
+
+    def begin(self):
+        if not self.conn.in_transaction:
+            self.conn.execute('BEGIN')
+
+    def write(self, table_name, df):
+        self.begin()
+        write_table(self.conn, table_name, df)
+
+    def execute(self, sql, params=()):
+        self.begin()
+        return self.conn.execute(sql, params)
+
+    def commit(self):
+        if self.conn.in_transaction:
+            self.conn.execute('COMMIT')
+
+    def close(self):
+        try:
+            self.commit()
+            self.conn.execute('ANALYZE')
+            if self.bulk:
+                self.conn.execute('PRAGMA journal_mode=DELETE')
+        finally:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.conn.in_transaction:
+            self.conn.execute('ROLLBACK')
+        self.close()
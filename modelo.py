@@ -392,55 +392,15 @@ Al mantener una convención clara y ordenada en los nombres de las columnas, es
 Los cambios en los nombres de las columnas se reflejan en el modelo de redes neuronales y en cualquier herramienta de visualización asociada, como el Streamlit y el Pizza Chart. Esto garantiza que tanto el código del modelo como las visualizaciones sean congruentes y fáciles de mantener a lo largo del tiempo.
 
 Esta unificación de los nombres no solo mejora la limpieza y simplicidad de la base de datos, sino que también garantiza una experiencia de consulta más intuitiva y eficiente.
+
+**Normalización al Descargar:**
+
+El renombrado se hace ahora en el momento de la descarga. Cada tabla se normaliza una sola vez con un esquema declarativo (prefijo por tabla, tipos enteros, `float32` o categóricos elegidos de antemano) y se guarda directamente con sus nombres finales, evitando copiar cada tabla completa para renombrarla.
 """
 
-# Conectar a la base de datos
-conn = connect_db('/content/model_data.db')
-cursor = conn.cursor()
-
-# Columnas comunes que no serán renombradas
-common_columns = ['Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Age', 'Born']
-
-# Temporada y nombres de tablas con prefijo de temporada
-season = "2018-2019" # Cambiar la temporada
-tables = ["stats_standard", "stats_keeper", "stats_keeper_adv", "stats_shooting", "stats_passing",
-          "stats_passing_types", "stats_gca", "stats_defense",
-          "stats_possession", "stats_playing_time", "stats_misc"]
-
-# Función para renombrar columnas con prefijos
-def get_prefixed_column_name(table, column):
-    table_abbr = table.split('_')[-1]  # Obtener el prefijo
-    column = column.split('_')[-1]     # Usar solo parte después del guión bajo
-    if column not in common_columns:
-        return f"{table_abbr}_{column}"  # Añadir un guión bajo para evitar confusiones
-    return column
-
-# Renombrar columnas y hacerlas persistentes en SQLite
-for table in tables:
-    full_table_name = f"{season}_{table}"
-
-    # Obtener nombres de columnas y crear lista de columnas renombradas
-    cursor.execute(f'PRAGMA table_info("{full_table_name}")')
-    columns_info = cursor.fetchall()
-    new_columns = [get_prefixed_column_name(table, col[1]) for col in columns_info]
-
-    # Crear nueva tabla con columnas renombradas
-    renaming_query = f'CREATE TABLE "{full_table_name}_renamed" AS SELECT '
-    renaming_query += ", ".join([f'"{col[1]}" AS "{new_col}"' for col, new_col in zip(columns_info, new_columns)])
-    renaming_query += f' FROM "{full_table_name}"'
-
-    # Ejecutar consulta para crear la tabla con columnas renombradas
-    cursor.execute(renaming_query)
-
-    # Eliminar la tabla original y renombrar la nueva tabla
-    cursor.execute(f'DROP TABLE "{full_table_name}"')
-    cursor.execute(f'ALTER TABLE "{full_table_name}_renamed" RENAME TO "{full_table_name}"')
-    print(f"Tabla {full_table_name} renombrada y guardada con éxito.")
-
-# Confirmar cambios y cerrar conexión
-conn.commit()
-conn.close()
-print("Renombrado de columnas completado y guardado en la base de datos.")
+# Los nombres con prefijo ya se asignan al descargar cada tabla (datos/schema.py): el esquema
+# declara el prefijo de cada tabla y el tipo de cada métrica, así que no hace falta recorrer
+# las tablas con CREATE TABLE ... AS SELECT, DROP y RENAME para renombrarlas.
 
 """###**Archivos .parquet**
 
@@ -503,6 +463,9 @@ La elección de estas columnas proporciona una representación equilibrada del r
 
 import sqlite3
 import pandas as pd
+from datos.features import NUMERICAL_COLUMNS
+from datos.player_season import build_player_season, query_player_season
+from datos.query_builder import has_player_season
 
 # Conectar a la base de datos
 conn = connect_db('/content/model_data.db')
@@ -510,20 +473,20 @@ conn = connect_db('/content/model_data.db')
 # Lista de temporadas
 seasons = ["2023-2024", "2022-2023", "2021-2022", "2020-2021", "2019-2020", "2018-2019"]
 
+# Los datos salen de la tabla consolidada player_season (datos/player_season.py): una fila
+# por temporada, equipo y jugador, unida por (player_id, Squad). Se construye si la base aún
+# no la tiene.
+if not has_player_season(conn):
+    build_player_season(conn)
+
 for season in seasons:
-    table_name = f"{season}_PL"
-    query = f"""
-    SELECT "Player", "Pos", "Age", "standard_Min", "standard_Gls", "standard_Ast",
-           "shooting_Sh", "shooting_SoT", "passing_Cmp", "passing_Att", "defense_Tkl",
-           "defense_TklW", "possession_Touches", '{season}' AS "Season"
-    FROM "{table_name}"
-    """
-    # Leer cada temporada en un DataFrame
-    df_season = pd.read_sql_query(query, conn)
+    # Una lectura por temporada con los tipos compactos del esquema (categorías, int16 y float32)
+    df_season = query_player_season(conn, season, NUMERICAL_COLUMNS,
+                                    columns=("Season", "player_id", "Player", "Squad", "Pos"))
 
     # Guardar en archivo Parquet
     df_season.to_parquet(f"{season}_data.parquet", index=False)
-    print(f"Datos de {season} guardados en formato Parquet.")
+    print(f"Datos de {season} guardados en formato Parquet: {len(df_season)} filas.")
 
 # Cerrar la conexión
 conn.close()
@@ -554,54 +517,16 @@ Esta conversión permite acceder y cargar los datos en bloques o secciones espec
 Estas transformaciones fueron esenciales para construir un dataset más compacto y eficiente, con variables estructuradas y normalizadas que facilitan el entrenamiento del modelo de redes neuronales. Además, al almacenar los datos en .parquet, se asegura una experiencia de trabajo más fluida y controlada.
 """
 
-import pandas as pd
-
-# Lista de archivos Parquet de cada temporada
-seasons = ["2023-2024", "2022-2023", "2021-2022", "2020-2021", "2019-2020", "2018-2019"]
-
-# Lista para almacenar los DataFrames procesados
-processed_dfs = []
-
-# Procesar cada temporada en un ciclo for
-for i, season in enumerate(seasons):
-    # Leer el archivo Parquet
-    df_temp = pd.read_parquet(f"{season}_data.parquet")
-
-    # Eliminar la columna 'Squad' si existe
-    if 'Squad' in df_temp.columns:
-        df_temp = df_temp.drop(columns=['Squad'])
-
-    # Concatenar temporada y nombre del jugador
-    df_temp['Player'] = season + ', ' + df_temp['Player']
-
-    # Tomar solo la primera posición
-    df_temp['Pos'] = df_temp['Pos'].apply(lambda x: x.split(',')[0] if pd.notnull(x) else x)
-
-    # Convertir a columnas dummy para posiciones
-    df_temp = pd.get_dummies(df_temp, columns=['Pos'], prefix='', prefix_sep='')
-
-    # Filtrar solo las posiciones clave (GK, DF, MF, FW)
-    df_temp = df_temp[['Player', 'Age', 'standard_Min', 'standard_Gls', 'standard_Ast',
-                       'shooting_Sh', 'shooting_SoT', 'passing_Cmp', 'passing_Att',
-                       'defense_Tkl', 'defense_TklW', 'possession_Touches',
-                       'GK', 'DF', 'MF', 'FW']]
-
-    # Convertir `Age` a numérico
-    df_temp['Age'] = pd.to_numeric(df_temp['Age'], errors='coerce')
-
-    # Agregar el DataFrame procesado a la lista
-    processed_dfs.append(df_temp)
+from datos.preprocess import format_report, preprocess
 
-    # Guardar el fragmento procesado en disco
-    df_temp.to_parquet(f"processed_{season}.parquet")
-    print(f"Fragmento {i + 1}/{len(seasons)} guardado en disco.")
+# Procesar cada temporada por lotes (datos/preprocess.py): cada lote se transforma con
+# operaciones vectorizadas, se descartan las filas vacías y se apartan las duplicadas o
+# incompletas, y el resto se escribe enseguida en processed_{temporada}.parquet, sin
+# guardar las temporadas en memoria ni concatenarlas
+reports = preprocess(".", ".")
 
-    # Imprimir el progreso de cada fragmento
-    print(f"Fragmento {i + 1}/{len(seasons)} procesado: {df_temp.shape[0]} filas")
-
-# Concatenar todos los fragmentos procesados en un único DataFrame
-df = pd.concat(processed_dfs, ignore_index=True)
-print("Concatenación completa.")
+# Reporte de calidad de cada temporada (también en quality_report.json)
+print(format_report(reports))
 
 """###**Revisión Final del DataFrame: Paso Clave para el Análisis de Similitud de Jugadores**
 
@@ -636,25 +561,15 @@ El DataFrame final, tras la concatenación de los archivos .paquet obtenidos de
 La revisión exhaustiva de este DataFrame asegura que el conjunto de datos está listo para su uso en el modelo de redes neuronales que buscará patrones de similitud entre jugadores. Este análisis inicial confirma que los datos abarcan una variedad de métricas relevantes, desde actividad ofensiva y defensiva hasta características de posesión y rol dentro del equipo, proporcionando así una sólida base para el análisis y la clasificación de jugadores de la Premier League en función de sus estilos y rendimientos comparativos.
 """
 
-import pandas as pd
+from datos.season_reader import read_seasons
 
-# Lista de archivos Parquet procesados de cada temporada
-seasons = ["2023-2024", "2022-2023", "2021-2022", "2020-2021", "2019-2020", "2018-2019"]
+# Leer todas las temporadas en un único DataFrame con tipos compactos: Season y Player como
+# categorías, los conteos en int16 y las posiciones en bool
+df = read_seasons(".")
 
-# Lista para almacenar los DataFrames procesados
-processed_dfs = []
-
-# Leer cada archivo .parquet y agregar a la lista
-for season in seasons:
-    df_temp = pd.read_parquet(f"processed_{season}.parquet")
-    processed_dfs.append(df_temp)
+print("Lectura completa. El DataFrame tiene", df.shape[0], "filas y", df.shape[1], "columnas.")
 
-# Concatenar todos los DataFrames procesados en un único DataFrame
-df = pd.concat(processed_dfs, ignore_index=True)
-
-print("Concatenación completa. El DataFrame tiene", df.shape[0], "filas y", df.shape[1], "columnas.")
-
-print(df.info())  # Revisar tipos de datos y valores nulos
+print(df.info(memory_usage="deep"))  # Revisar tipos de datos, valores nulos y memoria
 print(df.describe())  # Resumen estadístico
 print(df.head())  # Primeras filas del DataFrame
 
@@ -808,59 +723,43 @@ Para este tipo de problemas, existen dos métodos de escalado particularmente co
 Dado que estamos trabajando con estadísticas de jugadores, las cuales pueden tener diferentes rangos y distribuciones, la **normalización con Min-Max Scaling** sería una opción adecuada. Este enfoque permite que todas las variables tengan una escala similar, manteniendo la proporción entre ellas. De este modo, la red neuronal podrá identificar patrones de manera más efectiva, sin verse afectada por diferencias de escala entre las métricas.
 """
 
-import pandas as pd
-
-# Lista de archivos Parquet procesados de cada temporada
-seasons = ["2023-2024", "2022-2023", "2021-2022", "2020-2021", "2019-2020", "2018-2019"]
-
-# Lista para almacenar los DataFrames procesados
-processed_dfs = []
+import numpy as np
+from datos.features import FEATURE_COLUMNS, NUMERICAL_COLUMNS, build_feature_store, load_feature_store, player_labels
 
-# Leer cada archivo .parquet y agregar a la lista
-for season in seasons:
-    df_temp = pd.read_parquet(f"processed_{season}.parquet")
-    processed_dfs.append(df_temp)
+# Construir una sola vez el almacén de características (datos/features.py): los archivos
+# processed_{temporada}.parquet se leen por lotes, se descartan las filas con NaN y las
+# columnas se escalan directamente en una matriz float32 guardada en disco
+build_feature_store(".", "features")
 
-# Concatenar todos los DataFrames procesados en un único DataFrame
-df = pd.concat(processed_dfs, ignore_index=True)
+# Abrir la matriz mapeada en memoria, sin copiarla
+store = load_feature_store("features")
 
-print("Concatenación completa. El DataFrame tiene", df.shape[0], "filas y", df.shape[1], "columnas.")
+print("Almacén listo. La matriz tiene", store.features.shape[0], "filas y", store.features.shape[1], "columnas.")
 
 """En el proceso de preprocesamiento de datos, se observó que los archivos `.parquet` contenían un volumen significativo de filas con valores NaN (valores faltantes). Estos valores NaN ocupaban millones de filas en el DataFrame, inflando el tamaño de los archivos y afectando la eficiencia del análisis y procesamiento de los datos.
 
 Para mejorar la manejabilidad del conjunto de datos y optimizar los recursos de procesamiento, se optó por eliminar estas filas que no contenían información relevante. Este paso permitió reducir drásticamente el tamaño del DataFrame, pasando de más de **26 millones de filas** con valores en su mayoría vacíos a un conjunto mucho más manejable de **aproximadamente 4,800 filas**.
 
 Esta reducción del tamaño del DataFrame no solo facilita la carga y el análisis de los datos, sino que también contribuye a que el modelo de machine learning pueda procesar la información de forma más rápida y eficiente, al reducir el ruido generado por los datos faltantes. Además, un DataFrame más ligero mejora la velocidad de lectura y escritura en disco, así como el rendimiento general en tareas de manipulación y exploración de datos.
-"""
 
-# Seleccionar solo las columnas numéricas para el escalado
-numerical_columns = ['Age', 'standard_Min', 'standard_Gls', 'standard_Ast',
-                     'shooting_Sh', 'shooting_SoT', 'passing_Cmp', 'passing_Att',
-                     'defense_Tkl', 'defense_TklW', 'possession_Touches']
-
-# Seleccionar solo las filas que no tienen NaN en ninguna de las columnas
-df = df.dropna(subset=numerical_columns).copy()
+Concatenar los 26 millones de filas en pandas para luego descartarlas requería varias copias completas del conjunto (concat, dropna, escalado y conversión a float32). El almacén de características descarta las filas con NaN lote por lote mientras lee cada archivo, así que en memoria solo queda la matriz final.
+"""
 
-# Restablecer el índice después de eliminar las filas
-df.reset_index(drop=True, inplace=True)
+# Columnas numéricas que se escalan
+numerical_columns = NUMERICAL_COLUMNS
 
-# Confirmar que el DataFrame ahora tiene las filas correctas
-print("Tamaño final del DataFrame:", df.shape)
-print("Conteo de NaN después de eliminación:\n", df.isna().sum())
+# Confirmar que la matriz no tiene NaN
+print("Tamaño final de la matriz:", store.features.shape)
+print("Conteo de NaN:", np.isnan(store.features).sum())
 
 """**Implementación del escalado**
 
-Usaremos MinMaxScaler de Scikit-learn para realizar el escalado en las columnas numéricas.
+El almacén aplica el mismo escalado que MinMaxScaler de Scikit-learn, `(x - mínimo) / (máximo - mínimo)`, con los mínimos y máximos de todas las temporadas. Estos valores quedan guardados en `features/meta.json` para escalar datos nuevos de la misma forma.
 """
 
-import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-
-# Crear una instancia de MinMaxScaler
-scaler = MinMaxScaler()
-
-# Aplicar el escalador solo en las columnas numéricas
-df[numerical_columns] = scaler.fit_transform(df[numerical_columns])
+# Mínimos y máximos usados en el escalado de cada columna numérica
+print(dict(zip(numerical_columns, store.minimum)))
+print(dict(zip(numerical_columns, store.maximum)))
 
 """Con esto, todas las variables numéricas estarán en un rango entre 0 y 1, lo cual es ideal para la red neuronal.
 
@@ -875,21 +774,23 @@ Antes de pasar al modelo, necesitamos:
 Dividir el dataset en una matriz de características (X) y, si es necesario, una variable de salida (y). En este caso, la salida del modelo será similaridad, por lo que X será suficiente.
 """
 
-# Seleccionar las columnas que vamos a usar para el modelo
-feature_columns = numerical_columns + ['GK', 'DF', 'MF', 'FW']
-X = df[feature_columns].values
+# Las columnas que vamos a usar para el modelo ya están en el almacén, en float32
+feature_columns = FEATURE_COLUMNS
+X = store.features
 
-from sklearn.model_selection import train_test_split
+# Índice de la matriz con las etiquetas "temporada, jugador" de cada fila
+df = store.index.assign(Player=player_labels(store.index))
 
-# Dividir en conjuntos de entrenamiento y validación
-X_train, X_val = train_test_split(X, test_size=0.2, random_state=42)
+from datos.training import split_rows
 
-X_train = X_train.astype(np.float32)
-X_val = X_val.astype(np.float32)
-X_df = X_df.astype(np.float32)
+# Dividir en conjuntos de entrenamiento y validación por índices (20 % para validación, semilla
+# 42). Es la misma división que usa run_training: el entrenamiento lee sus filas del almacén y
+# aquí solo se copian las de validación, que son las filas que el modelo no vio.
+train_idx, val_idx = split_rows(len(X))
+X_val = X[val_idx]
 
+# Todos los jugadores, para calcular sus embeddings (sin copiar la matriz)
 X_df = X
-X_df = X_df.astype(np.float32)
 
 """##Entrenamiento del Modelo: Red Neuronal para Búsqueda de Similitud
 
@@ -916,28 +817,16 @@ Para el modelo de similitud de jugadores, con base en los datos disponibles y el
 Dado que el objetivo es la similitud en un espacio de características continuo, usamos Mean Squared Error (MSE) para optimizar la correspondencia de jugadores. Aunque el modelo no esté orientado a clasificación directa, accuracy podría ser opcional como métrica de evaluación.
 
 **Estructura del modelo en Keras:**
-"""
-
-import tensorflow as tf
-from tensorflow.keras.layers import Input, Dense
-from tensorflow.keras.models import Model
 
-# Obtener el número de características
-input_dim = X_train.shape[1]
+El modelo se define una sola vez en `build_autoencoder` (`datos/training.py`), que es el que arma `run_training` más abajo:
 
-# Definir el modelo secuencial con capas ajustadas
-inputs = Input(shape=(input_dim,))
-x = Dense(64, activation='relu')(inputs)
-x = Dense(32, activation='relu')(x)
-embedding = Dense(16, activation='relu', name="embedding_layer")(x)
-x = Dense(32, activation='relu')(embedding)
-outputs = Dense(input_dim, activation='linear')(x)
+- Entrada con las columnas del almacén de características.
+- Encoder: `Dense(64, relu)` → `Dense(32, relu)` → `Dense(16, relu)`, la capa de embeddings (`embedding_layer`).
+- Decoder: `Dense(32, relu)` → salida lineal con tantas unidades como columnas de entrada.
+- Pérdida `mean_squared_error` con Adam y tasa de aprendizaje de 1e-4.
 
-model = Model(inputs=inputs, outputs=outputs)
-
-# Ajustar el optimizador
-model.compile(loss='mean_squared_error', optimizer=tf.keras.optimizers.Adam(learning_rate=1e-4))
-model.summary()
+El resumen de capas (`model.summary()`) se muestra después de entrenar, con el modelo guardado.
+"""
 
 """- **Explicación de la estructura propuesta:**
 
@@ -948,10 +837,27 @@ model.summary()
 - **Entrenar el modelo**
 
 Entrenemos el modelo usando el conjunto de datos preparado (X), dividiéndolo en datos de entrenamiento y de validación para evaluar el rendimiento del modelo en datos nuevos y evitar sobreajuste (overfitting).
+
+Los lotes se leen con un pipeline `tf.data` (`datos/training.py`) en lugar de pasar la matriz completa a `model.fit`. Para entrenar directamente desde los archivos `.parquet`, con el escalado dentro del pipeline, está `python -m datos.training --source datos`.
+
+El entrenamiento se hace con `run_training` (`datos/experiments.py`, también disponible como `python -m datos.experiments`), que arma este mismo modelo a partir de una configuración (capas, épocas, tamaño del lote y semilla). Guarda el mejor checkpoint según `val_loss`, se detiene si la pérdida deja de mejorar y continúa desde la última época si se interrumpe. El resultado queda en una carpeta identificada por el hash de la configuración y de los datos: volver a correr la celda sin cambios no entrena de nuevo, solo abre el modelo guardado.
 """
 
-# Entrenar el modelo
-history = model.fit(X_train, X_train, epochs=50, batch_size=32, validation_data=(X_val, X_val))
+import os
+import tensorflow as tf
+from datos.experiments import load_training_config, run_training
+
+# Se mantienen el lote de 32 y la tasa de aprendizaje de 1e-4; lotes más grandes (p. ej. 1024)
+# son más rápidos en CPU, pero cambian la convergencia y hay que comparar la pérdida antes de
+# adoptarlos.
+config = load_training_config(features="features", out="entrenamientos", batch_size=32, epochs=50)
+run_dir, metrics = run_training(config)
+print(run_dir, metrics)
+
+# Autoencoder con los pesos de la mejor época y pérdida por época
+model = tf.keras.models.load_model(os.path.join(run_dir, "model.keras"))
+history = pd.read_csv(os.path.join(run_dir, "history.csv"))
+model.summary()
 
 """- **Evaluar el Modelo y Calcular Métricas de Rendimiento**
 
@@ -994,8 +900,8 @@ print(f"Average R² Score: {avg_r2}")
 import matplotlib.pyplot as plt
 
 # Gráfica de la pérdida en entrenamiento y validación
-plt.plot(history.history['loss'], label='Training Loss')
-plt.plot(history.history['val_loss'], label='Validation Loss')
+plt.plot(history['loss'], label='Training Loss')
+plt.plot(history['val_loss'], label='Validation Loss')
 plt.xlabel('Epoch')
 plt.ylabel('Loss')
 plt.legend()
@@ -1023,6 +929,13 @@ embedding_model = Model(inputs=model.input, outputs=model.get_layer("embedding_l
 player_embeddings = embedding_model.predict(X_df)
 player_names = df['Player'].values  # Lista de nombres de jugadores
 
+# Los pesos del encoder se exportan a un .npz (datos/encoder.py) para calcular embeddings
+# sin TensorFlow; el resultado coincide con embedding_model.predict
+from datos.encoder import export_encoder
+
+numpy_encoder = export_encoder(embedding_model, "encoder.npz", store=store)
+print("Diferencia máxima con Keras:", np.abs(numpy_encoder.predict(X_df) - player_embeddings).max())
+
 """**Explicación:**
 Este fragmento de código crea un nuevo modelo (`embedding_model`) basado en el modelo ya entrenado, pero con la salida de la capa de 16 unidades (representación latente). Usamos esta salida como un resumen de las características del jugador, donde se retiene la información relevante para el análisis de similitud.
 
@@ -1068,27 +981,48 @@ Para confirmar que el modelo logró representar correctamente los jugadores, se
 4. Devuelve los nombres de los cinco jugadores más similares (excluyendo a Rashford), los cuales comparten atributos y desempeños similares.
 """
 
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Función para encontrar los jugadores más similares
-def find_similar_players(player_name, player_embeddings, df, n=5):
-    # Buscar el índice del jugador en el DataFrame
-    player_idx = df[df['Player'] == player_name].index[0]
-    player_vec = player_embeddings[player_idx].reshape(1, -1)
+from datos.similarity import SimilarityIndex
 
-    # Calcular la similitud con todos los demás jugadores
-    similarities = cosine_similarity(player_vec, player_embeddings).flatten()
+# Índice de similitud (datos/similarity.py): normaliza los embeddings una sola vez y guarda
+# un diccionario de "temporada, jugador" a fila, así que cada consulta es un producto
+# matriz-vector y la selección de los k mejores con argpartition
+similarity_index = SimilarityIndex(player_embeddings, player_names)
 
-    # Obtener los n jugadores más similares (excluyendo al jugador en sí mismo)
-    similar_indices = np.argsort(-similarities)[1:n+1]
-    similar_players = df.iloc[similar_indices]['Player'].values
-    return similar_players
+# Función para encontrar los jugadores más similares
+def find_similar_players(player_name, n=5):
+    return [name for name, _ in similarity_index.similar(player_name, n)]
 
 # Ejemplo para encontrar jugadores similares a Marcus Rashford
-similar_players = find_similar_players('2022-2023, Marcus Rashford', player_embeddings, df)
+similar_players = find_similar_players('2022-2023, Marcus Rashford')
 print("Jugadores similares a Marcus Rashford:", similar_players)
 
+"""**Índice aproximado para muchas temporadas y ligas**
+
+La búsqueda exacta compara la consulta con todos los jugadores. Para conjuntos mucho más grandes (varias ligas y décadas) se guarda un índice aproximado IVF junto al modelo (`datos/ann.py`): los embeddings se agrupan con k-means y cada búsqueda solo revisa los grupos más cercanos. El índice se abre mapeado en memoria y permite filtrar por posición, rango de temporadas y minutos jugados.
+"""
+
+from datos.ann import AnnIndex, build_ann_index, store_attributes
+
+# Guardar los embeddings y construir el índice con los atributos de filtrado del almacén
+np.save("player_embeddings.npy", player_embeddings)
+build_ann_index(player_embeddings, "ann", **store_attributes(store))
+ann_index = AnnIndex.load("ann")
+
+# Delanteros similares a Marcus Rashford entre 2020-2021 y 2023-2024 con al menos 900 minutos
+row = similarity_index.row('2022-2023, Marcus Rashford')
+rows, scores = ann_index.search(player_embeddings[row], k=5, positions=['FW'],
+                                seasons=('2020-2021', '2023-2024'), min_minutes=900, exclude=row)
+print("Delanteros similares a Marcus Rashford:", list(zip(player_names[rows], scores)))
+
+"""**Exportar el modelo para la aplicación**
+
+La página de jugadores similares de Streamlit no entrena ni carga TensorFlow: lee los artefactos que se exportan aquí (`datos/similar_players.py`). Son los embeddings, los atributos para filtrar, los parámetros del escalado Min-Max y los pesos del encoder en `.npz`, con los que se calculan embeddings de jugadores nuevos solo con NumPy.
+"""
+
+from datos.similar_players import export_artifacts
+
+export_artifacts("datos/modelo", player_embeddings, store, encoder=embedding_model)
+
 """**Conclusión**
 
 La construcción de este modelo de similitud de jugadores en la Premier League mediante redes neuronales representa un esfuerzo considerable en el ámbito de la ciencia de datos aplicada al fútbol, así como en la interpretación de las métricas deportivas avanzadas. A través del uso de embeddings y cálculos de similitud coseno, el modelo logra identificar patrones de juego y rendimiento de jugadores de una forma novedosa, permitiendo que usuarios curiosos y entusiastas puedan conocer a otros jugadores con características y desempeños cercanos a los de figuras reconocidas.
@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+from datos.fixture_server import serve_fixtures
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datos', 'fixtures')
+
+
+# Servidor local con las páginas de FBREF guardadas en datos/fixtures
+@pytest.fixture
+def base_url():
+    server, url = serve_fixtures(FIXTURES)
+    yield url
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,65 @@
+import numpy as np
+
+from datos.ann import POSITION_BITS, attribute_mask, build_ann_index, recall_at_k
+from datos.similarity import SimilarityIndex
+
+ROWS = 400
+
+
+def attributes():
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(ROWS, 8)).astype(np.float32)
+    positions = np.full(ROWS, POSITION_BITS['MF'], np.uint8)
+    # Solo unos pocos porteros, repartidos en listas distintas
+    positions[::97] = POSITION_BITS['GK']
+    seasons = np.where(np.arange(ROWS) % 2, 2023, 2022).astype(np.int16)
+    minutes = (np.arange(ROWS) * 10).astype(np.int32)
+    return embeddings, positions, seasons, minutes
+
+
+# Si las listas más cercanas no tienen k filas que cumplan el filtro se visitan más
+def test_filtered_search_expands_the_probed_lists(tmp_path):
+    embeddings, positions, seasons, minutes = attributes()
+    index = build_ann_index(embeddings, str(tmp_path), positions, seasons, minutes, n_lists=20)
+    index.n_probe = 1
+
+    rows, scores = index.search(embeddings[0], k=3, positions=['GK'], exclude=0)
+    goalkeepers = np.flatnonzero(positions == POSITION_BITS['GK'])
+
+    assert len(rows) == 3
+    assert set(rows.tolist()) <= set(goalkeepers.tolist()) - {0}
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_search_matches_exact_filtered_results(tmp_path):
+    embeddings, positions, seasons, minutes = attributes()
+    index = build_ann_index(embeddings, str(tmp_path), positions, seasons, minutes, n_lists=20)
+    exact = SimilarityIndex(embeddings, [str(i) for i in range(ROWS)])
+    filters = {'seasons': ('2023-2024', '2023-2024'), 'min_minutes': 1000}
+    mask = attribute_mask(positions, seasons, minutes, **filters)
+
+    approximate, expected = [], []
+    for row in range(0, ROWS, 40):
+        approximate.append(index.search(embeddings[row], k=5, n_probe=20, exclude=row, **filters)[0].tolist())
+        expected.append(exact.search(embeddings[row], k=5, exclude=[row], mask=mask)[0][0].tolist())
+    # Visitando todas las listas el resultado es el exacto
+    assert recall_at_k(approximate, expected) == 1.0
+
+
+def test_attribute_mask_minutes_per_season():
+    positions = np.array([POSITION_BITS['FW']] * 4, np.uint8)
+    seasons = np.array([2022, 2022, 2023, 2023], np.int16)
+    minutes = np.array([500, 900, 500, 900], np.int32)
+
+    mask = attribute_mask(positions, seasons, minutes, min_minutes={'2022-2023': 855, '2023-2024': 400})
+    assert mask.tolist() == [False, True, True, True]
+    assert attribute_mask(positions, seasons, minutes, min_minutes=600).tolist() == [False, True, False, True]
+
+
+def test_load_maps_the_saved_index(tmp_path):
+    embeddings, positions, seasons, minutes = attributes()
+    built = build_ann_index(embeddings, str(tmp_path), positions, seasons, minutes, n_lists=20)
+    loaded = type(built).load(str(tmp_path))
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.search(embeddings[5], k=4)[0].tolist() == built.search(embeddings[5], k=4)[0].tolist()
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from datos.charts import PIZZA_METRICS, PizzaRenderer
+from datos.export_charts import chart_path
+from datos.percentiles import percentile_column
+
+SEASON = '2023-2024'
+
+
+# Fuente de percentiles en memoria con la interfaz de DataCache.percentiles
+class Percentiles:
+    def __init__(self, df):
+        self.df = df
+        self.calls = 0
+
+    def percentiles(self, season, metrics, team=None):
+        self.calls += 1
+        return self.df[self.df['Squad'] == team] if team is not None else self.df
+
+
+def two_namesakes():
+    rows = [(6, 'Ben Davies', 'Tottenham', 'DF', 20.0), (7, 'Ben Davies', 'Tottenham', 'DF', 90.0)]
+    df = pd.DataFrame(rows, columns=['player_id', 'Player', 'Squad', 'Pos', 'value'])
+    for metric in PIZZA_METRICS:
+        df[percentile_column(metric)] = df['value']
+    return df.drop(columns='value')
+
+
+def test_chart_keys_on_player_id():
+    data = Percentiles(two_namesakes())
+    renderer = PizzaRenderer(data)
+    first = renderer.chart(SEASON, 'Tottenham', 6, 'Ben Davies', 'DF')
+    second = renderer.chart(SEASON, 'Tottenham', 7, 'Ben Davies', 'DF')
+    assert first != second
+
+    # Cada jugador tiene su entrada en la caché
+    assert renderer.chart(SEASON, 'Tottenham', 6, 'Ben Davies', 'DF') == first
+    assert data.calls == 2
+
+
+def test_prerender_fills_each_player():
+    renderer = PizzaRenderer(Percentiles(two_namesakes()))
+    assert renderer.prerender(SEASON, background=False) == 2
+    assert renderer.stats()['entradas'] == 2
+
+
+def test_chart_path_includes_player_id():
+    assert chart_path(SEASON, 'Tottenham', 'Ben Davies', 6, 'png') != chart_path(SEASON, 'Tottenham', 'Ben Davies', 7, 'png')
+    assert chart_path(SEASON, 'Brighton & Hove', 'A/B', 3, 'svg') == f'{SEASON}/Brighton & Hove/A_B_3.svg'
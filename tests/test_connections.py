@@ -0,0 +1,78 @@
+import sqlite3
+import threading
+
+import pytest
+
+from datos.connections import ConnectionPool, PoolExhaustedError
+
+
+class Signature:
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self):
+        return self.value
+
+
+def memory_pool(**options):
+    return ConnectionPool(lambda: sqlite3.connect(':memory:', check_same_thread=False), **options)
+
+
+def test_pool_reuses_released_connections():
+    pool = memory_pool(size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert pool.stats()['creadas'] == 1
+
+
+# Con todas las conexiones prestadas, la siguiente espera y falla al vencer el plazo
+def test_pool_times_out_when_exhausted():
+    pool = memory_pool(size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(PoolExhaustedError):
+            with pool.connection():
+                pass
+    # El plazo vencido no deja el grupo bloqueado
+    with pool.connection():
+        pass
+    assert pool.stats()['abiertas'] == 1
+
+
+def test_pool_waiter_gets_the_released_connection():
+    pool = memory_pool(size=1, timeout=5)
+    got = []
+
+    def borrow():
+        with pool.connection() as conn:
+            got.append(conn)
+
+    with pool.connection() as conn:
+        waiter = threading.Thread(target=borrow)
+        waiter.start()
+        waiter.join(0.05)
+        assert waiter.is_alive()
+    waiter.join(5)
+    assert got == [conn]
+    assert pool.stats()['esperas'] == 1
+
+
+# Si el archivo cambia, las conexiones de la firma anterior se descartan en lugar de volver al grupo
+def test_pool_discards_stale_generation():
+    signature = Signature()
+    pool = memory_pool(size=2, signature=signature)
+    with pool.connection() as old:
+        pass
+    with pool.connection() as borrowed:
+        assert borrowed is old
+        signature.value += 1
+        with pool.connection() as fresh:
+            assert fresh is not old
+    stats = pool.stats()
+    # La conexión prestada antes del cambio se cierra al devolverse
+    assert stats['descartadas'] == 1 and stats['abiertas'] == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        old.execute('SELECT 1')
+    with pool.connection() as conn:
+        assert conn is fresh
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datos.encoder import NumpyEncoder
+from datos.features import FEATURE_COLUMNS, NUMERICAL_COLUMNS, POSITION_COLUMNS
+
+
+def encoder():
+    rng = np.random.default_rng(0)
+    sizes = [len(FEATURE_COLUMNS), 8, 4]
+    layers = [(rng.normal(size=(a, b)).astype(np.float32), rng.normal(size=b).astype(np.float32), activation)
+              for a, b, activation in zip(sizes, sizes[1:], ['relu', 'linear'])]
+    return NumpyEncoder(layers, FEATURE_COLUMNS, np.zeros(len(NUMERICAL_COLUMNS)),
+                        np.full(len(NUMERICAL_COLUMNS), 100.0))
+
+
+def test_predict_matches_dense_layers():
+    model = encoder()
+    X = np.random.default_rng(1).random((5, model.input_dim)).astype(np.float32)
+    (k1, b1, _), (k2, b2, _) = model.layers
+
+    expected = np.maximum(X @ k1 + b1, 0) @ k2 + b2
+    # Por bloques da lo mismo que de una vez
+    np.testing.assert_allclose(model.predict(X, batch_size=2), expected, rtol=1e-5, atol=1e-5)
+    assert model.predict(X).dtype == np.float32
+    with pytest.raises(ValueError):
+        model.predict(X[:, :-1])
+
+
+def test_save_and_load_keep_weights_and_scaling(tmp_path):
+    model = encoder()
+    path = str(tmp_path / 'encoder.npz')
+    model.save(path)
+    loaded = NumpyEncoder.load(path)
+
+    assert loaded.columns == FEATURE_COLUMNS
+    assert [a for _, _, a in loaded.layers] == ['relu', 'linear']
+    np.testing.assert_array_equal(loaded.maximum, model.maximum)
+    X = np.random.default_rng(2).random((3, model.input_dim))
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+
+# Las filas sin escalar se escalan con el mínimo y máximo del almacén antes de embeberlas
+def test_embed_scales_raw_rows():
+    model = encoder()
+    frame = pd.DataFrame([dict.fromkeys(NUMERICAL_COLUMNS, 50.0)])
+    for column in POSITION_COLUMNS:
+        frame[column] = column == 'MF'
+
+    X = model.transform(frame)
+    assert X.tolist() == [[0.5] * len(NUMERICAL_COLUMNS) + [0.0, 0.0, 1.0, 0.0]]
+    np.testing.assert_array_equal(model.embed(frame), model.predict(X))
+    with pytest.raises(ValueError):
+        NumpyEncoder(model.layers).transform(frame)
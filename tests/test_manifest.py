@@ -0,0 +1,38 @@
+import sqlite3
+from contextlib import closing
+
+from datos.config import LIVE_SEASONS
+from datos.data_sqlite3 import build_jobs, load_table, season_of, urls
+from datos.fetch import HttpFetcher
+from datos.manifest import MANIFEST_TABLE, Manifest
+from datos.players import StatTableWriter
+from datos.scraper import Scraper
+from tests.test_scraper import SEASON, TABLES
+
+
+def scrape_incremental(db, base_url):
+    jobs = build_jobs([SEASON], {table_id: urls[table_id] for table_id in TABLES}, base_url)
+    with closing(sqlite3.connect(db)) as conn:
+        manifest = Manifest(conn, LIVE_SEASONS)
+    fetcher = HttpFetcher(timeout=5)
+    scraper = Scraper(manifest.fetcher(fetcher, jobs), load_table, manifest.sink(StatTableWriter(db)),
+                      workers=2, rate=None, retries=0, backoff=0, group_by=season_of)
+    try:
+        return scraper.run(jobs)
+    finally:
+        fetcher.close()
+
+
+# Las entradas se buscan por tabla: otra URL base para las mismas páginas no las reescribe
+def test_manifest_survives_base_url_change(tmp_path, base_url):
+    db = str(tmp_path / 'data.db')
+    first = scrape_incremental(db, base_url)
+    assert first.pages == len(TABLES) and not first.unchanged
+
+    second = scrape_incremental(db, base_url.replace('127.0.0.1', 'localhost'))
+    assert second.pages == 0
+    assert len(second.unchanged) == len(TABLES)
+    with closing(sqlite3.connect(db)) as conn:
+        stored = dict(conn.execute(f'SELECT table_name, url FROM "{MANIFEST_TABLE}"'))
+    assert set(stored) == {f'{SEASON}_{table_id}' for table_id in TABLES}
+    assert all(url.startswith(base_url) for url in stored.values())
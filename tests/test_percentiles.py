@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from datos.percentiles import compute_percentiles, max_minutes, percentile_column
+
+SEASON = '2023-2024'
+
+
+def league(rows):
+    return pd.DataFrame(rows, columns=['player_id', 'Player', 'Squad', 'Pos', 'standard_MP', 'standard_Min',
+                                       'standard_Gls'])
+
+
+# Cada jugador se ordena solo contra los de su posición primaria
+def test_compute_percentiles_ranks_within_primary_position():
+    df = league([
+        (1, 'A', 'Arsenal', 'FW', 38, 3000, 20),
+        (2, 'B', 'Chelsea', 'FW,MF', 38, 2500, 10),
+        (3, 'C', 'Chelsea', 'MF', 38, 2000, 2),
+        (4, 'D', 'Arsenal', 'MF', 38, 1800, 8),
+    ])
+    out = compute_percentiles(df, SEASON, ['standard_Gls']).set_index('Player')
+    ranks = out[percentile_column('standard_Gls')]
+
+    assert ranks.to_dict() == {'A': 100.0, 'B': 50.0, 'C': 50.0, 'D': 100.0}
+    assert out.loc['B', 'Pos'] == 'FW'
+    assert out['player_id'].tolist() == [1, 2, 3, 4]
+    assert str(ranks.dtype) == 'float32'
+
+
+# Los que no llegan al 25% de los minutos quedan fuera y no cuentan en el orden de los demás
+def test_compute_percentiles_applies_minutes_cut():
+    cut = 0.25 * max_minutes(SEASON, 38)
+    df = league([
+        (1, 'A', 'Arsenal', 'FW', 38, cut, 5),
+        (2, 'B', 'Chelsea', 'FW', 38, cut - 1, 30),
+        (3, 'C', 'Chelsea', 'FW', 38, 3000, 10),
+    ])
+    out = compute_percentiles(df, SEASON, ['standard_Gls']).set_index('Player')
+
+    assert list(out.index) == ['A', 'C']
+    assert out[percentile_column('standard_Gls')].tolist() == [50.0, 100.0]
+
+
+# En la temporada en curso el corte depende de los partidos jugados hasta ahora
+@pytest.mark.parametrize('season, expected', [('2024-2025', 10 * 90), ('2023-2024', 38 * 90)])
+def test_max_minutes_live_season(season, expected):
+    assert max_minutes(season, 10) == expected
@@ -0,0 +1,44 @@
+import sqlite3
+
+import pandas as pd
+
+from datos.players import PLAYERS_TABLE, UNKNOWN_BORN, UNKNOWN_NATION, assign_player_ids, backfill_player_ids
+
+
+def test_assign_player_ids_is_stable():
+    conn = sqlite3.connect(':memory:')
+    first = pd.DataFrame({'Player': ['Ben Davies', 'Ben Davies'], 'Born': [1993, 1995],
+                          'Nation': ['wls WAL', 'eng ENG']})
+    ids = assign_player_ids(conn, first)
+    assert ids.nunique() == 2
+
+    # En otra tabla el mismo jugador conserva su id y los nuevos reciben uno nuevo
+    second = pd.DataFrame({'Player': ['Cole Palmer', 'Ben Davies'], 'Born': [2002, 1995],
+                           'Nation': ['eng ENG', 'eng ENG']}, index=[10, 11])
+    again = assign_player_ids(conn, second)
+    assert again.index.tolist() == [10, 11]
+    assert again[11] == ids[1]
+    assert again[10] not in set(ids)
+
+
+def test_assign_player_ids_missing_keys():
+    conn = sqlite3.connect(':memory:')
+    df = pd.DataFrame({'Player': ['Jack Hinshelwood', None, 'Jack Hinshelwood'],
+                       'Born': pd.array([None, 2000, None], dtype='Int16'),
+                       'Nation': pd.Categorical([None, 'eng ENG', None])})
+    ids = assign_player_ids(conn, df)
+    assert str(ids.dtype) == 'Int32'
+    assert ids[0] == ids[2]
+    assert pd.isna(ids[1])
+    rows = conn.execute(f'SELECT Player, Born, Nation FROM {PLAYERS_TABLE}').fetchall()
+    assert rows == [('Jack Hinshelwood', UNKNOWN_BORN, UNKNOWN_NATION)]
+
+
+def test_backfill_player_ids():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE "2023-2024_stats_standard" (Player TEXT, Born INTEGER, Nation TEXT, Squad TEXT)')
+    conn.executemany('INSERT INTO "2023-2024_stats_standard" VALUES (?, ?, ?, ?)',
+                     [('Bukayo Saka', 2001, 'eng ENG', 'Arsenal'), (None, None, None, 'Arsenal')])
+    backfill_player_ids(conn, ['2023-2024_stats_standard'])
+    rows = conn.execute('SELECT Player, player_id FROM "2023-2024_stats_standard" ORDER BY rowid').fetchall()
+    assert rows == [('Bukayo Saka', 1), (None, None)]
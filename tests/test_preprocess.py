@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from datos.features import NUMERICAL_COLUMNS
+from datos.preprocess import (QUARANTINE_DIR, QUARANTINE_DUPLICATED, QUARANTINE_INCOMPLETE, REPORT_FILE,
+                              preprocess, transform_batch, validate_batch)
+
+SEASON = '2023-2024'
+
+
+def export_rows(rows):
+    df = pd.DataFrame([dict(zip(NUMERICAL_COLUMNS, stats), Player=player, player_id=player_id, Pos=pos)
+                       for player_id, player, pos, stats in rows])
+    return df[['player_id', 'Player', 'Pos'] + NUMERICAL_COLUMNS]
+
+
+FULL = ['25-123', 3040, 14, 9, 80, 30, 1500, 1800, 20, 12, 2500]
+ROWS = [
+    (1, 'Bukayo Saka', 'FW,MF', FULL),
+    (1, 'Bukayo Saka', 'FW,MF', FULL),
+    (2, 'Ben Davies', 'DF', ['30'] + FULL[1:]),
+    (3, 'Ben Davies', 'DF', ['28'] + FULL[1:]),
+    (4, 'Jack Hinshelwood', 'MF', FULL[:-1] + [None]),
+    (5, 'Sin minutos', 'GK', [None] * len(NUMERICAL_COLUMNS)),
+]
+
+
+def test_transform_batch_parses_age_and_positions():
+    out = transform_batch(export_rows(ROWS[:1]), SEASON)
+
+    assert out.loc[0, 'Age'] == 25
+    assert out.loc[0, ['GK', 'DF', 'MF', 'FW']].tolist() == [False, False, False, True]
+    assert out.loc[0, 'player_id'] == 1 and str(out['player_id'].dtype) == 'Int32'
+
+
+def test_validate_batch_quarantines_duplicated_and_incomplete_rows():
+    seen = set()
+    valid, quarantined, empty = validate_batch(transform_batch(export_rows(ROWS), SEASON), seen)
+
+    assert empty == 1
+    # Dos jugadores con el mismo nombre no son duplicados
+    assert valid['player_id'].tolist() == [1, 2, 3]
+    assert quarantined['Motivo'].tolist() == [QUARANTINE_DUPLICATED, QUARANTINE_INCOMPLETE]
+    assert len(seen) == 3
+
+    # Las filas ya escritas en un lote anterior también son duplicadas
+    valid, quarantined, _ = validate_batch(transform_batch(export_rows(ROWS[:1]), SEASON), seen)
+    assert valid.empty and quarantined['Motivo'].tolist() == [QUARANTINE_DUPLICATED]
+
+
+def test_preprocess_writes_report_and_quarantine(tmp_path):
+    export_rows(ROWS).to_parquet(tmp_path / f'{SEASON}_data.parquet')
+    reports = preprocess(str(tmp_path), str(tmp_path), batch_size=2)
+
+    assert reports[SEASON] == {'leídas': 6, 'conservadas': 3, 'vacías': 1, 'duplicadas': 1, 'incompletas': 1}
+    with open(tmp_path / REPORT_FILE, encoding='utf-8') as f:
+        assert json.load(f) == reports
+    processed = pd.read_parquet(tmp_path / f'processed_{SEASON}.parquet')
+    assert processed['Player'].astype(str).tolist() == ['Bukayo Saka', 'Ben Davies', 'Ben Davies']
+    assert processed['player_id'].tolist() == [1, 2, 3]
+    quarantine = pd.read_parquet(tmp_path / QUARANTINE_DIR / f'{SEASON}.parquet')
+    assert quarantine['Player'].astype(str).tolist() == ['Bukayo Saka', 'Jack Hinshelwood']
+    assert np.isnan(quarantine['possession_Touches'].iloc[1])
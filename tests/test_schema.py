@@ -0,0 +1,49 @@
+import pandas as pd
+
+from datos.schema import normalize_table, resolve_columns
+
+
+def standard_frame(rows):
+    columns = pd.MultiIndex.from_tuples([
+        ('Unnamed: 0_level_0', 'Rk'), ('Unnamed: 1_level_0', 'Player'), ('Unnamed: 2_level_0', 'Squad'),
+        ('Playing Time', 'Min'), ('Performance', 'Gls'), ('Per 90 Minutes', 'Gls'),
+        ('Unnamed: 6_level_0', 'Matches'),
+    ])
+    return pd.DataFrame(rows, columns=columns)
+
+
+# Los nombres repetidos se numeran como lo hacía SQLite y el grupo Per 90 Minutes es una tasa
+def test_resolve_columns_numbers_duplicates():
+    names, dtypes = resolve_columns('stats_standard', standard_frame([]).columns)
+
+    assert names == ['Rk', 'Player', 'Squad', 'standard_Min', 'standard_Gls', 'standard_Gls:1', 'standard_Matches']
+    assert dtypes['standard_Gls'] == 'Int16'
+    assert dtypes['standard_Gls:1'] == 'float32'
+    assert dtypes['Squad'] == 'category'
+
+
+def test_resolve_columns_flat_header_uses_table_prefix():
+    names, _ = resolve_columns('stats_passing_types', ['Player', 'Live', 'Live'])
+    assert names == ['Player', 'types_Live', 'types_Live:1']
+
+
+def test_normalize_table_drops_repeated_headers_and_matches():
+    df = normalize_table(standard_frame([
+        ['1', 'Bukayo Saka', 'Arsenal', '3,040', '14', '0.41', 'Matches'],
+        ['Rk', 'Player', 'Squad', 'Min', 'Gls', 'Gls', 'Matches'],
+        ['2', 'Cole Palmer', 'Chelsea', '2618', '', '0.76', 'Matches'],
+    ]), 'stats_standard')
+
+    assert list(df.columns) == ['Rk', 'Player', 'Squad', 'standard_Min', 'standard_Gls', 'standard_Gls:1']
+    assert df['Player'].tolist() == ['Bukayo Saka', 'Cole Palmer']
+    assert str(df['standard_Gls'].dtype) == 'Int16' and df['standard_Gls'].isna().tolist() == [False, True]
+    assert str(df['standard_Gls:1'].dtype) == 'float32'
+    # "3,040" no es un número: queda vacío en lugar de romper la conversión
+    assert df['standard_Min'].isna().tolist() == [True, False]
+
+
+# Si FBREF cambia un conteo a decimales, la columna pasa a float32 en lugar de truncarse
+def test_normalize_table_keeps_fractional_counts():
+    df = normalize_table(pd.DataFrame({'Player': ['A', 'B'], 'Sh': ['1.5', '2']}), 'stats_shooting')
+    assert str(df['shooting_Sh'].dtype) == 'float32'
+    assert df['shooting_Sh'].tolist() == [1.5, 2.0]
@@ -0,0 +1,153 @@
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+from datos.data_sqlite3 import build_jobs, load_table, season_of, urls
+from datos.fetch import HttpFetcher
+from datos.players import StatTableWriter
+from datos.scraper import Job, Scraper
+
+# Prueba del scraper de punta a punta sin conexión: las páginas de FBREF guardadas en
+# datos/fixtures se sirven con el servidor local y Scraper.run las guarda en una base SQLite
+# temporal. stats_standard y stats_shooting vienen dentro de un comentario HTML, como en FBREF.
+#   python -m pytest tests
+
+SEASON = '2023-2024'
+TABLES = ('stats_standard', 'stats_shooting', 'stats_keeper')
+
+
+def scrape(db, base_url, tables, retries=0):
+    jobs = build_jobs([SEASON], {table_id: urls[table_id] for table_id in tables}, base_url)
+    fetcher = HttpFetcher(timeout=5)
+    scraper = Scraper(fetcher, load_table, StatTableWriter(db), workers=2, rate=None, retries=retries,
+                      backoff=0, group_by=season_of)
+    try:
+        return scraper.run(jobs)
+    finally:
+        fetcher.close()
+
+
+def test_run_writes_fixture_tables(tmp_path, base_url):
+    db = str(tmp_path / 'data.db')
+    stats = scrape(db, base_url, TABLES)
+
+    assert stats.pages == len(TABLES)
+    assert not stats.failed
+    with closing(sqlite3.connect(db)) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {f'{SEASON}_{table_id}' for table_id in TABLES} <= tables
+
+        # La fila de encabezado repetida dentro del cuerpo y la columna Matches no se guardan
+        standard = conn.execute(f'SELECT Player, Squad, standard_Min, "standard_Gls:1" '
+                                f'FROM "{SEASON}_stats_standard" ORDER BY Rk').fetchall()
+        assert len(standard) == 9
+        assert standard[0] == ('Bukayo Saka', 'Arsenal', 3040, 0.47)
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{SEASON}_stats_standard")')]
+        assert columns[0] == 'player_id' and 'standard_Matches' not in columns
+
+        # Un jugador transferido conserva su player_id en los dos equipos; dos jugadores con el
+        # mismo nombre en el mismo equipo (distinto año de nacimiento) reciben ids distintos
+        ids = dict(conn.execute(f'SELECT Squad, player_id FROM "{SEASON}_stats_standard" '
+                                "WHERE Player = 'Cole Palmer'").fetchall())
+        assert ids['Chelsea'] == ids['Manchester City']
+        ids = conn.execute(f'SELECT DISTINCT player_id FROM "{SEASON}_stats_standard" '
+                           "WHERE Player = 'Ben Davies' AND Squad = 'Tottenham'").fetchall()
+        assert len(ids) == 2
+
+        # Sin nacionalidad ni año de nacimiento también recibe un player_id
+        assert conn.execute(f'SELECT player_id FROM "{SEASON}_stats_standard" '
+                            "WHERE Player = 'Jack Hinshelwood'").fetchone()[0] is not None
+
+        # Las tablas de una misma temporada comparten player_id
+        keeper = conn.execute(f'SELECT k.player_id FROM "{SEASON}_stats_keeper" k '
+                              f'JOIN "{SEASON}_stats_standard" s USING (player_id, Squad)').fetchall()
+        assert len(keeper) == 2
+
+
+def test_run_reports_missing_page(tmp_path, base_url):
+    db = str(tmp_path / 'data.db')
+    stats = scrape(db, base_url, ('stats_standard', 'stats_passing'))
+
+    assert stats.pages == 1
+    assert [r.job.table_id for r in stats.failed] == ['stats_passing']
+    with closing(sqlite3.connect(db)) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert f'{SEASON}_stats_standard' in tables
+    assert f'{SEASON}_stats_passing' not in tables
+
+
+# Sink que falla al abrir o al confirmar, como una base bloqueada o una ruta inválida
+class FailingSink:
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+        self.closed = False
+
+    def open(self):
+        if self.fail_on == 'open':
+            raise sqlite3.OperationalError('unable to open database file')
+
+    def write(self, table_name, df):
+        pass
+
+    def commit(self):
+        if self.fail_on == 'commit':
+            raise sqlite3.OperationalError('database is locked')
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize('fail_on', ['open', 'commit'])
+def test_run_raises_writer_error(fail_on):
+    jobs = [Job(f'{SEASON}_tabla_{i}', f'http://fixtures/{i}', 'stats_standard') for i in range(20)]
+    sink = FailingSink(fail_on)
+    scraper = Scraper(lambda url, table_id: '<table></table>', lambda html, table_id: pd.DataFrame({'a': [1]}),
+                      sink, workers=1, rate=None, retries=0)
+    with pytest.raises(sqlite3.OperationalError):
+        scraper.run(jobs)
+    # Si la base llegó a abrirse, se cierra aunque falle la confirmación
+    assert sink.closed == (fail_on == 'commit')
+
+
+# Registra las escrituras y confirmaciones en el orden en que llegan al sink
+class RecordingSink:
+    def __init__(self):
+        self.transactions = [[]]
+
+    def open(self):
+        pass
+
+    def write(self, table_name, df):
+        self.transactions[-1].append(table_name)
+
+    def commit(self):
+        self.transactions.append([])
+
+    def close(self):
+        pass
+
+
+def test_run_commits_each_season_alone():
+    seasons = ['2022-2023', '2023-2024', '2024-2025']
+    jobs = [Job(f'{season}_tabla_{i}', f'http://fixtures/{season}/{i}', 'stats_standard')
+            for i in range(4) for season in seasons]
+
+    # Las temporadas terminan intercaladas: las primeras tablas tardan más
+    def fetch(url, table_id):
+        time.sleep(0.02 * (3 - int(url.rsplit('/', 1)[1])))
+        return '<table></table>'
+
+    sink = RecordingSink()
+    scraper = Scraper(fetch, lambda html, table_id: pd.DataFrame({'a': [1]}), sink, workers=4, rate=None,
+                      retries=0, group_by=season_of)
+    stats = scraper.run(jobs)
+
+    assert stats.pages == len(jobs)
+    transactions = [t for t in sink.transactions if t]
+    assert len(transactions) == len(seasons)
+    for tables in transactions:
+        assert len(tables) == 4
+        assert len({t.split('_', 1)[0] for t in tables}) == 1
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datos.features import FEATURE_COLUMNS, NUMERICAL_COLUMNS, FeatureStore
+from datos.similar_players import SimilarPlayers, export_artifacts
+from datos.similarity import SimilarityIndex
+
+EMBEDDINGS = np.array([
+    [1.0, 0.0],
+    [0.9, 0.1],
+    [0.0, 1.0],
+    [2.0, 0.0],
+    [0.7, 0.7],
+])
+KEYS = ['2023-2024, A', '2023-2024, B', '2023-2024, C', '2022-2023, A', '2022-2023, D']
+
+
+# El propio jugador no aparece en sus resultados, aunque otra fila tenga el mismo vector
+def test_similar_excludes_the_player_itself():
+    index = SimilarityIndex(EMBEDDINGS, KEYS)
+    results = index.similar('2023-2024, A', k=2)
+
+    assert [key for key, _ in results] == ['2022-2023, A', '2023-2024, B']
+    assert results[0][1] == pytest.approx(1.0)
+
+
+def test_search_mask_limits_the_candidates():
+    index = SimilarityIndex(EMBEDDINGS, KEYS)
+    mask = np.array([True, False, True, False, True])
+    rows, scores = index.search(EMBEDDINGS[:1], k=5, exclude=[0], mask=mask)
+
+    found = np.isfinite(scores[0])
+    assert rows[0][found].tolist() == [4, 2]
+    # Los que no cumplen el filtro quedan con -inf y similar() no los devuelve
+    assert [key for key, _ in index.similar('2023-2024, A', k=5, mask=mask)] == ['2022-2023, D', '2023-2024, C']
+
+
+def test_similar_batch_matches_single_queries():
+    index = SimilarityIndex(EMBEDDINGS, KEYS)
+    batch = index.similar(KEYS[:3], k=3)
+    assert batch == [index.similar(key, k=3) for key in KEYS[:3]]
+
+
+def test_repeated_key_uses_first_row_and_unknown_key_fails():
+    index = SimilarityIndex(EMBEDDINGS[:2], ['2023-2024, A', '2023-2024, A'])
+    assert index.row('2023-2024, A') == 0
+    with pytest.raises(KeyError):
+        index.similar('2023-2024, Z')
+
+
+# Artefactos exportados: player_id en los resultados y minutos mínimos por temporada
+def test_similar_players_artifacts_keep_player_id(tmp_path):
+    features = np.zeros((len(KEYS), len(FEATURE_COLUMNS)), np.float32)
+    features[:, NUMERICAL_COLUMNS.index('standard_Min')] = [1.0, 0.5, 0.2, 0.9, 0.1]
+    features[:, FEATURE_COLUMNS.index('MF')] = 1
+    seasons, players = zip(*(key.split(', ') for key in KEYS))
+    index = pd.DataFrame({'Season': seasons, 'Player': players,
+                          'player_id': pd.array([1, 2, 3, 1, 4], dtype='Int32')})
+    store = FeatureStore(features, index, FEATURE_COLUMNS, np.zeros(len(NUMERICAL_COLUMNS)),
+                         np.full(len(NUMERICAL_COLUMNS), 3000.0))
+    export_artifacts(str(tmp_path), EMBEDDINGS, store)
+    similar_players = SimilarPlayers.load(str(tmp_path))
+
+    assert similar_players.player('2022-2023, A') == {'Season': '2022-2023', 'Player': 'A', 'player_id': 1}
+    results = similar_players.similar('2023-2024, A', k=4, min_minutes={'2023-2024': 1000, '2022-2023': 0})
+    assert results[['Season', 'Player', 'player_id']].values.tolist() == [
+        ['2022-2023', 'A', 1], ['2023-2024', 'B', 2], ['2022-2023', 'D', 4]]
+    assert results['Min'].tolist() == [2700, 1500, 300]
@@ -0,0 +1,44 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datos.experiments import STORE_FILES, input_hashes, load_training_config, main, run_id
+from datos.training import season_rows, split_rows
+
+
+def test_split_rows_is_reproducible():
+    train, val = split_rows(100, 0.2, seed=42)
+    assert len(val) == 20 and len(train) == 80
+    assert not set(train) & set(val)
+    assert np.all(np.diff(train) > 0)
+    again, _ = split_rows(100, 0.2, seed=42)
+    assert np.array_equal(train, again)
+
+
+def test_season_rows_filters_store_index():
+    index = pd.DataFrame({'Season': pd.Categorical(['2022-2023', '2023-2024', '2022-2023']),
+                          'Player': ['a', 'b', 'c']})
+    assert season_rows(index).tolist() == [0, 1, 2]
+    assert season_rows(index, ('2022-2023',)).tolist() == [0, 2]
+    with pytest.raises(ValueError):
+        season_rows(index, ('2018-2019',))
+
+
+# Un entrenamiento terminado sin val_loss (validación vacía) se informa sin fallar
+def test_main_reports_missing_val_loss(tmp_path, capsys):
+    store = tmp_path / 'features'
+    store.mkdir()
+    for name in STORE_FILES:
+        (store / name).write_bytes(name.encode())
+    out = tmp_path / 'runs'
+    config = load_training_config(features=str(store), out=str(out), seasons='2023-2024')
+    run_dir = out / run_id(config, input_hashes(config))
+    os.makedirs(run_dir)
+    (run_dir / 'metrics.json').write_text(json.dumps({'val_loss': None, 'best_epoch': None, 'epochs': 0,
+                                                      'seconds': 0.0}))
+
+    main(['--features', str(store), '--out', str(out), '--seasons', '2023-2024'])
+    assert 'sin val_loss registrada' in capsys.readouterr().out
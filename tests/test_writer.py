@@ -0,0 +1,62 @@
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+from datos.writer import SQLiteWriter, write_table
+
+
+def column_types(conn, table_name):
+    return {row[1]: (row[2], bool(row[3])) for row in conn.execute(f'PRAGMA table_info("{table_name}")')}
+
+
+# Tipos de SQLite a partir de pandas: NOT NULL solo en las columnas sin vacíos
+def test_write_table_types_and_values():
+    df = pd.DataFrame({
+        'Player': ['Bukayo Saka', None],
+        'standard_Min': pd.array([3040, 2618], dtype='Int16'),
+        'standard_Gls': pd.array([14, None], dtype='Int16'),
+        'standard_xG': pd.array([0.987, 0.5], dtype='float32'),
+        'GK': [False, True],
+    })
+    with closing(sqlite3.connect(':memory:')) as conn:
+        write_table(conn, 'tabla', df)
+        assert column_types(conn, 'tabla') == {
+            'Player': ('TEXT', False),
+            'standard_Min': ('INTEGER', True),
+            'standard_Gls': ('INTEGER', False),
+            'standard_xG': ('REAL', True),
+            'GK': ('INTEGER', True),
+        }
+        rows = conn.execute('SELECT * FROM tabla').fetchall()
+    # Los float32 se guardan con su valor corto y los vacíos como NULL
+    assert rows == [('Bukayo Saka', 3040, 14, 0.987, 0), (None, 2618, None, 0.5, 1)]
+
+
+# Un error a mitad de la escritura no deja la tabla a medias: se conserva la anterior
+def test_write_table_rolls_back_on_error():
+    with closing(sqlite3.connect(':memory:', isolation_level=None)) as conn:
+        write_table(conn, 'tabla', pd.DataFrame({'a': [1, 2]}))
+        bad = pd.DataFrame({'a': [1, object()]})
+        with pytest.raises(sqlite3.ProgrammingError):
+            write_table(conn, 'tabla', bad)
+        assert conn.execute('SELECT a FROM tabla').fetchall() == [(1,), (2,)]
+
+
+def test_writer_context_rolls_back_the_transaction(tmp_path):
+    db = str(tmp_path / 'data.db')
+    with SQLiteWriter(db) as writer:
+        writer.write('primera', pd.DataFrame({'a': [1]}))
+
+    with pytest.raises(RuntimeError):
+        with SQLiteWriter(db) as writer:
+            writer.write('primera', pd.DataFrame({'a': [2]}))
+            writer.write('segunda', pd.DataFrame({'b': [3]}))
+            raise RuntimeError('fallo en la descarga')
+
+    with closing(sqlite3.connect(db)) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert conn.execute('SELECT a FROM primera').fetchall() == [(1,)]
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    assert 'segunda' not in tables